@@ -4,16 +4,27 @@ from fastapi import APIRouter, Header, HTTPException
 
 from app.core.config import settings
 from app.services.admin_service import reset_chroma_db
+from app.utils.cache import cache_stats
 
 router = APIRouter()
 
 
-@router.post("/reset-chroma")
-def reset_chroma(x_admin_token: str | None = Header(default=None, alias="X-Admin-Token")):
+def _check_admin_token(x_admin_token: str | None) -> None:
     if not settings.admin_reset_token:
         raise HTTPException(status_code=500, detail="ADMIN_RESET_TOKEN is not configured in .env")
 
     if x_admin_token != settings.admin_reset_token:
         raise HTTPException(status_code=401, detail="Invalid admin token")
 
+
+@router.post("/reset-chroma")
+def reset_chroma(x_admin_token: str | None = Header(default=None, alias="X-Admin-Token")):
+    _check_admin_token(x_admin_token)
     return reset_chroma_db()
+
+
+@router.get("/cache-stats")
+def get_cache_stats(x_admin_token: str | None = Header(default=None, alias="X-Admin-Token")):
+    # 내부 경로 / job 수 / 캐시 크기 노출 → reset-chroma와 같은 관리자 토큰 필요
+    _check_admin_token(x_admin_token)
+    return cache_stats()
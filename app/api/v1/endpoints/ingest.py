@@ -11,10 +11,10 @@ router = APIRouter()
 def ingest_schema(req: IngestSchemaRequest):
     print("CWD:", os.getcwd())
     print("EXPECTED:", str(Path(os.getcwd()) / "data" / "schema"))
-    added, ids = ingest_namespace("schema", file_path=req.file_path)
-    return IngestResponse(added=added, namespace=req.namespace, ids=ids)
+    result = ingest_namespace("schema", file_path=req.file_path, force=req.force)
+    return IngestResponse(**result)
 
 @router.post("/examples", response_model=IngestResponse)
 def ingest_examples(req: IngestExamplesRequest):
-    added, ids = ingest_namespace("examples", file_path=req.file_path)
-    return IngestResponse(added=added, namespace=req.namespace, ids=ids)
+    result = ingest_namespace("examples", file_path=req.file_path, force=req.force)
+    return IngestResponse(**result)
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
-from app.schemas.sql import SQLQueryRequest, SQLQueryResponse
+from app.core.exceptions import BadRequest
+from app.schemas.sql import SQLExportRequest, SQLQueryRequest, SQLQueryResponse
 from app.services.sql_service import SQLService
+from app.text_to_sql.executor import stream
 import io
 import csv
 from datetime import datetime
@@ -18,29 +20,40 @@ def query(req: SQLQueryRequest):
 # ----------------------------
 # CSV Export API
 # ----------------------------
-@router.post("/export/csv")
-def export_csv(req: SQLQueryRequest):
-
-    result = service.handle(req)
-
-    rows = result.results or []
-
+def _csv_chunks(header, chunks):
+    # ✅ chunk마다 버퍼를 비우고 바로 내보냄 → 메모리 일정
     output = io.StringIO()
     writer = csv.writer(output)
 
-    if rows:
-        headers = list(rows[0].keys())
-        writer.writerow(headers)
+    writer.writerow(header)
+    yield output.getvalue()
+
+    for rows in chunks:
+        output.seek(0)
+        output.truncate(0)
+        writer.writerows(rows)
+        yield output.getvalue()
 
-        for r in rows:
-            writer.writerow([r.get(h, "") for h in headers])
 
-    output.seek(0)
+@router.post("/export/csv")
+def export_csv(req: SQLExportRequest):
+    # ✅ /sql/query의 export_token이 유효하면 LLM 재호출 없이 그 SQL을 실행 (EXPORT_MAX_ROWS 상한)
+    prepared = service.prepare_export(req)
+    if prepared["error"]:
+        raise BadRequest(prepared["error"])
+
+    chunks = stream(prepared["sql"], dialect=prepared["dialect"], row_limit=prepared["row_limit"])
+    try:
+        # 첫 item(컬럼명)까지 여기서 받아 SQL 오류는 스트리밍 전에 400으로
+        header = next(chunks)
+    except Exception as e:
+        chunks.close()
+        raise BadRequest(f"Execution failed: {e}")
 
     filename = "sql_result_" + datetime.now().strftime("%Y%m%d_%H%M%S") + ".csv"
 
     return StreamingResponse(
-        iter([output.getvalue()]),
+        _csv_chunks(header, chunks),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
\ No newline at end of file
+    )
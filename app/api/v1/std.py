@@ -1,8 +1,14 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
-from app.services.std_service import normalize_std, save_feedback
+from app.core.config import settings
+from app.core.exceptions import BadRequest, NotFound
+from app.services.std_job_service import FORMATS, get_job_manager
+from app.services.std_service import normalize_std_async, normalize_std_batch_async, save_feedback
+from app.services.std_synonym_index import synonym_index_ready
+from app.utils.concurrency import run_blocking
 
 router = APIRouter(prefix="/std", tags=["std"])
 
@@ -15,6 +21,14 @@ class NormalizeRequest(BaseModel):
     enhance_questions: Optional[bool] = False
 
 
+class NormalizeBatchRequest(BaseModel):
+    raw_texts: List[str]
+    top_k: Optional[int] = 5
+    min_score: Optional[float] = 0.8
+    rerank: Optional[bool] = None
+    enhance_questions: Optional[bool] = False
+
+
 class FeedbackRequest(BaseModel):
     req_id: str
     input_nm: str
@@ -23,8 +37,8 @@ class FeedbackRequest(BaseModel):
 
 
 @router.post("/normalize")
-def normalize(req: NormalizeRequest):
-    return normalize_std(
+async def normalize(req: NormalizeRequest):
+    return await normalize_std_async(
         raw_text=req.raw_text,
         top_k=req.top_k,
         min_score=req.min_score,
@@ -33,6 +47,116 @@ def normalize(req: NormalizeRequest):
     )
 
 
+@router.post("/normalize/batch")
+async def normalize_batch(req: NormalizeBatchRequest):
+    """신고서 품목 일괄 표준화 (results는 raw_texts 순서)."""
+    max_items = int(getattr(settings, "std_batch_max_items", 1000) or 1000)
+    if len(req.raw_texts) > max_items:
+        raise BadRequest(f"raw_texts too large: {len(req.raw_texts)} > {max_items}")
+    return await normalize_std_batch_async(
+        raw_texts=req.raw_texts,
+        top_k=req.top_k,
+        min_score=req.min_score,
+        rerank=req.rerank,
+        enhance_questions=bool(req.enhance_questions),
+    )
+
+
+@router.post("/jobs")
+async def create_job(
+    request: Request,
+    fmt: str = Query("csv", alias="format", description="csv | jsonl"),
+    top_k: int = Query(5, ge=1, le=50),
+    min_score: float = Query(0.8),
+    rerank: Optional[bool] = Query(None),
+    enhance_questions: bool = Query(False),
+):
+    """
+    대용량 신고서 파일(CSV: raw_text 컬럼 또는 첫 컬럼 / JSONL: {"raw_text": ...}) 일괄 표준화 job 등록.
+    request body를 그대로 디스크에 스트리밍 저장 → job_id 반환, 이후 GET /std/jobs/{job_id}로 진행률 조회.
+    """
+    mgr = get_job_manager()
+    try:
+        job_id, path = mgr.new_upload(fmt)
+    except ValueError as e:
+        raise BadRequest(str(e))
+
+    max_bytes = int(getattr(settings, "std_job_max_upload_mb", 200)) * 1024 * 1024
+    size = 0
+    try:
+        with open(path, "wb") as f:
+            async for block in request.stream():
+                size += len(block)
+                if size > max_bytes:
+                    raise BadRequest(f"upload too large: > {max_bytes} bytes")
+                await run_blocking(f.write, block)
+        params = {"top_k": top_k, "min_score": min_score, "rerank": rerank, "enhance_questions": enhance_questions}
+        return await run_blocking(mgr.create_job, job_id, fmt, params)
+    except ValueError as e:
+        mgr.delete(job_id)
+        raise BadRequest(str(e))
+    except BaseException:
+        mgr.delete(job_id)
+        raise
+
+
+@router.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    st = get_job_manager().status(job_id)
+    if st is None:
+        raise NotFound(f"job not found: {job_id}")
+    return st
+
+
+@router.post("/jobs/{job_id}/resume")
+def job_resume(job_id: str):
+    """failed job을 실패한 chunk부터 재시도."""
+    st = get_job_manager().resume(job_id)
+    if st is None:
+        raise NotFound(f"job not found: {job_id}")
+    return st
+
+
+@router.get("/jobs/{job_id}/result")
+def job_result(job_id: str, fmt: str = Query("jsonl", alias="format", description="jsonl | csv")):
+    """완료된 job 결과 다운로드 (chunk 파일을 순서대로 스트리밍)."""
+    if fmt not in FORMATS:
+        raise BadRequest(f"unsupported format: {fmt} (csv | jsonl)")
+    mgr = get_job_manager()
+    st = mgr.status(job_id)
+    if st is None:
+        raise NotFound(f"job not found: {job_id}")
+    if st["status"] != "done":
+        raise BadRequest(f"job not finished: {st['status']} ({st['processed']}/{st['total']})")
+
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        mgr.iter_result(job_id, fmt),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=std_job_{job_id}.{fmt}"},
+    )
+
+
+@router.delete("/jobs/{job_id}")
+def job_delete(job_id: str):
+    try:
+        deleted = get_job_manager().delete(job_id)
+    except ValueError as e:
+        raise BadRequest(str(e))
+    if not deleted:
+        raise NotFound(f"job not found: {job_id}")
+    return {"status": "ok"}
+
+
+@router.get("/suggest")
+def suggest(q: str = Query(..., min_length=1), limit: int = Query(10, ge=1, le=50)):
+    """표준품명/동의어 prefix 자동완성 (in-memory index)."""
+    idx = synonym_index_ready()
+    if idx is None:
+        return {"q": q, "ready": False, "items": []}
+    return {"q": q, "ready": True, "items": idx.prefix(q, limit=limit)}
+
+
 @router.post("/feedback")
 def feedback(req: FeedbackRequest):
     save_feedback(
@@ -10,6 +10,8 @@ from app.services.std_synonym_service import (
     generate_synonym_suggestions,
     batch_approve_synonym_suggestions,
     batch_reject_synonym_suggestions,
+    invalidate_schema_cache,
+    warm_schema_cache,
 )
 
 router = APIRouter(prefix="/std-admin", tags=["std-admin"])
@@ -146,4 +148,19 @@ class BatchRejectResponse(BaseModel):
 @router.post("/batch-reject-synonym-suggestions", response_model=BatchRejectResponse)
 def batch_reject(req: BatchRejectRequest):
     items = [{"sug_id": x.sug_id, "reason": x.reason} for x in req.items]
-    return batch_reject_synonym_suggestions(items)
\ No newline at end of file
+    return batch_reject_synonym_suggestions(items)
+
+
+# -----------------------------
+# Schema(column map) cache
+# -----------------------------
+class SchemaCacheInvalidateRequest(BaseModel):
+    warm: bool = Field(True, description="무효화 직후 컬럼 매핑을 다시 해석할지 여부")
+
+
+@router.post("/schema-cache/invalidate")
+def schema_cache_invalidate(req: SchemaCacheInvalidateRequest):
+    out = invalidate_schema_cache()
+    if req.warm:
+        out = warm_schema_cache()
+    return out
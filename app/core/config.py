@@ -14,12 +14,69 @@ class Settings(BaseSettings):
     openai_model: str = Field(default="gpt-4o-mini", validation_alias="OPENAI_MODEL")
     embedding_model: str = Field(default="text-embedding-3-small", validation_alias="EMBEDDING_MODEL")
 
+    # query embedding 캐시 (메모리 LRU + 선택적 SQLite 파일)
+    embedding_cache_enabled: bool = Field(default=True, validation_alias="EMBEDDING_CACHE_ENABLED")
+    embedding_cache_size: int = Field(default=10000, validation_alias="EMBEDDING_CACHE_SIZE")
+    embedding_cache_path: str = Field(default="", validation_alias="EMBEDDING_CACHE_PATH")  # 예: ./cache/query_embeddings.sqlite3
+
+    # text-to-SQL 생성 SQL 캐시 (exact + 질문 임베딩 semantic)
+    sql_cache_enabled: bool = Field(default=True, validation_alias="SQL_CACHE_ENABLED")
+    sql_cache_size: int = Field(default=2000, validation_alias="SQL_CACHE_SIZE")
+    sql_cache_ttl_sec: int = Field(default=3600, validation_alias="SQL_CACHE_TTL_SEC")
+    sql_cache_semantic_enabled: bool = Field(default=True, validation_alias="SQL_CACHE_SEMANTIC_ENABLED")
+    sql_cache_semantic_size: int = Field(default=1000, validation_alias="SQL_CACHE_SEMANTIC_SIZE")
+    sql_cache_semantic_threshold: float = Field(default=0.95, validation_alias="SQL_CACHE_SEMANTIC_THRESHOLD")
+
     # std rerank
     std_rerank_enabled: bool = Field(default=False, validation_alias="STD_RERANK_ENABLED")
     openai_rerank_model: str = Field(default="gpt-4o-mini", validation_alias="OPENAI_RERANK_MODEL")
     std_rerank_topn: int = Field(default=12, validation_alias="STD_RERANK_TOPN")  # 정확도 모드 기본 12
     std_rerank_timeout_sec: int = Field(default=20, validation_alias="STD_RERANK_TIMEOUT_SEC")
 
+    # TE_STD006T 요청 로그 비동기 배치 적재
+    std_log_batch_size: int = Field(default=100, validation_alias="STD_LOG_BATCH_SIZE")
+    std_log_flush_interval_ms: int = Field(default=1000, validation_alias="STD_LOG_FLUSH_INTERVAL_MS")
+    std_log_queue_size: int = Field(default=10000, validation_alias="STD_LOG_QUEUE_SIZE")
+    std_log_put_timeout_ms: int = Field(default=0, validation_alias="STD_LOG_PUT_TIMEOUT_MS")  # 0이면 대기 없이 overflow 처리
+    std_log_overflow_policy: str = Field(default="spill", validation_alias="STD_LOG_OVERFLOW_POLICY")  # spill | drop
+    std_log_spill_path: str = Field(default="./logs/std_log_spill.jsonl", validation_alias="STD_LOG_SPILL_PATH")
+
+    # 동의어 관리(std-admin) 컬럼 매핑 캐시 TTL
+    std_schema_cache_ttl_sec: int = Field(default=3600, validation_alias="STD_SCHEMA_CACHE_TTL_SEC")
+
+    # ✅ 표준품명/동의어 in-memory 정확일치 index (fast path)
+    std_synonym_index_enabled: bool = Field(default=True, validation_alias="STD_SYNONYM_INDEX_ENABLED")
+    std_synonym_index_refresh_sec: int = Field(default=600, validation_alias="STD_SYNONYM_INDEX_REFRESH_SEC")  # 0이면 주기 재적재 안 함
+    std_exact_match_score: float = Field(default=3.0, validation_alias="STD_EXACT_MATCH_SCORE")
+
+    # /std/normalize/batch 최대 입력 수
+    std_batch_max_items: int = Field(default=1000, validation_alias="STD_BATCH_MAX_ITEMS")
+    std_batch_concurrency: int = Field(default=8, validation_alias="STD_BATCH_CONCURRENCY")  # batch 1건의 동시 blocking 호출 수
+
+    # /std/jobs 대용량 파일 일괄 표준화 (디스크 checkpoint, 재시작 시 재개)
+    std_job_dir: str = Field(default="./jobs/std", validation_alias="STD_JOB_DIR")
+    std_job_workers: int = Field(default=2, validation_alias="STD_JOB_WORKERS")  # 동시 처리 chunk 수
+    std_job_chunk_size: int = Field(default=500, validation_alias="STD_JOB_CHUNK_SIZE")
+    std_job_max_upload_mb: int = Field(default=200, validation_alias="STD_JOB_MAX_UPLOAD_MB")
+    std_job_ttl_hours: float = Field(default=72, validation_alias="STD_JOB_TTL_HOURS")  # 끝난 job 보관 기간 (0이면 삭제 안 함)
+
+    # std 도메인 게이트 용어 파일 (비우면 data/std_terms.json, 없으면 내장 기본값)
+    std_terms_path: str = Field(default="", validation_alias="STD_TERMS_PATH")
+    std_terms_reload_sec: float = Field(default=5.0, validation_alias="STD_TERMS_RELOAD_SEC")  # mtime 확인 간격 (0이면 최초 1회만 로드)
+
+    # ✅ 로컬 lexical(문자 n-gram BM25) 검색 + 벡터 점수 융합
+    std_lexical_enabled: bool = Field(default=True, validation_alias="STD_LEXICAL_ENABLED")
+    std_lexical_ngram: int = Field(default=2, validation_alias="STD_LEXICAL_NGRAM")
+    std_lexical_weight: float = Field(default=0.3, validation_alias="STD_LEXICAL_WEIGHT")  # 0~1 정규화 BM25에 곱해 가산
+    std_lexical_fallback_scale: float = Field(default=2.0, validation_alias="STD_LEXICAL_FALLBACK_SCALE")  # 벡터 실패 시 lexical 단독 점수 scale
+    std_vector_timeout_sec: float = Field(default=0.0, validation_alias="STD_VECTOR_TIMEOUT_SEC")  # async 경로, 0이면 무제한
+
+    # ✅ TE_STD001M 상세 / TE_STD002L weight 조회 캐시 (TTL + LRU)
+    std_detail_cache_size: int = Field(default=20000, validation_alias="STD_DETAIL_CACHE_SIZE")
+    std_detail_cache_ttl_sec: int = Field(default=600, validation_alias="STD_DETAIL_CACHE_TTL_SEC")
+    std_weight_cache_size: int = Field(default=50000, validation_alias="STD_WEIGHT_CACHE_SIZE")
+    std_weight_cache_ttl_sec: int = Field(default=300, validation_alias="STD_WEIGHT_CACHE_TTL_SEC")
+
     # 정확도 2단계: 내부 벡터 후보수(Recall)
     std_retrieve_topk: int = Field(default=30, validation_alias="STD_RETRIEVE_TOPK")
 
@@ -53,6 +110,18 @@ class Settings(BaseSettings):
     chroma_dir: str = Field(default="./chroma_db", validation_alias="CHROMA_DIR")
     chroma_collection: str = Field(default="rag_sql", validation_alias="CHROMA_COLLECTION")
 
+    # ✅ ingest_std streaming (page 단위 fetch/embed/upsert + checkpoint)
+    std_ingest_page_size: int = Field(default=1000, validation_alias="STD_INGEST_PAGE_SIZE")
+    std_ingest_embed_batch_size: int = Field(default=256, validation_alias="STD_INGEST_EMBED_BATCH_SIZE")
+    std_ingest_checkpoint_path: str = Field(default="", validation_alias="STD_INGEST_CHECKPOINT_PATH")  # ""면 CHROMA_DIR/std_ingest_checkpoint.json
+    std_ingest_embed_workers: int = Field(default=4, validation_alias="STD_INGEST_EMBED_WORKERS")
+
+    # ✅ 대량 임베딩 rate limit / retry (embed_pipeline)
+    embed_rate_limit_rpm: float = Field(default=0.0, validation_alias="EMBED_RATE_LIMIT_RPM")  # 0이면 제한 없음
+    embed_max_retries: int = Field(default=5, validation_alias="EMBED_MAX_RETRIES")
+    embed_backoff_base_sec: float = Field(default=1.0, validation_alias="EMBED_BACKOFF_BASE_SEC")
+    embed_backoff_max_sec: float = Field(default=60.0, validation_alias="EMBED_BACKOFF_MAX_SEC")
+
     # DB (Postgres)
     database_url: str = Field(default="", validation_alias="DATABASE_URL")
     db_dialect: str = Field(default="postgres", validation_alias="DB_DIALECT")
@@ -62,8 +131,26 @@ class Settings(BaseSettings):
     oracle_user: str = Field(default="", validation_alias="ORACLE_USER")
     oracle_password: str = Field(default="", validation_alias="ORACLE_PASSWORD")
 
+    # ✅ Oracle connection pool / python-oracledb 튜닝
+    oracle_pool_size: int = Field(default=10, validation_alias="ORACLE_POOL_SIZE")
+    oracle_max_overflow: int = Field(default=20, validation_alias="ORACLE_MAX_OVERFLOW")
+    oracle_pool_timeout_sec: float = Field(default=30.0, validation_alias="ORACLE_POOL_TIMEOUT_SEC")
+    oracle_pool_recycle_sec: int = Field(default=1800, validation_alias="ORACLE_POOL_RECYCLE_SEC")
+    oracle_pool_warmup: int = Field(default=0, validation_alias="ORACLE_POOL_WARMUP")  # startup 시 미리 열 연결 수
+    oracle_ping_idle_sec: float = Field(default=60.0, validation_alias="ORACLE_PING_IDLE_SEC")  # 이보다 오래 쉰 연결만 checkout 시 ping (0이면 ping 안 함)
+    oracle_stmtcachesize: int = Field(default=50, validation_alias="ORACLE_STMTCACHESIZE")
+    oracle_arraysize: int = Field(default=500, validation_alias="ORACLE_ARRAYSIZE")
+    oracle_prefetchrows: int = Field(default=500, validation_alias="ORACLE_PREFETCHROWS")
+
+    # blocking I/O(DB/Chroma/OpenAI)를 async 엔드포인트에서 돌릴 스레드풀 크기
+    blocking_pool_size: int = Field(default=32, validation_alias="BLOCKING_POOL_SIZE")
+
     # limits
     max_rows: int = Field(default=200, validation_alias="MAX_ROWS")
+    export_max_rows: int = Field(default=100000, validation_alias="EXPORT_MAX_ROWS")  # CSV export 전용 상한 (max_rows와 별도)
+    export_chunk_rows: int = Field(default=1000, validation_alias="EXPORT_CHUNK_ROWS")
+    export_token_secret: str = Field(default="", validation_alias="EXPORT_TOKEN_SECRET")  # 비우면 프로세스별 임시 키 (multi-worker면 설정 필요)
+    export_token_ttl_sec: int = Field(default=900, validation_alias="EXPORT_TOKEN_TTL_SEC")
     statement_timeout_sec: int = Field(default=15, validation_alias="STATEMENT_TIMEOUT_SEC")
     allow_dml: bool = Field(default=False, validation_alias="ALLOW_DML")
 
@@ -8,6 +8,10 @@ class Forbidden(HTTPException):
     def __init__(self, detail: str):
         super().__init__(status_code=403, detail=detail)
 
+class NotFound(HTTPException):
+    def __init__(self, detail: str):
+        super().__init__(status_code=404, detail=detail)
+
 class ServerError(HTTPException):
     def __init__(self, detail: str):
         super().__init__(status_code=500, detail=detail)
@@ -1,17 +1,22 @@
 # app/db/connectors/oracle.py
 from __future__ import annotations
 
+import logging
 import re
-from typing import Any, Dict, List, Optional, Tuple
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, exc, text
 from sqlalchemy.engine import Engine
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 _ENGINE: Optional[Engine] = None
 
 _FETCH_FIRST_RE = re.compile(r"\bFETCH\s+FIRST\s+\d+\s+ROWS\s+ONLY\b", re.IGNORECASE)
+_TRAILING_FETCH_FIRST_RE = re.compile(r"\bFETCH\s+FIRST\s+(\d+)\s+ROWS\s+ONLY\s*$", re.IGNORECASE)
 
 
 def _parse_oracle_dsn(dsn: str) -> Tuple[str, int, Optional[str]]:
@@ -62,10 +67,147 @@ def get_engine() -> Engine:
     else:
         url = f"oracle+oracledb://{user}:{pwd}@{host}:{port}/"
 
-    _ENGINE = create_engine(url, pool_pre_ping=True)
+    # ✅ pool 크기/recycle 조정 + python-oracledb statement cache
+    # pool_pre_ping(매 checkout마다 왕복 1회) 대신 idle 시간 기준 ping (_install_pool_events)
+    engine = create_engine(
+        url,
+        pool_size=int(getattr(settings, "oracle_pool_size", 10)),
+        max_overflow=int(getattr(settings, "oracle_max_overflow", 20)),
+        pool_timeout=float(getattr(settings, "oracle_pool_timeout_sec", 30)),
+        pool_recycle=int(getattr(settings, "oracle_pool_recycle_sec", 1800)),
+        pool_pre_ping=False,
+        connect_args={"stmtcachesize": int(getattr(settings, "oracle_stmtcachesize", 50))},
+    )
+    _install_pool_events(engine)
+    _ENGINE = engine
     return _ENGINE
 
 
+def _ping(dbapi_conn) -> None:
+    ping = getattr(dbapi_conn, "ping", None)
+    if callable(ping):
+        ping()
+        return
+    cur = dbapi_conn.cursor()
+    try:
+        cur.execute("SELECT 1 FROM DUAL")
+        cur.fetchall()
+    finally:
+        cur.close()
+
+
+def _install_pool_events(engine: Engine) -> None:
+    """
+    - checkout: 마지막 반납 후 ORACLE_PING_IDLE_SEC 이상 놀았던 연결만 ping
+      (실패 시 DisconnectionError → pool이 새 연결로 재시도)
+    - cursor: arraysize / prefetchrows (fetch 왕복 수 감소)
+    """
+    idle_sec = float(getattr(settings, "oracle_ping_idle_sec", 60) or 0)
+    arraysize = int(getattr(settings, "oracle_arraysize", 0) or 0)
+    prefetchrows = int(getattr(settings, "oracle_prefetchrows", 0) or 0)
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, record):
+        record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        last = record.info.get("last_used")
+        # 새로 연결된 connection(last 없음)은 방금 살아있음이 확인된 상태
+        if idle_sec <= 0 or last is None or (time.monotonic() - last) < idle_sec:
+            return
+        try:
+            _ping(dbapi_conn)
+        except Exception as e:
+            raise exc.DisconnectionError(f"stale Oracle connection: {e}") from e
+
+    if arraysize > 0 or prefetchrows > 0:
+        @event.listens_for(engine, "before_cursor_execute")
+        def _tune_cursor(conn, cursor, statement, parameters, context, executemany):
+            if arraysize > 0:
+                cursor.arraysize = arraysize
+            if prefetchrows > 0 and hasattr(cursor, "prefetchrows"):
+                cursor.prefetchrows = prefetchrows
+
+
+def warm_pool(n: Optional[int] = None) -> int:
+    """startup 시 N개 연결을 미리 열어 pool에 반납 (첫 burst의 connect 지연 제거)."""
+    n = int(n if n is not None else getattr(settings, "oracle_pool_warmup", 0) or 0)
+    if n <= 0:
+        return 0
+
+    eng = get_engine()
+    # overflow 연결은 반납 시 닫히므로 pool_size까지만
+    n = min(n, int(getattr(settings, "oracle_pool_size", 10)))
+
+    conns = []
+    try:
+        for _ in range(n):
+            conns.append(eng.connect())
+    finally:
+        for c in conns:
+            c.close()
+    logger.info("oracle pool warmed: %d connections", len(conns))
+    return len(conns)
+
+
+# -----------------------------
+# Helpers: fixed-arity IN-list
+# -----------------------------
+# IN-list placeholder 개수가 요청마다 달라지면 SQL text가 매번 달라져 hard parse / shared pool 낭비.
+# → 개수를 몇 개 bucket으로 올림하고 빈 자리는 마지막 값을 반복 (IN 결과 동일, cursor 재사용)
+IN_LIST_BUCKETS: Tuple[int, ...] = (8, 16, 32, 64, 128, 256, 512, 1000)
+IN_LIST_MAX = IN_LIST_BUCKETS[-1]  # ORA-01795: IN-list 최대 1000
+
+
+def in_list_bucket(n: int) -> int:
+    for b in IN_LIST_BUCKETS:
+        if n <= b:
+            return b
+    raise ValueError(f"IN-list too long ({n} > {IN_LIST_MAX}); use in_list_chunks()")
+
+
+def in_list_chunks(values: Sequence[Any], size: int = IN_LIST_MAX) -> List[List[Any]]:
+    """중복 제거(순서 유지) 후 size(≤1000)개씩 분할."""
+    uniq = list(dict.fromkeys(values))
+    size = max(1, min(int(size), IN_LIST_MAX))
+    return [uniq[i:i + size] for i in range(0, len(uniq), size)]
+
+
+def bind_in_list(values: Sequence[Any], params: Dict[str, Any], prefix: str = "id") -> str:
+    """
+    values를 bucket 크기의 ":{prefix}N" placeholder로 params에 채우고 "IN (...)" 안쪽 문자열 반환.
+    예) WHERE STD_ID IN ({bind_in_list(ids, params)})
+    """
+    values = list(values)
+    if not values:
+        raise ValueError("bind_in_list: empty values")
+    n = in_list_bucket(len(values))
+    last = values[-1]
+    for i in range(n):
+        params[f"{prefix}{i}"] = values[i] if i < len(values) else last
+    return ", ".join(f":{prefix}{i}" for i in range(n))
+
+
+def bind_pair_list(
+    pairs: Sequence[Tuple[Any, Any]],
+    params: Dict[str, Any],
+    prefix: Tuple[str, str] = ("s", "n"),
+) -> str:
+    """(a, b) IN ((:s0, :n0), ...) 용 bind_in_list."""
+    pairs = list(pairs)
+    if not pairs:
+        raise ValueError("bind_pair_list: empty pairs")
+    n = in_list_bucket(len(pairs))
+    pa, pb = prefix
+    last = pairs[-1]
+    for i in range(n):
+        a, b = pairs[i] if i < len(pairs) else last
+        params[f"{pa}{i}"] = a
+        params[f"{pb}{i}"] = b
+    return ", ".join(f"(:{pa}{i}, :{pb}{i})" for i in range(n))
+
+
 # -----------------------------
 # Helpers: only for COUNT
 # -----------------------------
@@ -135,3 +277,39 @@ def execute_sql(sql: str, *, row_limit: int = 200) -> List[Dict[str, Any]]:
         rows = rs.fetchall()
         cols = list(rs.keys())
         return [{cols[i]: r[i] for i in range(len(cols))} for r in rows]
+
+
+def _cap_fetch_first(sql: str, row_limit: int) -> str:
+    """끝의 FETCH FIRST n을 row_limit 이하로 (없으면 추가 / 더 작으면 질문 의도이므로 유지)."""
+    s = _strip_trailing_semicolon(sql)
+    m = re.search(_TRAILING_FETCH_FIRST_RE, s)
+    if m is None:
+        if re.search(_FETCH_FIRST_RE, s):
+            return s  # 서브쿼리 안의 FETCH FIRST만 있는 경우 → 바깥은 stream_sql의 row 수 제한
+        return f"{s}\nFETCH FIRST {int(row_limit)} ROWS ONLY"
+    if int(m.group(1)) <= int(row_limit):
+        return s
+    return s[:m.start()] + f"FETCH FIRST {int(row_limit)} ROWS ONLY"
+
+
+def stream_sql(sql: str, *, row_limit: int, chunk_size: int = 1000) -> Iterator[List[Any]]:
+    """
+    ✅ server-side cursor로 chunk_size 행씩 fetch (전체 결과를 메모리에 올리지 않음)
+    ✅ 첫 item은 컬럼명 list, 이후 row tuple list(chunk)
+    ✅ row_limit 초과분은 읽지 않음
+    """
+    s = _cap_fetch_first(sql, row_limit)
+    chunk_size = max(1, int(chunk_size))
+
+    eng = get_engine()
+    with eng.connect() as conn:
+        rs = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(text(s))
+        yield list(rs.keys())
+
+        left = int(row_limit)
+        for part in rs.partitions(chunk_size):
+            if left <= 0:
+                break
+            rows = [tuple(r) for r in part[:left]]
+            left -= len(rows)
+            yield rows
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 from app.core.config import settings
@@ -30,3 +30,25 @@ def execute_sql(sql: str, row_limit: int) -> List[Dict[str, Any]]:
                 break
             rows.append({k: row.get(k) for k in keys})
     return rows
+
+
+def stream_sql(sql: str, *, row_limit: int, chunk_size: int = 1000) -> Iterator[List[Any]]:
+    """server-side(named) cursor로 chunk 단위 fetch. 첫 item은 컬럼명 list, 이후 row tuple list."""
+    engine = get_engine()
+    chunk_size = max(1, int(chunk_size))
+    with engine.connect() as conn:
+        try:
+            conn.execute(text(f"SET LOCAL statement_timeout = {int(settings.statement_timeout_sec*1000)}"))
+        except Exception:
+            pass
+
+        result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(text(sql))
+        yield list(result.keys())
+
+        left = int(row_limit)
+        for part in result.partitions(chunk_size):
+            if left <= 0:
+                break
+            rows = [tuple(r) for r in part[:left]]
+            left -= len(rows)
+            yield rows
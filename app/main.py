@@ -1,3 +1,6 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
@@ -8,13 +11,71 @@ from app.api.v1.std import router as std_router
 from app.api.v1 import std_admin
 
 from app.core.logging import setup_logging
+from app.db.connectors.oracle import warm_pool
+from app.rag.vectorstore import init_vectorstore, close_vectorstore
+from app.services.std_job_service import start_job_workers, stop_job_workers
+from app.services.std_log_sink import start_log_sink, stop_log_sink
+from app.services.std_synonym_index import load_synonym_index
+from app.services.std_synonym_service import warm_schema_cache
+from app.text_to_sql.sql_rewriter import check_sql_rules_backend
+from app.utils.concurrency import shutdown_executor
 
 # 🔹 web UI 라우터 추가
 from app.webui.router import router as webui_router
 
 setup_logging()
 
-app = FastAPI(title="Text-to-SQL RAG API")
+logger = logging.getLogger(__name__)
+
+
+# ==============================
+# Lifecycle (startup / shutdown)
+# ==============================
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    try:
+        init_vectorstore()
+    except Exception:
+        # 임베딩 키/Chroma 경로 문제여도 서버는 뜨게 두고, 첫 요청에서 재시도
+        logger.warning("vectorstore warmup failed", exc_info=True)
+
+    try:
+        warm_pool()
+    except Exception:
+        logger.warning("oracle pool warmup failed", exc_info=True)
+
+    try:
+        warm_schema_cache()
+    except Exception:
+        logger.warning("std schema cache warmup failed", exc_info=True)
+
+    try:
+        load_synonym_index()
+    except Exception:
+        # 미적재 상태면 normalize는 기존 벡터 검색 경로만 사용
+        logger.warning("std synonym index load failed", exc_info=True)
+
+    check_sql_rules_backend()
+
+    start_log_sink()
+
+    try:
+        # 재시작 전 미완료 /std/jobs는 끝난 chunk 다음부터 이어서 처리
+        start_job_workers()
+    except Exception:
+        logger.warning("std job workers start failed", exc_info=True)
+
+    yield
+
+    # job worker가 쓰는 로그까지 flush되도록 sink보다 먼저 종료
+    stop_job_workers()
+    # 남은 TE_STD006T 로그 flush 후 종료
+    stop_log_sink()
+    shutdown_executor()
+    close_vectorstore()
+
+
+app = FastAPI(title="Text-to-SQL RAG API", lifespan=lifespan)
 
 # ==============================
 # API Routers
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import logging
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (page_key, ids, texts, metadatas)
+Page = Tuple[Any, List[str], List[str], List[Dict[str, Any]]]
+
+EmbedFn = Callable[[List[str]], List[List[float]]]
+WriteFn = Callable[[List[str], List[List[float]], List[str], List[Dict[str, Any]]], None]
+
+_STOP = object()
+
+
+class TokenBucket:
+    """rate(초당 토큰) / capacity(버스트) 기반 rate limiter. acquire()는 토큰이 찰 때까지 대기."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, n: float = 1.0) -> None:
+        n = min(float(n), self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= n:
+                    self._tokens -= n
+                    return
+                wait = (n - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    code = getattr(exc, "status_code", None)
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    try:
+        return int(code) if code is not None else None
+    except Exception:
+        return None
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    code = _status_code(exc)
+    if code is not None:
+        return code == 429 or code >= 500
+    return type(exc).__name__ in ("RateLimitError", "APITimeoutError", "APIConnectionError")
+
+
+def _retry_after_sec(exc: BaseException) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        v = headers.get("retry-after")
+        return float(v) if v is not None else None
+    except Exception:
+        return None
+
+
+class EmbedPipeline:
+    """
+    embed → write 2-stage 파이프라인.
+    - embed: workers개 스레드가 batch_size 단위로 병렬 임베딩 (rate_limiter로 요청 수 제한)
+    - 429/5xx: 지수 backoff(+jitter, Retry-After 우선) 후 재시도
+    - write: 전용 writer 스레드 1개가 순차 기록 → 임베딩과 저장이 겹쳐서 진행
+    - on_page_done(page_key): page 순서대로, 앞 page가 모두 기록된 경우에만 호출 (checkpoint용)
+    - in-flight batch 수를 max_inflight로 제한 → 메모리 평탄
+    """
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn,
+        write_fn: WriteFn,
+        workers: int = 4,
+        batch_size: int = 256,
+        rate_limiter: Optional[TokenBucket] = None,
+        max_retries: int = 5,
+        backoff_base_sec: float = 1.0,
+        backoff_max_sec: float = 60.0,
+        max_inflight: Optional[int] = None,
+    ):
+        self.embed_fn = embed_fn
+        self.write_fn = write_fn
+        self.workers = max(1, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self.rate_limiter = rate_limiter
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base_sec = max(0.0, float(backoff_base_sec))
+        self.backoff_max_sec = max(0.0, float(backoff_max_sec))
+        self.max_inflight = max(1, int(max_inflight or self.workers * 2))
+
+        self.retries = 0
+
+    # -----------------------------
+    # embed (retry/backoff)
+    # -----------------------------
+    def _embed_with_retry(self, texts: List[str]) -> List[List[float]]:
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                return self.embed_fn(texts)
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    raise
+                delay = _retry_after_sec(e)
+                if delay is None:
+                    delay = self.backoff_base_sec * (2 ** attempt) * (0.5 + random.random() / 2)
+                delay = min(delay, self.backoff_max_sec)
+                attempt += 1
+                self.retries += 1
+                logger.warning("embedding retry %d/%d in %.1fs (%s)", attempt, self.max_retries, delay, e)
+                time.sleep(delay)
+
+    # -----------------------------
+    # run
+    # -----------------------------
+    def run(self, pages: Iterable[Page], on_page_done: Optional[Callable[[Any], None]] = None) -> int:
+        """pages를 모두 임베딩/기록하고 기록된 문서 수 반환. 실패 시 첫 예외를 다시 raise."""
+        write_q: "queue.Queue[Any]" = queue.Queue()
+        inflight = threading.BoundedSemaphore(self.max_inflight)
+        lock = threading.Lock()
+        errors: List[BaseException] = []
+
+        remaining: Dict[int, int] = {}  # page_idx -> 남은 batch 수
+        keys: Dict[int, Any] = {}
+        state = {"next": 0, "written": 0}
+
+        def _advance() -> None:
+            # 앞에서부터 연속으로 완료된 page만 commit (writer 스레드 / writer 종료 후에만 호출)
+            while True:
+                with lock:
+                    idx = state["next"]
+                    if idx not in remaining or remaining[idx] > 0 or errors:
+                        return
+                    del remaining[idx]
+                    key = keys.pop(idx)
+                    state["next"] = idx + 1
+                if on_page_done is not None:
+                    on_page_done(key)
+
+        def _writer() -> None:
+            while True:
+                item = write_q.get()
+                if item is _STOP:
+                    return
+                page_idx, ids, vectors, texts, metas = item
+                try:
+                    if not errors:
+                        self.write_fn(ids, vectors, texts, metas)
+                        with lock:
+                            state["written"] += len(ids)
+                            remaining[page_idx] -= 1
+                        _advance()
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    inflight.release()
+
+        def _embed(page_idx: int, ids: List[str], texts: List[str], metas: List[Dict[str, Any]]) -> None:
+            try:
+                if errors:
+                    inflight.release()
+                    return
+                vectors = self._embed_with_retry(texts)
+                write_q.put((page_idx, ids, vectors, texts, metas))
+            except Exception as e:
+                errors.append(e)
+                inflight.release()
+
+        writer = threading.Thread(target=_writer, name="embed-writer", daemon=True)
+        writer.start()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="embed") as ex:
+                for page_idx, (key, ids, texts, metas) in enumerate(pages):
+                    if errors:
+                        break
+                    n_batches = (len(ids) + self.batch_size - 1) // self.batch_size
+                    with lock:
+                        remaining[page_idx] = n_batches
+                        keys[page_idx] = key
+                    if n_batches == 0:
+                        continue  # 빈 page는 writer의 _advance가 지나가며 commit
+                    for i in range(0, len(ids), self.batch_size):
+                        inflight.acquire()
+                        ex.submit(
+                            _embed,
+                            page_idx,
+                            ids[i:i + self.batch_size],
+                            texts[i:i + self.batch_size],
+                            metas[i:i + self.batch_size],
+                        )
+        finally:
+            write_q.put(_STOP)
+            writer.join()
+
+        if errors:
+            raise errors[0]
+        _advance()
+        return int(state["written"])
+
+
+def chroma_writer(vs) -> WriteFn:
+    """embed_pipeline write stage → chroma collection.upsert."""
+
+    def _write(ids: List[str], vectors: List[List[float]], texts: List[str], metas: List[Dict[str, Any]]) -> None:
+        vs._collection.upsert(  # type: ignore[attr-defined]
+            ids=ids,
+            embeddings=vectors,
+            documents=texts,
+            metadatas=metas,
+        )
+
+    return _write
+
+
+def rate_limiter_from_rpm(rpm: float, burst: int = 1) -> Optional[TokenBucket]:
+    """분당 요청 수(RPM) → TokenBucket. rpm <= 0이면 제한 없음(None)."""
+    if not rpm or float(rpm) <= 0:
+        return None
+    return TokenBucket(rate=float(rpm) / 60.0, capacity=float(burst))
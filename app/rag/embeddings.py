@@ -1,8 +1,197 @@
+import logging
+import re
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+
 from app.core.config import settings
+from app.utils.cache import LRUCache, register_cache
+
+logger = logging.getLogger(__name__)
+
+_EMBEDDINGS = None
+_LOCK = threading.Lock()
+
+
+def _normalize_query(text: str) -> str:
+    s = (text or "").strip()
+    s = re.sub(r"\s+", " ", s)
+    return s
+
+
+class _SQLiteVectorStore:
+    """(model, text) -> float32 벡터를 저장하는 작은 SQLite 파일 (재시작 후에도 유지)."""
+
+    def __init__(self, path: str):
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(p), check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS query_embedding (
+                    model TEXT NOT NULL,
+                    text  TEXT NOT NULL,
+                    vec   BLOB NOT NULL,
+                    PRIMARY KEY (model, text)
+                )
+                """
+            )
+            self._conn.commit()
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vec FROM query_embedding WHERE model = ? AND text = ?",
+                (model, text),
+            ).fetchone()
+        if row is None:
+            return None
+        return array("f", row[0]).tolist()
+
+    def put(self, model: str, text: str, vec: List[float]) -> None:
+        blob = array("f", vec).tobytes()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO query_embedding (model, text, vec) VALUES (?, ?, ?)",
+                (model, text, blob),
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM query_embedding").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    query 임베딩 캐시 래퍼.
+    - key: (embedding_model, 공백 정규화된 text)
+    - 1차: 메모리 LRU, 2차(선택): SQLite 파일
+    - embed_documents(인덱싱용)는 캐시하지 않고 그대로 위임
+    """
+
+    def __init__(self, base: Embeddings, model: str, maxsize: int = 10000, path: str = ""):
+        self.base = base
+        self.model = model
+        self.memory = LRUCache(maxsize=maxsize)
+        self.disk: Optional[_SQLiteVectorStore] = None
+        self.disk_hits = 0
+        self.misses = 0
+
+        if path:
+            try:
+                self.disk = _SQLiteVectorStore(path)
+            except Exception:
+                logger.warning("embedding cache file open failed: %s", path, exc_info=True)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.base.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        q = _normalize_query(text)
+        key = (self.model, q)
+
+        vec = self.memory.get(key)
+        if vec is not None:
+            return vec
+
+        if self.disk is not None:
+            vec = self.disk.get(self.model, q)
+            if vec is not None:
+                self.disk_hits += 1
+                self.memory.set(key, vec)
+                return vec
+
+        self.misses += 1
+        vec = self.base.embed_query(q)
+        self.memory.set(key, vec)
+        if self.disk is not None:
+            try:
+                self.disk.put(self.model, q, vec)
+            except Exception:
+                logger.warning("embedding cache write failed", exc_info=True)
+        return vec
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """embed_query의 batch 버전: 캐시 miss만 모아 base.embed_documents 1회."""
+        qs = [_normalize_query(t) for t in texts]
+        out: List[Optional[List[float]]] = [None] * len(qs)
+        miss: dict = {}  # q -> [positions]
+
+        for i, q in enumerate(qs):
+            vec = self.memory.get((self.model, q))
+            if vec is None and self.disk is not None:
+                vec = self.disk.get(self.model, q)
+                if vec is not None:
+                    self.disk_hits += 1
+                    self.memory.set((self.model, q), vec)
+            if vec is None:
+                miss.setdefault(q, []).append(i)
+            else:
+                out[i] = vec
+
+        if miss:
+            keys = list(miss)
+            self.misses += len(keys)
+            vecs = self.base.embed_documents(keys)
+            for q, vec in zip(keys, vecs):
+                self.memory.set((self.model, q), vec)
+                if self.disk is not None:
+                    try:
+                        self.disk.put(self.model, q, vec)
+                    except Exception:
+                        logger.warning("embedding cache write failed", exc_info=True)
+                for i in miss[q]:
+                    out[i] = vec
+        return out  # type: ignore[return-value]
+
+    def stats(self) -> dict:
+        mem = self.memory.stats()
+        total = mem["hits"] + self.disk_hits + self.misses
+        return {
+            "model": self.model,
+            "memory": mem,
+            "disk_enabled": self.disk is not None,
+            "disk_size": self.disk.count() if self.disk is not None else None,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": ((mem["hits"] + self.disk_hits) / total) if total else None,
+        }
+
 
 def get_embeddings():
-    from langchain_openai import OpenAIEmbeddings
-    return OpenAIEmbeddings(
-        model=settings.embedding_model,
-        api_key=settings.openai_api_key or None,
-    )
+    """프로세스 전역 embedding 클라이언트 (HTTP 커넥션 풀 재사용 + query 캐시)."""
+    global _EMBEDDINGS
+    if _EMBEDDINGS is not None:
+        return _EMBEDDINGS
+
+    with _LOCK:
+        if _EMBEDDINGS is None:
+            from langchain_openai import OpenAIEmbeddings
+            base = OpenAIEmbeddings(
+                model=settings.embedding_model,
+                api_key=settings.openai_api_key or None,
+            )
+            if settings.embedding_cache_enabled:
+                cached = CachedEmbeddings(
+                    base,
+                    model=settings.embedding_model,
+                    maxsize=settings.embedding_cache_size,
+                    path=settings.embedding_cache_path,
+                )
+                register_cache("embedding", cached)
+                _EMBEDDINGS = cached
+            else:
+                _EMBEDDINGS = base
+        return _EMBEDDINGS
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.schemas.common import SourceChunk
+
+# (doc_id, namespace, text, metadata)
+LexicalDoc = Tuple[str, str, str, Dict[str, Any]]
+
+
+def char_ngrams(text: str, n: int = 2) -> Counter:
+    """공백 제거 + 소문자 후 문자 n-gram (n보다 짧으면 문자열 전체 1개)."""
+    s = "".join((text or "").lower().split())
+    if not s:
+        return Counter()
+    if len(s) <= n:
+        return Counter([s])
+    return Counter(s[i:i + n] for i in range(len(s) - n + 1))
+
+
+class LexicalIndex:
+    """
+    문자 n-gram BM25 inverted index (네트워크 없이 동작하는 로컬 recall 경로).
+    postings는 CSR 배열로 보관:
+      indptr[t]..indptr[t+1] 구간의 post_doc(int32) / post_tf(float32)
+    """
+
+    def __init__(self, n: int = 2, k1: float = 1.2, b: float = 0.75):
+        self.n = int(n)
+        self.k1 = float(k1)
+        self.b = float(b)
+
+        self.vocab: Dict[str, int] = {}
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.post_doc = np.zeros(0, dtype=np.int32)
+        self.post_tf = np.zeros(0, dtype=np.float32)
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.doc_len = np.zeros(0, dtype=np.float32)
+        self.avgdl = 1.0
+
+        self.doc_ids: List[str] = []
+        self.doc_ns: List[str] = []
+        self.doc_text: List[str] = []
+        self.doc_meta: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    @classmethod
+    def build(cls, docs: Iterable[LexicalDoc], n: int = 2, k1: float = 1.2, b: float = 0.75) -> "LexicalIndex":
+        idx = cls(n=n, k1=k1, b=b)
+
+        term_ids: List[int] = []
+        doc_nos: List[int] = []
+        tfs: List[int] = []
+        lens: List[int] = []
+
+        for doc_no, (doc_id, ns, text, meta) in enumerate(docs):
+            grams = char_ngrams(text, idx.n)
+            idx.doc_ids.append(doc_id)
+            idx.doc_ns.append(ns)
+            idx.doc_text.append(text)
+            idx.doc_meta.append(meta)
+            lens.append(sum(grams.values()))
+            for g, tf in grams.items():
+                tid = idx.vocab.setdefault(g, len(idx.vocab))
+                term_ids.append(tid)
+                doc_nos.append(doc_no)
+                tfs.append(tf)
+
+        n_docs = len(idx.doc_ids)
+        n_terms = len(idx.vocab)
+
+        t = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(t, kind="stable")  # term 순 → 같은 term 안에서는 doc 순
+        idx.post_doc = np.asarray(doc_nos, dtype=np.int32)[order]
+        idx.post_tf = np.asarray(tfs, dtype=np.float32)[order]
+
+        df = np.bincount(t, minlength=n_terms).astype(np.int64)
+        idx.indptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(df, out=idx.indptr[1:])
+
+        idx.idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+        idx.doc_len = np.asarray(lens, dtype=np.float32)
+        idx.avgdl = float(idx.doc_len.mean()) if n_docs else 1.0
+        return idx
+
+    def scores(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(doc_no 배열, BM25 점수 배열) — query n-gram을 1개 이상 포함한 문서만."""
+        q = char_ngrams(query, self.n)
+        docs: List[np.ndarray] = []
+        contribs: List[np.ndarray] = []
+
+        for g, qtf in q.items():
+            tid = self.vocab.get(g)
+            if tid is None:
+                continue
+            s, e = self.indptr[tid], self.indptr[tid + 1]
+            d = self.post_doc[s:e]
+            f = self.post_tf[s:e]
+            denom = f + self.k1 * (1.0 - self.b + self.b * self.doc_len[d] / self.avgdl)
+            docs.append(d)
+            contribs.append(self.idf[tid] * f * (self.k1 + 1.0) / denom * qtf)
+
+        if not docs:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+
+        all_docs = np.concatenate(docs)
+        uniq, inv = np.unique(all_docs, return_inverse=True)
+        return uniq, np.bincount(inv, weights=np.concatenate(contribs)).astype(np.float32)
+
+    def search(self, query: str, top_k: int = 10, namespace: Optional[str] = None) -> List[SourceChunk]:
+        """
+        BM25 상위 top_k. score는 query별 최고점 대비 0~1로 정규화
+        (원 점수는 metadata["bm25"]).
+        """
+        doc_nos, sc = self.scores(query)
+        if namespace is not None and len(doc_nos):
+            keep = np.fromiter((self.doc_ns[i] == namespace for i in doc_nos), dtype=bool, count=len(doc_nos))
+            doc_nos, sc = doc_nos[keep], sc[keep]
+        if not len(doc_nos):
+            return []
+
+        k = min(int(top_k), len(doc_nos))
+        top = np.argpartition(-sc, k - 1)[:k]
+        top = top[np.argsort(-sc[top], kind="stable")]
+        best = float(sc[top[0]]) or 1.0
+
+        out: List[SourceChunk] = []
+        for j in top:
+            i = int(doc_nos[j])
+            meta = dict(self.doc_meta[i])
+            meta["bm25"] = float(sc[j])
+            out.append(SourceChunk(
+                id=self.doc_ids[i],
+                text=self.doc_text[i],
+                metadata=meta,
+                score=float(sc[j]) / best,
+            ))
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "docs": len(self.doc_ids),
+            "terms": len(self.vocab),
+            "postings": int(self.post_doc.shape[0]),
+            "avgdl": self.avgdl,
+            "ngram": self.n,
+        }
@@ -1,14 +1,9 @@
-from typing import List
+from typing import Dict, List
 from app.rag.vectorstore import get_vectorstore
 from app.schemas.common import SourceChunk
 
-def retrieve(query: str, top_k: int = 5, namespace: str | None = None) -> List[SourceChunk]:
-    vs = get_vectorstore()
-    search_kwargs = {"k": top_k}
-    if namespace:
-        search_kwargs["filter"] = {"namespace": namespace}
 
-    docs_and_scores = vs.similarity_search_with_score(query, **search_kwargs)
+def _to_chunks(docs_and_scores, namespace: str | None) -> List[SourceChunk]:
     out: List[SourceChunk] = []
     for i, (doc, score) in enumerate(docs_and_scores):
         out.append(SourceChunk(
@@ -18,3 +13,56 @@ def retrieve(query: str, top_k: int = 5, namespace: str | None = None) -> List[S
             score=float(score) if score is not None else None
         ))
     return out
+
+
+def _search_kwargs(top_k: int, namespace: str | None) -> dict:
+    search_kwargs = {"k": top_k}
+    if namespace:
+        search_kwargs["filter"] = {"namespace": namespace}
+    return search_kwargs
+
+
+def embed_query(query: str) -> List[float]:
+    vs = get_vectorstore()
+    return vs.embeddings.embed_query(query)
+
+
+def embed_queries(queries: List[str]) -> List[List[float]]:
+    """여러 query를 임베딩 요청 1회로 (query 캐시가 있으면 miss만)."""
+    if not queries:
+        return []
+    emb = get_vectorstore().embeddings
+    fn = getattr(emb, "embed_queries", None)
+    if fn is not None:
+        return fn(queries)
+    return emb.embed_documents(list(queries))
+
+
+def search_by_vector(embedding: List[float], top_k: int = 5, namespace: str | None = None) -> List[SourceChunk]:
+    """이미 계산된 query 벡터로 검색 (score는 retrieve()와 동일한 distance)."""
+    vs = get_vectorstore()
+    docs_and_scores = vs.similarity_search_by_vector_with_relevance_scores(
+        embedding, **_search_kwargs(top_k, namespace)
+    )
+    return _to_chunks(docs_and_scores, namespace)
+
+
+def retrieve(query: str, top_k: int = 5, namespace: str | None = None) -> List[SourceChunk]:
+    vs = get_vectorstore()
+    docs_and_scores = vs.similarity_search_with_score(query, **_search_kwargs(top_k, namespace))
+    return _to_chunks(docs_and_scores, namespace)
+
+
+def retrieve_multi(query: str, namespaces: Dict[str, int]) -> Dict[str, List[SourceChunk]]:
+    """
+    query를 1번만 임베딩하고, namespace별 top_k 검색을 같은 벡터로 수행.
+    예) retrieve_multi(q, {"std_master": 30, "std_synonym": 30})
+    """
+    if not namespaces:
+        return {}
+
+    embedding = embed_query(query)
+    return {
+        ns: search_by_vector(embedding, top_k=k, namespace=ns)
+        for ns, k in namespaces.items()
+    }
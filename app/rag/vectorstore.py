@@ -1,7 +1,17 @@
+import logging
+import threading
+
 from app.core.config import settings
 from app.rag.embeddings import get_embeddings
 
-def get_vectorstore():
+logger = logging.getLogger(__name__)
+
+# 프로세스 전역 1개만 유지 (요청마다 클라이언트/SQLite 재오픈 방지)
+_VECTORSTORE = None
+_LOCK = threading.Lock()
+
+
+def _build_vectorstore():
     from langchain_chroma import Chroma
     embeddings = get_embeddings()
     return Chroma(
@@ -9,3 +19,41 @@ def get_vectorstore():
         embedding_function=embeddings,
         persist_directory=settings.chroma_dir,
     )
+
+
+def get_vectorstore():
+    global _VECTORSTORE
+    vs = _VECTORSTORE
+    if vs is not None:
+        return vs
+
+    with _LOCK:
+        if _VECTORSTORE is None:
+            _VECTORSTORE = _build_vectorstore()
+        return _VECTORSTORE
+
+
+def init_vectorstore() -> None:
+    """FastAPI startup에서 호출: 첫 요청 전에 클라이언트를 미리 생성."""
+    get_vectorstore()
+
+
+def close_vectorstore() -> None:
+    """
+    공유 vector store를 닫는다. (shutdown / reset_chroma_db 시 사용)
+    다음 get_vectorstore() 호출 때 새로 생성된다.
+    """
+    global _VECTORSTORE
+    with _LOCK:
+        vs = _VECTORSTORE
+        _VECTORSTORE = None
+
+    if vs is None:
+        return
+
+    # chromadb는 persist_directory 단위로 System을 캐시하므로,
+    # 폴더 삭제 후 재생성 시 이전 핸들이 남지 않도록 캐시까지 비운다.
+    try:
+        vs._client.clear_system_cache()  # type: ignore[attr-defined]
+    except Exception:
+        logger.warning("chroma client cleanup failed", exc_info=True)
@@ -4,12 +4,18 @@ from typing import List, Optional
 class IngestSchemaRequest(BaseModel):
     file_path: Optional[str] = None  # if omitted, ingest from data/schema directory
     namespace: str = "schema"
+    force: bool = False  # true면 content_hash가 같아도 재임베딩
 
 class IngestExamplesRequest(BaseModel):
     file_path: Optional[str] = None  # if omitted, ingest from data/examples directory
     namespace: str = "examples"
+    force: bool = False
 
 class IngestResponse(BaseModel):
     added: int
     namespace: str
-    ids: List[str] = Field(default_factory=list)
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    ids: List[str] = Field(default_factory=list)  # 이번 실행에서 임베딩된 문서
+    deleted_ids: List[str] = Field(default_factory=list)
@@ -17,6 +17,11 @@ class SQLQueryRequest(BaseModel):
     include_total: bool = Field(False, description="total_rows 계산 여부(count 쿼리 1회 추가)")
 
 
+class SQLExportRequest(SQLQueryRequest):
+    question: str = Field("", description="자연어 질문 (export_token이 없거나 만료됐을 때 SQL 재생성용)")
+    export_token: Optional[str] = Field(None, description="/sql/query 응답의 export_token (있으면 SQL 재생성 없이 실행)")
+
+
 class SQLQueryResponse(BaseModel):
     sql: str = Field(..., description="최종 SQL")
     summary: str = Field(..., description="요약")
@@ -28,3 +33,5 @@ class SQLQueryResponse(BaseModel):
 
     sources: Optional[List[SourceChunk]] = Field(None, description="RAG sources(include_sources=true일 때)")
     warnings: List[str] = Field(default_factory=list, description="경고 메시지")
+
+    export_token: Optional[str] = Field(None, description="CSV export용 서명된 SQL token (짧은 TTL)")
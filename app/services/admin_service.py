@@ -4,6 +4,8 @@ import shutil
 from pathlib import Path
 
 from app.core.config import settings
+from app.rag.vectorstore import close_vectorstore
+from app.text_to_sql.sql_cache import invalidate_sql_cache
 
 
 def get_chroma_persist_dir() -> Path:
@@ -24,6 +26,10 @@ def reset_chroma_db() -> dict:
     persist_dir = get_chroma_persist_dir()
     existed = persist_dir.exists()
 
+    # 공유 클라이언트가 열어둔 SQLite 핸들을 먼저 닫는다 (다음 요청 때 새로 생성)
+    close_vectorstore()
+    invalidate_sql_cache()
+
     if existed:
         shutil.rmtree(persist_dir, ignore_errors=True)
 
@@ -1,7 +1,9 @@
+import hashlib
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple
 from langchain_core.documents import Document
 from app.rag.vectorstore import get_vectorstore
+from app.text_to_sql.sql_cache import invalidate_sql_cache
 from app.utils.paths import schema_dir, examples_dir
 
 TEXT_EXTS = {".txt", ".md", ".sql", ".yaml", ".yml", ".json"}
@@ -17,7 +19,29 @@ def _load_text_files(folder: Path) -> List[Tuple[str, str]]:
     return out
 
 
-def ingest_namespace(namespace: str, file_path: str | None = None) -> Tuple[int, List[str]]:
+def _content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _load_manifest(vs, namespace: str) -> Dict[str, str]:
+    """
+    chroma에 저장된 namespace 문서의 doc_id -> content_hash (manifest).
+    - content_hash가 없는 기존 문서는 ""로 취급 → 다음 실행 때 한 번 재임베딩
+    """
+    got = vs.get(where={"namespace": namespace}, include=["metadatas"])
+    out: Dict[str, str] = {}
+    for doc_id, meta in zip(got.get("ids") or [], got.get("metadatas") or []):
+        out[str(doc_id)] = str((meta or {}).get("content_hash") or "")
+    return out
+
+
+def ingest_namespace(namespace: str, file_path: str | None = None, force: bool = False) -> Dict[str, Any]:
+    """
+    schema/examples 증분 인덱싱.
+    - manifest(chroma metadata의 content_hash)와 파일을 비교해 신규/변경 문서만 임베딩
+    - 디렉터리 전체 ingest 시 파일이 사라진 문서는 삭제 (file_path 단건 ingest는 삭제하지 않음)
+    - force=True면 변경 여부와 무관하게 전부 재임베딩
+    """
     vs = get_vectorstore()
 
     if namespace == "schema":
@@ -27,58 +51,237 @@ def ingest_namespace(namespace: str, file_path: str | None = None) -> Tuple[int,
     else:
         folder = schema_dir().parent / namespace
 
-    docs: List[Document] = []
-    ids: List[str] = []
+    # doc_id -> (content, source)
+    current: Dict[str, Tuple[str, str]] = {}
 
     if file_path:
         p = Path(file_path)
         if not p.exists():
             raise FileNotFoundError(f"file_path not found: {file_path}")
         content = p.read_text(encoding="utf-8", errors="ignore")
-        doc_id = f"{namespace}:{p.name}"
+        current[f"{namespace}:{p.name}"] = (content, str(p))
+    else:
+        for name, content in _load_text_files(folder):
+            current[f"{namespace}:{name}"] = (content, str(folder / name))
+
+    manifest = _load_manifest(vs, namespace)
+
+    docs: List[Document] = []
+    ids: List[str] = []
+    added = updated = unchanged = 0
+
+    for doc_id, (content, source) in current.items():
+        h = _content_hash(content)
+        prev = manifest.get(doc_id)
+        if prev is None:
+            added += 1
+        elif prev != h or force:
+            updated += 1
+        else:
+            unchanged += 1
+            continue
+
         docs.append(Document(
             page_content=content,
             metadata={
                 "namespace": namespace,
                 "id": doc_id,
-                "source": str(p),
+                "source": source,
+                "content_hash": h,
             }
         ))
         ids.append(doc_id)
-    else:
-        for name, content in _load_text_files(folder):
-            doc_id = f"{namespace}:{name}"
-            docs.append(Document(
-                page_content=content,
-                metadata={
-                    "namespace": namespace,
-                    "id": doc_id,
-                    "source": str(folder / name),
-                }
-            ))
-            ids.append(doc_id)
 
-    if not docs:
-        return 0, []
+    deleted_ids: List[str] = []
+    if not file_path:
+        deleted_ids = sorted(set(manifest) - set(current))
 
-    try:
-        vs._collection.delete(ids=ids)  # type: ignore[attr-defined]
-    except Exception:
-        pass
+    if deleted_ids:
+        vs._collection.delete(ids=deleted_ids)  # type: ignore[attr-defined]
+
+    if docs:
+        # add_documents는 chroma upsert → 변경 문서는 같은 id로 덮어씀
+        vs.add_documents(docs, ids=ids)
 
-    vs.add_documents(docs, ids=ids)
-    return len(ids), ids
+    if docs or deleted_ids:
+        # schema/examples가 바뀌면 캐시된 생성 SQL은 더 이상 유효하지 않음
+        invalidate_sql_cache()
+
+    return {
+        "namespace": namespace,
+        "added": added,
+        "updated": updated,
+        "unchanged": unchanged,
+        "deleted": len(deleted_ids),
+        "ids": ids,
+        "deleted_ids": deleted_ids,
+    }
 
 
 # ===============================
 # 표준품명 전용 인덱싱 (정확도 강화 버전)
 # ===============================
 
+import json
+import logging
+import os
+
 from sqlalchemy import text
+from app.core.config import settings
 from app.db.connectors.oracle import get_engine
+from app.rag.embed_pipeline import EmbedPipeline, chroma_writer, rate_limiter_from_rpm
+
+logger = logging.getLogger(__name__)
+
+# 재개 지점은 namespace별 마지막 key(STD_ID / SYN_ID) → 정렬 키와 동일해야 함
+_STD_MASTER_SQL = """
+    SELECT
+        M.STD_ID,
+        M.STD_NM,
+        M.STD_DESC,
+        M.HS_CODE
+    FROM TE_STD001M M
+    WHERE M.IS_ACTIVE = 'Y'
+      AND M.STD_ID > :after
+    ORDER BY M.STD_ID
+"""
+
+_STD_SYNONYM_SQL = """
+    SELECT
+        L.SYN_ID,
+        L.SYN_NM,
+        M.STD_ID,
+        M.STD_NM,
+        M.STD_DESC,
+        M.HS_CODE
+    FROM TE_STD002L L
+    JOIN TE_STD001M M ON L.STD_ID = M.STD_ID
+    WHERE L.IS_ACTIVE = 'Y'
+      AND L.SYN_ID > :after
+    ORDER BY L.SYN_ID
+"""
+
+
+def _std_master_doc(r) -> Tuple[str, str, Dict[str, Any]]:
+    std_id, name, desc, hs_code = r
+
+    content = (
+        f"[TYPE] STD_MASTER\n"
+        f"[STD_ID] {std_id}\n"
+        f"[STD_NAME] {name}\n"
+        f"[DESCRIPTION] {desc or ''}\n"
+        f"[HS_CODE] {hs_code or ''}\n"
+    )
+
+    doc_id = f"std_master:{std_id}"
+    return doc_id, content, {
+        "namespace": "std_master",
+        "id": doc_id,
+        "std_id": std_id,
+        "std_name": name,
+        "std_desc": desc,
+        "hs_code": hs_code,
+    }
+
+
+def _std_synonym_doc(r) -> Tuple[str, str, Dict[str, Any]]:
+    syn_id, syn_nm, std_id, std_name, std_desc, hs_code = r
+
+    content = (
+        f"[TYPE] STD_SYNONYM\n"
+        f"[SYNONYM] {syn_nm}\n"
+        f"[STD_NAME] {std_name}\n"
+        f"[DESCRIPTION] {std_desc or ''}\n"
+        f"[HS_CODE] {hs_code or ''}\n"
+    )
+
+    doc_id = f"std_synonym:{syn_id}"
+    return doc_id, content, {
+        "namespace": "std_synonym",
+        "id": doc_id,
+        "std_id": std_id,
+        "std_name": std_name,
+        "std_desc": std_desc,
+        "hs_code": hs_code,
+    }
+
+
+# -----------------------------
+# checkpoint (namespace -> 마지막으로 upsert 완료된 key)
+# -----------------------------
+def _checkpoint_path() -> str:
+    p = getattr(settings, "std_ingest_checkpoint_path", "") or ""
+    return p or str(Path(settings.chroma_dir) / "std_ingest_checkpoint.json")
+
+
+def _load_checkpoint(path: str) -> Dict[str, int]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return {k: int(v) for k, v in json.load(f).items()}
+    except FileNotFoundError:
+        return {}
+    except Exception:
+        logger.warning("std ingest checkpoint unreadable, starting over: %s", path, exc_info=True)
+        return {}
+
+
+def _save_checkpoint(path: str, state: Dict[str, int]) -> None:
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def _iter_pages(rs, page_size: int, to_doc):
+    """server-side cursor 결과를 page_size씩 (last_key, ids, texts, metas)로 변환."""
+    for page in rs.partitions(page_size):
+        ids: List[str] = []
+        texts: List[str] = []
+        metas: List[Dict[str, Any]] = []
+        for r in page:
+            doc_id, content, meta = to_doc(r)
+            ids.append(doc_id)
+            texts.append(content)
+            metas.append(meta)
+        yield int(page[-1][0]), ids, texts, metas
+
+
+def _ingest_std_stream(
+    pipeline: EmbedPipeline,
+    conn,
+    namespace: str,
+    sql: str,
+    to_doc,
+    state: Dict[str, int],
+    ckpt_path: str,
+    page_size: int,
+) -> int:
+    """
+    server-side cursor(stream_results + yield_per)로 page_size씩 읽어 pipeline에 흘려보냄.
+    - 임베딩은 worker 병렬, upsert는 writer 스레드에서 겹쳐 진행
+    - page 순서대로 기록이 끝난 지점까지만 checkpoint 갱신
+    """
+    after = int(state.get(namespace, 0))
+    rs = conn.execution_options(stream_results=True, yield_per=page_size).execute(
+        text(sql), {"after": after}
+    )
+
+    def _on_page_done(last_key: int) -> None:
+        state[namespace] = last_key
+        _save_checkpoint(ckpt_path, state)
+        logger.info("ingest_std %s: checkpoint last key=%s", namespace, last_key)
 
+    return pipeline.run(_iter_pages(rs, page_size, to_doc), on_page_done=_on_page_done)
 
-def ingest_std():
+
+def ingest_std(
+    resume: bool = False,
+    page_size: int | None = None,
+    embed_batch_size: int | None = None,
+    workers: int | None = None,
+) -> Dict[str, Any]:
     """
     정확도 극대화를 위한 표준품명/동의어 인덱싱.
 
@@ -87,110 +290,67 @@ def ingest_std():
     - std_master / std_synonym 모두 설명 포함
     - 구조화된 태그 사용
     - metadata에 hs_code/std_desc 저장
+
+    ✅ streaming:
+    - STD_ID / SYN_ID 순으로 page_size씩 읽고 page마다 embed(embed_batch_size 단위) + upsert
+    - page 완료마다 checkpoint 기록 → resume=True면 마지막 key 다음부터 재개
+    - 전체 완료 시 checkpoint 삭제
+
+    ✅ parallel embedding (app.rag.embed_pipeline):
+    - workers개 스레드로 embed_batch_size 단위 병렬 임베딩 + EMBED_RATE_LIMIT_RPM token bucket
+    - 429/5xx는 backoff 후 재시도, chroma upsert는 별도 writer 스레드
     """
+    page_size = max(1, int(page_size or settings.std_ingest_page_size))
+    embed_batch_size = max(1, int(embed_batch_size or settings.std_ingest_embed_batch_size))
+    workers = max(1, int(workers or settings.std_ingest_embed_workers))
+    ckpt_path = _checkpoint_path()
+
+    state = _load_checkpoint(ckpt_path) if resume else {}
+    resumed_from = dict(state)
 
     vs = get_vectorstore()
     eng = get_engine()
 
+    pipeline = EmbedPipeline(
+        embed_fn=vs.embeddings.embed_documents,
+        write_fn=chroma_writer(vs),
+        workers=workers,
+        batch_size=embed_batch_size,
+        rate_limiter=rate_limiter_from_rpm(settings.embed_rate_limit_rpm, burst=workers),
+        max_retries=settings.embed_max_retries,
+        backoff_base_sec=settings.embed_backoff_base_sec,
+        backoff_max_sec=settings.embed_backoff_max_sec,
+    )
+
+    counts: Dict[str, int] = {}
     with eng.connect() as conn:
-
         # -----------------------------
         # 1. STD_MASTER
         # -----------------------------
-        rows = conn.execute(text("""
-            SELECT
-                M.STD_ID,
-                M.STD_NM,
-                M.STD_DESC,
-                M.HS_CODE
-            FROM TE_STD001M M
-            WHERE M.IS_ACTIVE = 'Y'
-        """)).fetchall()
-
-        docs = []
-        ids = []
-
-        for r in rows:
-            std_id, name, desc, hs_code = r
-
-            content = (
-                f"[TYPE] STD_MASTER\n"
-                f"[STD_ID] {std_id}\n"
-                f"[STD_NAME] {name}\n"
-                f"[DESCRIPTION] {desc or ''}\n"
-                f"[HS_CODE] {hs_code or ''}\n"
-            )
-
-            doc_id = f"std_master:{std_id}"
-
-            docs.append(Document(
-                page_content=content,
-                metadata={
-                    "namespace": "std_master",
-                    "id": doc_id,
-                    "std_id": std_id,
-                    "std_name": name,
-                    "std_desc": desc,
-                    "hs_code": hs_code,
-                }
-            ))
-            ids.append(doc_id)
-
-        if docs:
-            try:
-                vs._collection.delete(ids=ids)
-            except Exception:
-                pass
-            vs.add_documents(docs, ids=ids)
+        counts["std_master"] = _ingest_std_stream(
+            pipeline, conn, "std_master", _STD_MASTER_SQL, _std_master_doc,
+            state, ckpt_path, page_size,
+        )
 
         # -----------------------------
         # 2. STD_SYNONYM
         # -----------------------------
-        rows = conn.execute(text("""
-            SELECT
-                L.SYN_ID,
-                L.SYN_NM,
-                M.STD_ID,
-                M.STD_NM,
-                M.STD_DESC,
-                M.HS_CODE
-            FROM TE_STD002L L
-            JOIN TE_STD001M M ON L.STD_ID = M.STD_ID
-            WHERE L.IS_ACTIVE = 'Y'
-        """)).fetchall()
-
-        docs = []
-        ids = []
-
-        for r in rows:
-            syn_id, syn_nm, std_id, std_name, std_desc, hs_code = r
-
-            content = (
-                f"[TYPE] STD_SYNONYM\n"
-                f"[SYNONYM] {syn_nm}\n"
-                f"[STD_NAME] {std_name}\n"
-                f"[DESCRIPTION] {std_desc or ''}\n"
-                f"[HS_CODE] {hs_code or ''}\n"
-            )
-
-            doc_id = f"std_synonym:{syn_id}"
-
-            docs.append(Document(
-                page_content=content,
-                metadata={
-                    "namespace": "std_synonym",
-                    "id": doc_id,
-                    "std_id": std_id,
-                    "std_name": std_name,
-                    "std_desc": std_desc,
-                    "hs_code": hs_code,
-                }
-            ))
-            ids.append(doc_id)
+        counts["std_synonym"] = _ingest_std_stream(
+            pipeline, conn, "std_synonym", _STD_SYNONYM_SQL, _std_synonym_doc,
+            state, ckpt_path, page_size,
+        )
+
+    try:
+        os.remove(ckpt_path)
+    except FileNotFoundError:
+        pass
 
-        if docs:
-            try:
-                vs._collection.delete(ids=ids)
-            except Exception:
-                pass
-            vs.add_documents(docs, ids=ids)
\ No newline at end of file
+    return {
+        "std_master": counts["std_master"],
+        "std_synonym": counts["std_synonym"],
+        "resumed_from": resumed_from,
+        "page_size": page_size,
+        "embed_batch_size": embed_batch_size,
+        "workers": workers,
+        "embed_retries": pipeline.retries,
+    }
@@ -2,88 +2,20 @@
 from __future__ import annotations
 
 import re
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from app.core.config import settings
-from app.schemas.sql import SQLQueryRequest, SQLQueryResponse
+from app.schemas.sql import SQLExportRequest, SQLQueryRequest, SQLQueryResponse
 from app.text_to_sql.context_builder import build_context
 from app.text_to_sql.executor import count, execute
+from app.text_to_sql.export_token import sign_export_token, verify_export_token
+from app.text_to_sql.question_classifier import QuestionFeatures, classify_question
 from app.text_to_sql.result_formatter import format_rows
 from app.text_to_sql.sql_generator import generate_sql
-from app.text_to_sql.sql_rewriter import rewrite_sql
+from app.text_to_sql.sql_rewriter import apply_sql_rules
 from app.text_to_sql.sql_validator import validate_sql
 
 
-# ----------------------------
-# Rank / Window helpers
-# ----------------------------
-_RANK_DIGIT_RE = re.compile(r"(\d+)\s*(위|등|번째)")
-_RANK_KOREAN_RE = re.compile(r"(한|두|세|네|다섯|여섯|일곱|여덟|아홉|열)\s*번째")
-_TOPN_RE = re.compile(r"(상위|TOP)\s*(\d+)", re.IGNORECASE)
-
-_KOREAN_ORDINAL_MAP = {
-    "한": 1,
-    "두": 2,
-    "세": 3,
-    "네": 4,
-    "다섯": 5,
-    "여섯": 6,
-    "일곱": 7,
-    "여덟": 8,
-    "아홉": 9,
-    "열": 10,
-}
-
-
-# ----------------------------
-# DDL / DML intent guard
-# ----------------------------
-_WRITE_INTENT_PATTERNS = [
-    r"\bINSERT\b",
-    r"\bUPDATE\b",
-    r"\bDELETE\b",
-    r"\bMERGE\b",
-    r"\bUPSERT\b",
-    r"\bCREATE\b",
-    r"\bALTER\b",
-    r"\bDROP\b",
-    r"\bTRUNCATE\b",
-    r"\bRENAME\b",
-    r"\bGRANT\b",
-    r"\bREVOKE\b",
-    r"업데이트\s*해",
-    r"수정\s*해",
-    r"삭제\s*해",
-    r"추가\s*해",
-    r"생성\s*해",
-    r"변경\s*해",
-    r"등록\s*해",
-    r"반영\s*해",
-    r"만들어\s*줘",
-    r"바꿔\s*줘",
-    r"지워\s*줘",
-    r"테이블.*생성",
-    r"테이블.*만들",
-    r"컬럼.*추가",
-    r"인덱스.*생성",
-    r"제약조건.*추가",
-    r"데이터.*삭제",
-    r"데이터.*수정",
-    r"데이터.*변경",
-]
-
-
-def _is_write_intent(question: str) -> bool:
-    q = (question or "").strip()
-    if not q:
-        return False
-
-    for pattern in _WRITE_INTENT_PATTERNS:
-        if re.search(pattern, q, flags=re.IGNORECASE):
-            return True
-    return False
-
-
 def _read_only_rejection() -> str:
     return (
         "이 서비스는 조회(SELECT) 전용입니다. "
@@ -101,58 +33,6 @@ def _has_window_function(sql: str) -> bool:
     )
 
 
-def _extract_rank_n(question: str) -> Optional[int]:
-    q = question or ""
-    m = _RANK_DIGIT_RE.search(q)
-    if m:
-        return int(m.group(1))
-
-    m = _RANK_KOREAN_RE.search(q)
-    if m:
-        return _KOREAN_ORDINAL_MAP.get(m.group(1))
-
-    return None
-
-
-def _looks_like_topn_question(question: str) -> bool:
-    return bool(_TOPN_RE.search(question or ""))
-
-
-def _looks_like_growth_rate_question(question: str) -> bool:
-    q = question or ""
-    uq = q.upper()
-
-    korean_keywords = [
-        "증감률",
-        "증가율",
-        "감소율",
-        "전년대비",
-        "전년 동기 대비",
-        "전년동기대비",
-    ]
-    english_keywords = [
-        "YOY",
-        "GROWTH RATE",
-        "CHANGE RATE",
-    ]
-
-    return any(k in q for k in korean_keywords) or any(k in uq for k in english_keywords)
-
-
-def _looks_like_inline_view_question(question: str) -> bool:
-    q = question or ""
-    hints = [
-        "월별 평균",
-        "평균수출금액",
-        "평균수입금액",
-        "월별 평균수출금액",
-        "월별 평균수입금액",
-        "월별",
-        "평균",
-    ]
-    return any(h in q for h in hints)
-
-
 def _strip_sql_fences(sql: str) -> str:
     s = (sql or "").strip()
     s = re.sub(r"^\s*```(?:sql)?\s*", "", s, flags=re.IGNORECASE)
@@ -213,6 +93,20 @@ def _ensure_limit(sql: str, row_limit: int, dialect: str) -> str:
     return f"{s}\nLIMIT {row_limit};"
 
 
+def _export_sql(sql: str, row_limit: int, dialect: str) -> str:
+    """
+    /sql/query에서 row_limit으로 붙은 끝의 FETCH FIRST n / LIMIT n 제거 → export 상한은 connector가 적용.
+    n이 row_limit과 다르면 질문 의도(상위 N 등)이므로 유지.
+    """
+    s = (sql or "").strip().rstrip(";").strip()
+    n = int(row_limit)
+    if dialect.lower() == "oracle":
+        pat = rf"\s+FETCH\s+FIRST\s+{n}\s+ROWS\s+ONLY\s*$"
+    else:
+        pat = rf"\s+LIMIT\s+{n}\s*$"
+    return re.sub(pat, "", s, flags=re.IGNORECASE) + ";"
+
+
 def _build_summary(returned: int, row_limit: int, total: Optional[int]) -> tuple[str, bool]:
     if total is not None:
         if returned >= row_limit and total > row_limit:
@@ -225,90 +119,35 @@ def _build_summary(returned: int, row_limit: int, total: Optional[int]) -> tuple
     return f"{returned}건 표시", False
 
 
-def _enforce_growth_rate_rule_if_needed(*, question, sql, context, dialect, row_limit):
-    if not _looks_like_growth_rate_question(question):
-        return sql
-
-    policy = (
-        "ORACLE GROWTH RATE RULE:\n"
-        "- If the user asks for 증감률 / 증가율 / 감소율 / 전년대비 / 전년동기대비, you MUST protect division by zero.\n"
-        "- Use: ((CURRENT_VALUE - PREVIOUS_VALUE) / NULLIF(PREVIOUS_VALUE, 0)) * 100.\n"
-        "- If the user asks for 순위 / N위 / 상위 based on the growth rate, exclude rows where PREVIOUS_VALUE is NULL or 0 before ranking, OR ensure those rows are ranked last.\n"
-        "- In Oracle, when ordering or ranking by a nullable growth-rate expression, use DESC NULLS LAST.\n"
-        "- Prefer CTE pattern: BASE -> CALC -> RANKED.\n"
-        "- Do NOT use SELECT *.\n"
-        "- Do NOT duplicate aliases.\n"
-        "- All output columns MUST have Korean aliases suitable for table headers.\n"
-        "- Output SQL only.\n"
-    )
-
-    rewritten = rewrite_sql(question, sql, policy, context, dialect, row_limit)
-    return _sanitize_sql(rewritten)
-
-
-def _enforce_rank_only_if_needed(*, question, sql, context, dialect, row_limit):
-    rank_n = _extract_rank_n(question)
-    if not rank_n or _looks_like_topn_question(question):
-        return sql
-
-    policy = (
-        "ORACLE RANK RULE:\n"
-        "- NEVER use RANK() in HAVING or WHERE.\n"
-        "- Use CTE: base -> ranked -> outer WHERE RNK = N.\n"
-        "- Do NOT use SELECT *.\n"
-        "- Do NOT duplicate aliases.\n"
-        "- All output columns MUST have Korean aliases suitable for table headers (e.g., CNTY_NM AS 국가명).\n"
-        "- Use double quotes for Korean aliases in Oracle if needed (e.g., CNTY_NM AS \"국가명\").\n"
-        "- If ranking by 증감률 or 증가율 or 감소율, use zero-safe denominator with NULLIF and rank with DESC NULLS LAST.\n"
-        "- If ranking by 증감률 or 증가율 or 감소율, prefer excluding rows where the previous/base value is NULL or 0.\n"
-        "- Output SQL only.\n"
-    )
-
-    rewritten = rewrite_sql(question, sql, policy, context, dialect, row_limit)
-    return _sanitize_sql(rewritten)
-
-
-def _enforce_alias_scope_rule_if_needed(*, question, sql, context, dialect, row_limit):
-    if not _looks_like_inline_view_question(question):
-        return sql
-
-    policy = (
-        "ORACLE SUBQUERY ALIAS SCOPE RULE:\n"
-        "- If you use an inline view or subquery in FROM ( ... ), you MUST assign it an alias, e.g. FROM ( ... ) A.\n"
-        "- Table aliases defined inside the subquery, such as T, M, H, are NOT visible in the outer query.\n"
-        "- Therefore, in the outer SELECT / GROUP BY / ORDER BY, NEVER reference T.COL, M.COL, H.COL from the inner query.\n"
-        "- In the outer query, use ONLY the inline-view alias, e.g. A.ACPT_YYMM, A.MONTH_SUM.\n"
-        "- For monthly-average pattern, prefer:\n"
-        "  SELECT SUBSTR(A.ACPT_YYMM, 5, 2) AS \"월\", AVG(A.MONTH_SUM) AS \"평균금액\"\n"
-        "  FROM ( ... ) A\n"
-        "  GROUP BY SUBSTR(A.ACPT_YYMM, 5, 2)\n"
-        "  ORDER BY \"월\".\n"
-        "- Do NOT use SELECT *.\n"
-        "- Do NOT duplicate aliases.\n"
-        "- Output SQL only.\n"
+def _apply_rules(*, features: QuestionFeatures, sql, dialect, row_limit):
+    """기존 LLM policy 3종(alias scope / 증감률 / 순위)을 규칙 기반 1-pass로."""
+    rewritten = apply_sql_rules(
+        sql,
+        dialect,
+        row_limit,
+        growth=features.growth,
+        rank=bool(features.rank_n) and not features.topn,  # 상위 N 질문은 순위 규칙 제외 (기존 동작)
+        inline_view=features.inline_view,
     )
-
-    rewritten = rewrite_sql(question, sql, policy, context, dialect, row_limit)
     return _sanitize_sql(rewritten)
 
 
 class SQLService:
-    def handle(self, req: SQLQueryRequest) -> SQLQueryResponse:
-        if _is_write_intent(req.question):
-            return SQLQueryResponse(
-                sql="",
-                summary=_read_only_rejection(),
-                results=[],
-                sources=None,
-                total_rows=None,
-                is_limited=False,
-            )
-
+    def prepare(self, req: SQLQueryRequest, *, row_limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        질문 → 검증된 최종 SQL (실행 X).
+        row_limit 생략 시 min(req.row_limit, MAX_ROWS) / export는 EXPORT_MAX_ROWS를 넘겨 사용.
+        반환: {sql, dialect, row_limit, sources, error} (error가 있으면 실행하지 않음)
+        """
         dialect = req.dialect or settings.db_dialect
-        row_limit = min(req.row_limit, settings.max_rows)
+        if row_limit is None:
+            row_limit = min(req.row_limit, settings.max_rows)
+
+        features = classify_question(req.question)
+        if features.write_intent:
+            return {"sql": "", "dialect": dialect, "row_limit": row_limit, "sources": None, "error": _read_only_rejection()}
 
         include_sources = bool(getattr(req, "include_sources", False))
-        include_total = bool(getattr(req, "include_total", False))
 
         context, sources = build_context(req.question, req.top_k)
         resp_sources = sources if include_sources else None
@@ -316,26 +155,9 @@ class SQLService:
         sql = generate_sql(req.question, context, dialect, row_limit)
         sql = _sanitize_sql(sql)
 
-        sql = _enforce_alias_scope_rule_if_needed(
-            question=req.question,
-            sql=sql,
-            context=context,
-            dialect=dialect,
-            row_limit=row_limit,
-        )
-
-        sql = _enforce_growth_rate_rule_if_needed(
-            question=req.question,
-            sql=sql,
-            context=context,
-            dialect=dialect,
-            row_limit=row_limit,
-        )
-
-        sql = _enforce_rank_only_if_needed(
-            question=req.question,
+        sql = _apply_rules(
+            features=features,
             sql=sql,
-            context=context,
             dialect=dialect,
             row_limit=row_limit,
         )
@@ -345,15 +167,31 @@ class SQLService:
 
         ok, warnings = validate_sql(sql)
         if not ok:
+            return {"sql": sql, "dialect": dialect, "row_limit": row_limit, "sources": resp_sources, "error": "SQL rejected"}
+
+        return {"sql": sql, "dialect": dialect, "row_limit": row_limit, "sources": resp_sources, "error": None}
+
+    def handle(self, req: SQLQueryRequest) -> SQLQueryResponse:
+        prepared = self.prepare(req)
+        sql = prepared["sql"]
+        dialect = prepared["dialect"]
+        row_limit = prepared["row_limit"]
+        resp_sources = prepared["sources"]
+
+        if prepared["error"]:
             return SQLQueryResponse(
                 sql=sql,
-                summary="SQL rejected",
+                summary=prepared["error"],
                 results=[],
                 sources=resp_sources,
                 total_rows=None,
                 is_limited=False,
             )
 
+        include_total = bool(getattr(req, "include_total", False))
+
+        export_token = sign_export_token(sql, dialect, row_limit)
+
         if req.dry_run:
             return SQLQueryResponse(
                 sql=sql,
@@ -362,6 +200,7 @@ class SQLService:
                 sources=None,
                 total_rows=None,
                 is_limited=False,
+                export_token=export_token,
             )
 
         try:
@@ -382,6 +221,7 @@ class SQLService:
                 sources=resp_sources,
                 total_rows=total,
                 is_limited=is_limited,
+                export_token=export_token,
             )
 
         except Exception as e:
@@ -392,4 +232,26 @@ class SQLService:
                 sources=resp_sources,
                 total_rows=None,
                 is_limited=False,
-            )
\ No newline at end of file
+            )
+
+    def prepare_export(self, req: SQLExportRequest) -> Dict[str, Any]:
+        """
+        export용 SQL.
+        - export_token이 유효하면 서명된 SQL 그대로 (RAG/LLM 생략)
+        - 없거나 만료/위조면 질문으로 재생성 (EXPORT_MAX_ROWS 기준)
+        """
+        row_limit = int(settings.export_max_rows)
+
+        payload = verify_export_token(req.export_token) if req.export_token else None
+        if payload is not None:
+            sql = payload["sql"]
+            dialect = payload.get("dialect") or settings.db_dialect
+            ok, warnings = validate_sql(sql)
+            if ok:
+                sql = _export_sql(sql, int(payload.get("row_limit") or 0), dialect)
+                return {"sql": sql, "dialect": dialect, "row_limit": row_limit, "sources": None, "error": None}
+
+        if not (req.question or "").strip():
+            return {"sql": "", "dialect": req.dialect or settings.db_dialect, "row_limit": row_limit, "sources": None, "error": "export_token expired or invalid; question is required"}
+
+        return self.prepare(req, row_limit=row_limit)
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+class StdCandidates:
+    """
+    표준품명 후보 columnar 표현 (std_id / score / score_raw / weight 병렬 배열).
+    - 배열 순서 = std_id 최초 등장 순 (기존 dict 병합의 insertion order)
+    - sources는 label별 등장 횟수 배열(counts)로 보관 → head()에서 기존과 같은 list로 복원
+    - 최종 순서 = (boost 후 score desc, boost 전 score desc, 최초 등장 순)
+      = 기존 "병합 후 sorted → boost → filter → sorted" 두 번의 stable sort와 동일
+    - dict는 응답에 쓰는 head(n)만 생성
+    """
+
+    def __init__(
+        self,
+        std_id: np.ndarray,
+        score: np.ndarray,
+        counts: np.ndarray,
+        labels: List[str],
+        names: List[Any],
+    ):
+        self.std_id = std_id
+        self.score = score
+        self.score_raw = score.copy()
+        self.weight = np.ones(len(std_id), dtype=np.float64)
+        self.counts = counts  # (n, len(labels))
+        self.labels = labels
+        self.names = names
+        self.seen = np.arange(len(std_id))  # 최초 등장 순번 (tie-break)
+        self.boosted = False
+
+    def __len__(self) -> int:
+        return int(self.std_id.shape[0])
+
+    # -----------------------------
+    # build
+    # -----------------------------
+    @classmethod
+    def merge(
+        cls,
+        master_hits,
+        synonym_hits,
+        lexical_hits=None,
+        lexical_weight: float = 0.0,
+    ) -> "StdCandidates":
+        """
+        벡터 hit(std_master x1.0 / std_synonym x1.2) 합산 + lexical(BM25, 0~1 정규화) 융합.
+        lexical은 std_id별 최고점 1개만 lexical_weight 배로 더함 (동의어 많은 표준품명 쏠림 방지).
+        """
+        ids: List[int] = []
+        vals: List[float] = []
+        lab: List[int] = []
+        names: List[Any] = []
+        labels: List[str] = []
+        label_no: Dict[Any, int] = {}
+
+        def _add(sid: int, val: float, label: Any, name: Any) -> None:
+            if label not in label_no:
+                label_no[label] = len(labels)
+                labels.append(label)
+            ids.append(sid)
+            vals.append(val)
+            lab.append(label_no[label])
+            names.append(name)
+
+        for hits, boost in ((master_hits, 1.0), (synonym_hits, 1.2)):
+            for h in hits:
+                metadata = h.metadata or {}
+                std_id = metadata.get("std_id")
+                if not std_id:
+                    continue
+                _add(int(std_id), (h.score or 0) * boost, metadata.get("namespace"), metadata.get("std_name"))
+
+        if lexical_hits and lexical_weight > 0:
+            best: Dict[int, Any] = {}
+            for h in lexical_hits:
+                sid = int((h.metadata or {}).get("std_id") or 0)
+                if sid and (sid not in best or (h.score or 0) > (best[sid].score or 0)):
+                    best[sid] = h
+            for sid, h in best.items():
+                _add(sid, (h.score or 0) * lexical_weight, "lexical", h.metadata.get("std_name"))
+
+        if not ids:
+            return cls(
+                np.zeros(0, dtype=np.int64),
+                np.zeros(0, dtype=np.float64),
+                np.zeros((0, 0), dtype=np.int32),
+                [],
+                [],
+            )
+
+        hit_ids = np.asarray(ids, dtype=np.int64)
+        uniq, first, inv = np.unique(hit_ids, return_index=True, return_inverse=True)
+
+        # 최초 등장 순으로 재배치
+        order = np.argsort(first, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(order.shape[0])
+        pos = rank[inv]  # hit -> 후보 위치
+
+        n = int(uniq.shape[0])
+        # bincount는 입력 순서대로 누적 → 기존 "0.0 + hit 순서대로 +=" 와 같은 부동소수 결과
+        score = np.bincount(pos, weights=np.asarray(vals, dtype=np.float64), minlength=n)
+        counts = np.zeros((n, len(labels)), dtype=np.int32)
+        np.add.at(counts, (pos, np.asarray(lab, dtype=np.int64)), 1)
+
+        return cls(
+            uniq[order],
+            score,
+            counts,
+            labels,
+            [names[i] for i in first[order]],
+        )
+
+    # -----------------------------
+    # weight / filter
+    # -----------------------------
+    def std_ids(self) -> List[int]:
+        return [int(x) for x in self.std_id]
+
+    def apply_weight_boost(self, w_map: Dict[int, float], alpha: float, cap: float) -> None:
+        """score = score_raw * (1 + alpha*(w-1)), w는 음수면 1.0 / cap 초과면 cap (w_map에 없으면 1.0)."""
+        w = np.fromiter(
+            (float(w_map.get(int(sid), 1.0) or 1.0) for sid in self.std_id),
+            dtype=np.float64,
+            count=len(self),
+        )
+        w[w < 0] = 1.0
+        np.minimum(w, cap, out=w)
+
+        self.score_raw = self.score.copy()
+        self.weight = w
+        self.score = np.where(w != 1.0, self.score_raw * (1.0 + alpha * (w - 1.0)), self.score_raw)
+        self.boosted = True
+
+    def filter_min_score(self, min_score: float) -> None:
+        keep = self.score >= float(min_score)
+        if keep.all():
+            return
+        self.std_id = self.std_id[keep]
+        self.score = self.score[keep]
+        self.score_raw = self.score_raw[keep]
+        self.weight = self.weight[keep]
+        self.counts = self.counts[keep]
+        self.seen = self.seen[keep]
+        self.names = [nm for nm, k in zip(self.names, keep) if k]
+
+    # -----------------------------
+    # top-k
+    # -----------------------------
+    def top_order(self, k: int) -> np.ndarray:
+        """상위 k개 위치 (partial sort: 경계 동점까지만 골라 정렬)."""
+        n = len(self)
+        k = min(int(k), n)
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+
+        neg = -self.score
+        if k < n:
+            kth = np.partition(neg, k - 1)[k - 1]
+            sel = np.flatnonzero(neg <= kth)
+        else:
+            sel = np.arange(n)
+
+        # lexsort: 마지막 key가 1순위
+        order = np.lexsort((self.seen[sel], -self.score_raw[sel], neg[sel]))
+        return sel[order][:k]
+
+    def head(self, k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """상위 k개를 기존 후보 dict 형태로 (k=None이면 전체)."""
+        idx = self.top_order(len(self) if k is None else k)
+
+        out: List[Dict[str, Any]] = []
+        for i in idx:
+            i = int(i)
+            sources: List[Any] = []
+            for j, cnt in enumerate(self.counts[i]):
+                if cnt:
+                    sources.extend([self.labels[j]] * int(cnt))
+            c: Dict[str, Any] = {
+                "std_id": int(self.std_id[i]),
+                "std_name": self.names[i],
+                "score": float(self.score[i]),
+                "sources": sources,
+            }
+            if self.boosted:
+                c["score_raw"] = float(self.score_raw[i])
+                c["weight"] = float(self.weight[i])
+            out.append(c)
+        return out
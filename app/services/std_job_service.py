@@ -0,0 +1,524 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.std_service import normalize_std_batch_async
+from app.utils.cache import register_cache
+from app.utils.filelock import try_lock_file, unlock_file
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "jsonl")
+
+_STOP = object()
+_JOB_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+_READ_BLOCK = 64 * 1024
+_ORPHAN_GRACE_SEC = 600  # meta.json 없는 디렉터리(업로드 중 중단)는 이 시간이 지나야 정리
+
+# 결과 CSV 컬럼 (후보 전체는 jsonl 다운로드)
+_CSV_HEADER = [
+    "line", "input", "top1_std_id", "top1_std_name", "top1_score",
+    "picked_std_id", "recommended_hs_code", "abstained", "abstain_reason", "req_id",
+]
+
+
+def _write_json(path: Path, obj: Dict[str, Any]) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(obj, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _iter_input_texts(path: Path, fmt: str) -> Iterator[Tuple[int, str]]:
+    """
+    업로드 파일 → (원본 줄 번호, raw_text). 빈 값은 건너뜀.
+    - csv: header에 raw_text 컬럼이 있으면 그 컬럼, 없으면 첫 컬럼 (첫 줄도 데이터)
+    - jsonl: {"raw_text": ...} 또는 JSON 문자열
+    """
+    if fmt == "csv":
+        with path.open(encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            first = next(reader, None)
+            if first is None:
+                return
+            cols = [c.strip().lower() for c in first]
+            col = cols.index("raw_text") if "raw_text" in cols else 0
+            if "raw_text" not in cols and first and first[0].strip():
+                yield 1, first[0].strip()
+            for row in reader:
+                if col < len(row) and row[col].strip():
+                    yield reader.line_num, row[col].strip()
+        return
+
+    with path.open(encoding="utf-8-sig") as f:
+        for no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                raise ValueError(f"line {no}: invalid JSON")
+            t = obj.get("raw_text") if isinstance(obj, dict) else obj
+            if isinstance(t, str) and t.strip():
+                yield no, t.strip()
+
+
+def _csv_row(r: Dict[str, Any]) -> List[Any]:
+    top = (r.get("candidates") or [{}])[0]
+    rr = r.get("rerank") or {}
+    return [
+        r.get("line"), r.get("input"), top.get("std_id"), top.get("std_name"), top.get("score"),
+        rr.get("picked_std_id"), r.get("recommended_hs_code"), rr.get("abstained"), rr.get("abstain_reason"), r.get("req_id"),
+    ]
+
+
+class StdJobManager:
+    """
+    대용량 신고서 파일 일괄 표준화 job (디스크 기반, 재시작 시 이어서 처리).
+    - job 디렉터리: upload.{csv|jsonl} → items.jsonl([줄 번호, raw_text]) + meta.json
+    - chunk_size건씩 normalize_std_batch_async → chunks/NNNNNN.jsonl (tmp 후 rename = checkpoint)
+    - worker 스레드 workers개가 chunk 큐를 소비 (동시 처리 chunk 수 상한)
+    - 결과는 chunk 파일로만 보관, 다운로드는 chunk 파일을 순서대로 스트리밍
+    - start() 시 오래된 done/failed job·고아 디렉터리 정리 후 queued/running job의 미완료 chunk만 다시 큐에 넣음
+    - 여러 프로세스(uvicorn --workers N)가 같은 root를 써도 job은 lock 파일(flock)을 잡은 1개 프로세스만 처리.
+      lock을 가진 job만 메모리(_jobs/_done)가 기준이고, 나머지는 조회 때마다 디스크에서 읽음
+    """
+
+    def __init__(self, root: str, workers: int = 2, chunk_size: int = 500, ttl_sec: Optional[float] = None):
+        self.root = Path(root)
+        self.workers = max(1, int(workers))
+        self.chunk_size = max(1, int(chunk_size))
+        self.ttl_sec = float(ttl_sec) if ttl_sec else None
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        # 이 프로세스가 lock을 잡고 처리 중인 job만
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._done: Dict[str, Set[int]] = {}
+        self._locks: Dict[str, int] = {}
+        self._pending: Set[Tuple[str, int]] = set()  # 큐에 들어 있는 chunk (중복 등록 방지)
+
+        self.chunks_processed = 0
+        self.chunks_failed = 0
+        self.cleaned = 0
+
+    # -----------------------------
+    # lifecycle
+    # -----------------------------
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._threads = [
+                threading.Thread(target=self._run, name=f"std-job-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+        self._cleanup()
+        self._resume_all()
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """처리 중인 chunk까지만 마치고 종료 (남은 chunk는 다음 start()에서 재개)."""
+        with self._lock:
+            threads = self._threads
+            self._threads = []
+        # 큐에 남은 chunk는 버리고 STOP만 전달
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._pending.clear()
+        for _ in threads:
+            self._queue.put(_STOP)
+        for t in threads:
+            t.join(timeout=timeout)
+        with self._lock:
+            for job_id in list(self._locks):
+                self._release(job_id)
+
+    # -----------------------------
+    # paths / meta / lock
+    # -----------------------------
+    def job_dir(self, job_id: str) -> Optional[Path]:
+        if not _JOB_ID_RE.match(job_id or ""):
+            return None
+        return self.root / job_id
+
+    def _chunk_path(self, job_id: str, no: int) -> Path:
+        return self.root / job_id / "chunks" / f"{no:06d}.jsonl"
+
+    def _claim(self, job_id: str) -> bool:
+        """job lock 획득 (이미 이 프로세스가 가졌으면 True). self._lock 안에서 호출."""
+        if job_id in self._locks:
+            return True
+        fd = try_lock_file(str(self.root / job_id / "lock"))
+        if fd is None:
+            return False
+        self._locks[job_id] = fd
+        return True
+
+    def _release(self, job_id: str) -> None:
+        """lock 해제 + 메모리 상태 제거 (이후 조회는 디스크 기준). self._lock 안에서 호출."""
+        self._jobs.pop(job_id, None)
+        self._done.pop(job_id, None)
+        fd = self._locks.pop(job_id, None)
+        if fd is not None:
+            unlock_file(fd)
+
+    def _read_disk(self, job_id: str) -> Optional[Tuple[Dict[str, Any], Set[int]]]:
+        d = self.job_dir(job_id)
+        if d is None or not (d / "meta.json").exists():
+            return None
+        try:
+            meta = json.loads((d / "meta.json").read_text(encoding="utf-8"))
+        except Exception:
+            logger.warning("std job meta unreadable: %s", job_id, exc_info=True)
+            return None
+        return meta, {int(p.stem) for p in (d / "chunks").glob("*.jsonl")}
+
+    def _snapshot(self, job_id: str) -> Optional[Tuple[Dict[str, Any], Set[int]]]:
+        with self._lock:
+            if job_id in self._jobs:
+                return dict(self._jobs[job_id]), set(self._done[job_id])
+        return self._read_disk(job_id)
+
+    def _adopt(self, job_id: str, meta: Dict[str, Any], done: Set[int]) -> None:
+        self._jobs[job_id] = meta
+        self._done[job_id] = done
+
+    def _save(self, meta: Dict[str, Any]) -> None:
+        meta["updated_at"] = time.time()
+        _write_json(self.root / meta["job_id"] / "meta.json", meta)
+
+    # -----------------------------
+    # submit
+    # -----------------------------
+    def new_upload(self, fmt: str) -> Tuple[str, Path]:
+        """job id 발급 + 업로드 저장 경로 (endpoint가 request body를 그대로 기록)."""
+        if fmt not in FORMATS:
+            raise ValueError(f"unsupported format: {fmt} (csv | jsonl)")
+        job_id = uuid.uuid4().hex
+        d = self.root / job_id
+        (d / "chunks").mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._claim(job_id)
+        return job_id, d / f"upload.{fmt}"
+
+    def create_job(self, job_id: str, fmt: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """업로드 파일을 items.jsonl로 변환(chunk 시작 offset 기록) 후 큐에 등록."""
+        d = self.job_dir(job_id)
+        if d is None:
+            raise ValueError(f"invalid job id: {job_id}")
+
+        offsets: List[int] = []
+        total = 0
+        with (d / "items.jsonl").open("wb") as out:
+            for line, t in _iter_input_texts(d / f"upload.{fmt}", fmt):
+                if total % self.chunk_size == 0:
+                    offsets.append(out.tell())
+                out.write((json.dumps([line, t], ensure_ascii=False) + "\n").encode("utf-8"))
+                total += 1
+        if not total:
+            raise ValueError("no rows to normalize")
+
+        meta = {
+            "job_id": job_id,
+            "status": "queued",
+            "format": fmt,
+            "params": params,
+            "total": total,
+            "chunk_size": self.chunk_size,
+            "offsets": offsets,
+            "created_at": time.time(),
+            "finished_at": None,
+            "error": None,
+        }
+        with self._lock:
+            self._claim(job_id)
+            self._adopt(job_id, meta, set())
+            self._save(meta)
+        self._enqueue(job_id)
+        return self.status(job_id)
+
+    def resume(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """failed job 재시도 (완료된 chunk는 건너뜀). 다른 프로세스가 처리 중이면 상태만 반환."""
+        snap = self._read_disk(job_id)
+        if snap is None:
+            return None
+        with self._lock:
+            retry = snap[0]["status"] == "failed" and job_id not in self._jobs and self._claim(job_id)
+            if retry:
+                # lock 획득 후 다시 읽어 다른 프로세스가 먼저 재시도한 경우를 배제
+                snap = self._read_disk(job_id)
+                retry = snap is not None and snap[0]["status"] == "failed"
+                if not retry:
+                    self._release(job_id)
+            if retry:
+                meta, done = snap
+                meta["status"] = "queued"
+                meta["error"] = None
+                self._adopt(job_id, meta, done)
+                self._save(meta)
+        if retry:
+            self._enqueue(job_id)
+        return self.status(job_id)
+
+    def delete(self, job_id: str) -> bool:
+        """job 삭제 (없으면 False). 다른 프로세스가 처리 중이면 ValueError."""
+        d = self.job_dir(job_id)
+        if d is None or not d.exists():
+            return False
+        with self._lock:
+            meta = self._jobs.get(job_id)
+            if meta is not None:
+                meta["status"] = "deleted"  # 큐에 남은 chunk는 worker가 건너뜀
+            elif not self._claim(job_id):
+                raise ValueError(f"job is being processed by another worker: {job_id}")
+            self._release(job_id)
+        shutil.rmtree(d, ignore_errors=True)
+        return True
+
+    def _enqueue(self, job_id: str) -> None:
+        with self._lock:
+            meta = self._jobs[job_id]
+            done = self._done[job_id]
+            for no in range(len(meta["offsets"])):
+                if no not in done and (job_id, no) not in self._pending:
+                    self._pending.add((job_id, no))
+                    self._queue.put((job_id, no))
+
+    def _resume_all(self) -> None:
+        if not self.root.exists():
+            return
+        for d in sorted(self.root.iterdir()):
+            snap = self._read_disk(d.name)
+            if snap is None or snap[0]["status"] not in ("queued", "running"):
+                continue
+            with self._lock:
+                if d.name in self._jobs or not self._claim(d.name):
+                    continue  # 이미 처리 중 (이 프로세스 / 다른 프로세스)
+                snap = self._read_disk(d.name)
+                if snap is None or snap[0]["status"] not in ("queued", "running"):
+                    self._release(d.name)
+                    continue
+                self._adopt(d.name, *snap)
+            logger.info("std job resumed: %s (%d/%d chunks done)", d.name, len(snap[1]), len(snap[0]["offsets"]))
+            self._enqueue(d.name)
+
+    def _cleanup(self) -> None:
+        """STD_JOB_TTL_HOURS 지난 done/failed job과 meta.json 없는 고아 디렉터리 삭제."""
+        if not self.root.exists():
+            return
+        now = time.time()
+        for d in sorted(self.root.iterdir()):
+            if not d.is_dir() or not _JOB_ID_RE.match(d.name):
+                continue
+            snap = self._read_disk(d.name)
+            if snap is None:
+                if now - d.stat().st_mtime < _ORPHAN_GRACE_SEC:
+                    continue
+            else:
+                meta = snap[0]
+                finished = meta.get("finished_at") or meta.get("updated_at") or meta.get("created_at") or now
+                if self.ttl_sec is None or meta["status"] not in ("done", "failed") or now - finished < self.ttl_sec:
+                    continue
+            with self._lock:
+                if not self._claim(d.name):
+                    continue  # 업로드/처리 중
+                self._release(d.name)
+            shutil.rmtree(d, ignore_errors=True)
+            self.cleaned += 1
+            logger.info("std job cleaned up: %s", d.name)
+
+    # -----------------------------
+    # worker
+    # -----------------------------
+    def _read_chunk(self, meta: Dict[str, Any], no: int) -> List[Tuple[int, str]]:
+        n = min(meta["chunk_size"], meta["total"] - no * meta["chunk_size"])
+        items: List[Tuple[int, str]] = []
+        with (self.root / meta["job_id"] / "items.jsonl").open("rb") as f:
+            f.seek(meta["offsets"][no])
+            for _ in range(n):
+                line, t = json.loads(f.readline())
+                items.append((line, t))
+        return items
+
+    def _run(self) -> None:
+        # worker마다 event loop 1개 재사용 (normalize_std_batch_async 실행용)
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                self._process(loop, *item)
+        finally:
+            loop.close()
+
+    def _process(self, loop: asyncio.AbstractEventLoop, job_id: str, no: int) -> None:
+        with self._lock:
+            self._pending.discard((job_id, no))
+            meta = self._jobs.get(job_id)
+        if meta is None or meta["status"] not in ("queued", "running"):
+            return
+        path = self._chunk_path(job_id, no)
+        if path.exists():
+            self._mark_done(meta, no)
+            return
+
+        with self._lock:
+            if meta["status"] == "queued":
+                meta["status"] = "running"
+                self._save(meta)
+
+        try:
+            items = self._read_chunk(meta, no)
+            p = meta["params"]
+            res = loop.run_until_complete(normalize_std_batch_async(
+                [t for _, t in items],
+                top_k=p.get("top_k", 5),
+                min_score=p.get("min_score", 0.8),
+                rerank=p.get("rerank"),
+                enhance_questions=bool(p.get("enhance_questions")),
+            ))
+            tmp = path.with_suffix(".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                for (line, _t), r in zip(items, res["results"]):
+                    f.write(json.dumps({"line": line, **r}, ensure_ascii=False, default=str) + "\n")
+            os.replace(tmp, path)
+        except Exception as e:
+            self.chunks_failed += 1
+            logger.warning("std job chunk failed: %s #%d", job_id, no, exc_info=True)
+            with self._lock:
+                if meta["status"] == "running" and self._jobs.get(job_id) is meta:
+                    meta["status"] = "failed"
+                    meta["error"] = f"chunk {no}: {e}"
+                    self._save(meta)
+                    self._release(job_id)
+            return
+
+        self.chunks_processed += 1
+        self._mark_done(meta, no)
+
+    def _mark_done(self, meta: Dict[str, Any], no: int) -> None:
+        job_id = meta["job_id"]
+        with self._lock:
+            done = self._done.get(job_id)
+            if done is None or self._jobs.get(job_id) is not meta:
+                return
+            done.add(no)
+            if len(done) == len(meta["offsets"]) and meta["status"] in ("queued", "running"):
+                meta["status"] = "done"
+                meta["finished_at"] = time.time()
+                self._save(meta)
+                self._release(job_id)
+
+    # -----------------------------
+    # status / result
+    # -----------------------------
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        snap = self._snapshot(job_id)
+        if snap is None:
+            return None
+        meta, done = snap
+        out = {k: v for k, v in meta.items() if k != "offsets"}
+        size = meta["chunk_size"]
+        processed = sum(min(size, meta["total"] - no * size) for no in done)
+        out["chunks"] = len(meta["offsets"])
+        out["chunks_done"] = len(done)
+        out["processed"] = processed
+        out["progress"] = processed / meta["total"] if meta["total"] else 1.0
+        return out
+
+    def iter_result(self, job_id: str, fmt: str = "jsonl") -> Iterator[Any]:
+        """완료된 job 결과를 chunk 파일 순서대로 (jsonl은 bytes block, csv는 chunk별 문자열)."""
+        snap = self._snapshot(job_id)
+        n = len(snap[0]["offsets"]) if snap else 0
+        paths = [self._chunk_path(job_id, no) for no in range(n)]
+
+        if fmt == "jsonl":
+            for p in paths:
+                with p.open("rb") as f:
+                    while True:
+                        block = f.read(_READ_BLOCK)
+                        if not block:
+                            break
+                        yield block
+            return
+
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(_CSV_HEADER)
+        yield output.getvalue()
+        for p in paths:
+            output.seek(0)
+            output.truncate(0)
+            with p.open(encoding="utf-8") as f:
+                writer.writerows(_csv_row(json.loads(line)) for line in f)
+            yield output.getvalue()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_status: Dict[str, int] = {}
+            for m in self._jobs.values():
+                by_status[m["status"]] = by_status.get(m["status"], 0) + 1
+        return {
+            "workers": self.workers,
+            "chunk_size": self.chunk_size,
+            "ttl_sec": self.ttl_sec,
+            "queued_chunks": self._queue.qsize(),
+            "active_jobs": by_status,
+            "chunks_processed": self.chunks_processed,
+            "chunks_failed": self.chunks_failed,
+            "cleaned": self.cleaned,
+            "running": any(t.is_alive() for t in self._threads),
+        }
+
+
+_MANAGER: Optional[StdJobManager] = None
+_MANAGER_LOCK = threading.Lock()
+
+
+def get_job_manager() -> StdJobManager:
+    global _MANAGER
+    if _MANAGER is not None:
+        return _MANAGER
+
+    with _MANAGER_LOCK:
+        if _MANAGER is None:
+            _MANAGER = StdJobManager(
+                root=settings.std_job_dir,
+                workers=settings.std_job_workers,
+                chunk_size=settings.std_job_chunk_size,
+                ttl_sec=float(getattr(settings, "std_job_ttl_hours", 0) or 0) * 3600 or None,
+            )
+            register_cache("std_jobs", _MANAGER)
+        return _MANAGER
+
+
+def start_job_workers() -> None:
+    """startup 시 호출: worker 기동 + 미완료 job 재개."""
+    get_job_manager().start()
+
+
+def stop_job_workers() -> None:
+    """shutdown 시 호출: 처리 중인 chunk까지만 마치고 종료."""
+    if _MANAGER is not None:
+        _MANAGER.stop()
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.connectors.oracle import get_engine
+from app.utils.filelock import try_lock_file, unlock_file
+
+logger = logging.getLogger(__name__)
+
+_INSERT_SQL = """
+    INSERT INTO TE_STD006T
+    (REQ_ID, INPUT_NM, TOPK, RESULT_JSON, LATENCY_MS)
+    VALUES (:req_id, :input_nm, :topk, :result_json, :latency)
+"""
+
+_STOP = object()
+
+
+def _write_rows_oracle(rows: List[Dict[str, Any]]) -> None:
+    """TE_STD006T에 executemany 1회로 적재."""
+    eng = get_engine()
+    with eng.begin() as conn:
+        conn.execute(text(_INSERT_SQL), rows)
+
+
+class StdLogSink:
+    """
+    TE_STD006T 요청 로그 fire-and-forget writer.
+    - submit(): 큐에 넣고 즉시 반환 (응답 경로에서 Oracle 왕복/commit 제거)
+    - worker: batch_size 또는 flush_interval 도달 시 executemany로 적재
+    - 큐가 가득 차거나(Oracle 지연) 적재 실패 시 overflow_policy: "spill"(JSONL 파일) | "drop"
+    - stop(): 남은 로그를 모두 flush 후 종료
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[List[Dict[str, Any]]], None] = _write_rows_oracle,
+        batch_size: int = 100,
+        flush_interval_sec: float = 1.0,
+        queue_size: int = 10000,
+        put_timeout_sec: float = 0.0,
+        overflow_policy: str = "spill",
+        spill_path: str = "",
+    ):
+        self.writer = writer
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval_sec = max(0.01, float(flush_interval_sec))
+        self.put_timeout_sec = max(0.0, float(put_timeout_sec))
+        self.overflow_policy = (overflow_policy or "spill").lower()
+        self.spill_path = spill_path
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+
+        self.written = 0
+        self.spilled = 0
+        self.dropped = 0
+        self.failed_batches = 0
+
+    # -----------------------------
+    # lifecycle
+    # -----------------------------
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            # spill 재적재는 sink 스레드에서 (요청 경로의 lazy start가 replay를 기다리지 않도록)
+            self._thread = threading.Thread(target=self._run, name="std-log-sink", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            t = self._thread
+            self._thread = None
+        if t is None:
+            return
+        self._queue.put(_STOP)
+        t.join(timeout=timeout)
+
+    # -----------------------------
+    # producer
+    # -----------------------------
+    def submit(self, row: Dict[str, Any]) -> bool:
+        return self._put(row, 1)
+
+    def submit_batch(self, rows: List[Dict[str, Any]]) -> bool:
+        """rows 전체를 executemany 1회로 적재하도록 큐 아이템 1개로 넣는다."""
+        if not rows:
+            return True
+        return self._put(list(rows), len(rows))
+
+    def _put(self, item: Any, n: int) -> bool:
+        if self._thread is None:
+            self.start()
+        try:
+            if self.put_timeout_sec > 0:
+                self._queue.put(item, timeout=self.put_timeout_sec)
+            else:
+                self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self._overflow(item if isinstance(item, list) else [item])
+            return False
+
+    # -----------------------------
+    # worker
+    # -----------------------------
+    def _run(self) -> None:
+        self._replay_spill()
+        stopping = False
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            deadline: Optional[float] = None
+
+            while len(batch) < self.batch_size:
+                timeout = self.flush_interval_sec if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+                if item is _STOP:
+                    stopping = True
+                    break
+
+                if isinstance(item, list):
+                    # submit_batch 묶음은 쪼개지 않고 단독으로 적재
+                    if batch:
+                        self._flush(batch)
+                        batch = []
+                    self._flush(item)
+                    deadline = None
+                    continue
+
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval_sec
+
+            if batch:
+                self._flush(batch)
+
+        # 종료 시 큐에 남은 것까지 drain
+        rest: List[Dict[str, Any]] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                continue
+            rest.extend(item if isinstance(item, list) else [item])
+        for i in range(0, len(rest), self.batch_size):
+            self._flush(rest[i:i + self.batch_size])
+
+    def _flush(self, rows: List[Dict[str, Any]]) -> None:
+        try:
+            self.writer(rows)
+            self.written += len(rows)
+        except Exception:
+            self.failed_batches += 1
+            logger.warning("TE_STD006T batch insert failed (%d rows)", len(rows), exc_info=True)
+            self._overflow(rows)
+
+    # -----------------------------
+    # overflow (drop / spill)
+    # -----------------------------
+    def _overflow(self, rows: List[Dict[str, Any]]) -> None:
+        if self.overflow_policy == "spill" and self.spill_path:
+            try:
+                p = Path(self.spill_path)
+                p.parent.mkdir(parents=True, exist_ok=True)
+                with self._spill_lock, p.open("a", encoding="utf-8") as f:
+                    for r in rows:
+                        f.write(json.dumps(r, ensure_ascii=False) + "\n")
+                self.spilled += len(rows)
+                return
+            except Exception:
+                logger.warning("log spill failed: %s", self.spill_path, exc_info=True)
+        self.dropped += len(rows)
+
+    def _replay_spill(self) -> None:
+        """
+        이전 실행에서 spill된 로그를 시작 시 재적재.
+        - uvicorn --workers N: .replay.lock OS lock을 잡은 프로세스 하나만 재적재 (나머지는 skip → 중복 적재 없음)
+        - spill 파일은 .replay 뒤에 이어 붙임 (이전 replay 잔여분 보존)
+        - batch 적재 성공마다 처리한 byte offset을 .replay.offset에 기록 → 실패 시 남은 행만 다음 start에서 재시도
+        """
+        if not self.spill_path:
+            return
+
+        replay = f"{self.spill_path}.replay"
+        try:
+            fd = try_lock_file(f"{replay}.lock")
+        except Exception:
+            logger.warning("log spill replay lock failed: %s", replay, exc_info=True)
+            return
+        if fd is None:
+            return  # 다른 worker 프로세스가 재적재 중
+        try:
+            self._replay_locked(replay)
+        finally:
+            unlock_file(fd)
+
+    def _replay_locked(self, replay: str) -> None:
+        ckpt = f"{replay}.offset"
+        try:
+            self._merge_spill(replay)
+            if not os.path.exists(replay):
+                return
+            offset = self._read_offset(ckpt)
+        except Exception:
+            logger.warning("log spill replay failed: %s", replay, exc_info=True)
+            return
+
+        try:
+            with open(replay, "rb") as f:
+                f.seek(offset)
+                while True:
+                    batch: List[Dict[str, Any]] = []
+                    while len(batch) < self.batch_size:
+                        line = f.readline()
+                        if not line:
+                            break
+                        if line.strip():
+                            batch.append(json.loads(line))
+                    if batch:
+                        self.writer(batch)
+                        self.written += len(batch)
+                    if len(batch) < self.batch_size:
+                        break
+                    offset = f.tell()
+                    self._write_offset(ckpt, offset)
+            os.remove(replay)
+            if os.path.exists(ckpt):
+                os.remove(ckpt)
+        except Exception:
+            logger.warning("log spill replay failed: %s (offset=%d)", replay, offset, exc_info=True)
+
+    def _merge_spill(self, replay: str) -> None:
+        """spill 파일을 rename으로 떼어낸 뒤 .replay 뒤에 append (기존 offset은 그대로 유효)."""
+        merging = f"{self.spill_path}.merging"
+        with self._spill_lock:
+            if os.path.exists(self.spill_path) and not os.path.exists(merging):
+                os.replace(self.spill_path, merging)
+        if os.path.exists(merging):
+            with open(merging, "rb") as src, open(replay, "ab") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(merging)
+
+    @staticmethod
+    def _read_offset(ckpt: str) -> int:
+        try:
+            with open(ckpt, encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def _write_offset(ckpt: str, offset: int) -> None:
+        tmp = f"{ckpt}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(str(offset))
+        os.replace(tmp, ckpt)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "spilled": self.spilled,
+            "dropped": self.dropped,
+            "failed_batches": self.failed_batches,
+            "running": self._thread is not None and self._thread.is_alive(),
+        }
+
+
+_SINK: Optional[StdLogSink] = None
+_SINK_LOCK = threading.Lock()
+
+
+def get_log_sink() -> StdLogSink:
+    global _SINK
+    if _SINK is not None:
+        return _SINK
+
+    with _SINK_LOCK:
+        if _SINK is None:
+            _SINK = StdLogSink(
+                batch_size=settings.std_log_batch_size,
+                flush_interval_sec=settings.std_log_flush_interval_ms / 1000.0,
+                queue_size=settings.std_log_queue_size,
+                put_timeout_sec=settings.std_log_put_timeout_ms / 1000.0,
+                overflow_policy=settings.std_log_overflow_policy,
+                spill_path=settings.std_log_spill_path,
+            )
+        return _SINK
+
+
+def start_log_sink() -> None:
+    get_log_sink().start()
+
+
+def stop_log_sink() -> None:
+    """shutdown 시 호출: 남은 로그 flush."""
+    global _SINK
+    with _SINK_LOCK:
+        sink = _SINK
+        _SINK = None
+    if sink is not None:
+        sink.stop()
@@ -1,17 +1,26 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
 import re
 import time
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from sqlalchemy import text
 
 from app.core.config import settings
-from app.db.connectors.oracle import get_engine
-from app.rag.retriever import retrieve
+from app.db.connectors.oracle import bind_in_list, bind_pair_list, get_engine, in_list_chunks
+from app.rag.retriever import embed_queries, embed_query, retrieve_multi, search_by_vector
+from app.services.std_candidates import StdCandidates
+from app.services.std_log_sink import get_log_sink
+from app.services.std_synonym_index import synonym_index_ready
+from app.services.std_term_matcher import match_terms
+from app.utils.cache import LRUCache, register_cache
+from app.utils.concurrency import run_blocking
 
+logger = logging.getLogger(__name__)
 
 DEFAULT_TOPK = 5
 DEFAULT_MIN_SCORE = 0.8
@@ -22,19 +31,7 @@ DEFAULT_CONFIDENCE_MIN = 1.15
 DEFAULT_MARGIN_MIN = 0.15
 DEFAULT_ABSTAIN_NO2_SCORE = 1.0
 
-# 일반어 감지 (정교화)
-STRONG_GENERIC_TERMS = [
-    "금속", "합금", "판재", "자재", "소재", "원자재", "제품", "부품", "재료",
-    "샘플", "기타", "일반",
-]
-WEAK_GENERIC_TERMS = ["판", "재", "류", "용"]
-
-SPECIFIC_TERMS = [
-    "도금", "코팅", "니켈", "알루미늄", "구리", "철", "강", "강판", "스테인리스", "sus",
-    "탄소강", "합성수지", "플라스틱", "폴리", "pp", "pe", "pvc",
-    "압연", "열처리", "절단", "가공", "용접", "주조", "단조",
-]
-
+# 일반어 감지 (용어 목록: std_term_matcher / data/std_terms.json, hot reload)
 DEFAULT_GENERIC_FORCE_TOP1_MIN = 2.8
 
 # -------------------------------
@@ -48,27 +45,7 @@ POC_WEIGHT_CAP = 3.00  # 과도한 폭주 방지
 # ✅ Negative Gate (무관성 차단)
 # -------------------------------
 # "중고자동차" 같이 표준품명(금속/재질/공정/형상)과 무관한 입력이면 candidates 자체를 비움
-DOMAIN_HINT_TERMS = sorted(
-    set(
-        STRONG_GENERIC_TERMS
-        + [
-            # 형상/품목 타입 힌트
-            "판재", "시트", "코일", "호일",
-            "환봉", "각봉", "파이프", "선재",
-            "분말", "펠릿", "스크랩",
-            "잉곳", "빌렛", "슬래브",
-
-            # 재질/계열 힌트 (✅ 단일음절 제외)
-            "니켈", "알루미늄", "구리", "철강", "스테인리스", "sus", "탄소강", "합금",
-
-            # 표면처리
-            "도금", "코팅",
-
-            # 공정
-            "압연", "열처리", "절단", "가공", "용접", "주조", "단조",
-        ]
-    )
-)
+# (domain_hint 용어가 하나도 없으면 out-of-domain)
 
 # 짧고 애매한 단어는 out-of-domain 처리하지 않음(오탐 방지)
 NEG_GATE_MIN_LEN = 3
@@ -80,10 +57,6 @@ def _normalize_text(s: str) -> str:
     return s
 
 
-def _has_any_term(text: str, terms: List[str]) -> List[str]:
-    return [t for t in terms if t and t in text]
-
-
 def _is_out_of_domain(raw_text: str) -> Dict[str, Any]:
     """
     PoC용 간단 차단:
@@ -98,7 +71,7 @@ def _is_out_of_domain(raw_text: str) -> Dict[str, Any]:
     if len(t) < NEG_GATE_MIN_LEN:
         return {"out": False, "reason": "TOO_SHORT_SKIP"}
 
-    hits = _has_any_term(t, DOMAIN_HINT_TERMS)
+    hits = match_terms(t)["domain_hint"]
     if hits:
         return {"out": False, "reason": f"HAS_DOMAIN_HINT:{','.join(sorted(set(hits)))}"}
 
@@ -115,15 +88,17 @@ def _is_generic_input(raw_text: str) -> Dict[str, Any]:
     if not t:
         return {"generic": True, "generic_level": "strong", "reason": "EMPTY"}
 
+    # ✅ 한 번의 scan으로 strong / weak / specific hit 모두
+    hits = match_terms(t)
+    spec_hits = hits["specific"]
+
     if len(t) <= 4:
-        spec_hits = _has_any_term(t, SPECIFIC_TERMS)
         if spec_hits:
             return {"generic": False, "generic_level": None, "reason": f"SHORT_BUT_SPECIFIC:{','.join(spec_hits)}"}
         return {"generic": True, "generic_level": "strong", "reason": "TOO_SHORT"}
 
-    strong_hits = _has_any_term(t, STRONG_GENERIC_TERMS)
-    weak_hits = _has_any_term(t, WEAK_GENERIC_TERMS)
-    spec_hits = _has_any_term(t, SPECIFIC_TERMS)
+    strong_hits = hits["strong_generic"]
+    weak_hits = hits["weak_generic"]
 
     if spec_hits:
         return {"generic": False, "generic_level": None, "reason": f"SPECIFIC:{','.join(spec_hits)}"}
@@ -137,65 +112,34 @@ def _is_generic_input(raw_text: str) -> Dict[str, Any]:
     return {"generic": False, "generic_level": None, "reason": None}
 
 
-def _merge_candidates(master_hits, synonym_hits):
-    merged: Dict[int, Dict[str, Any]] = {}
-
-    def _add(hit, boost=1.0):
-        metadata = hit.metadata or {}
-        std_id = metadata.get("std_id")
-        if not std_id:
-            return
-
-        std_id = int(std_id)
-
-        if std_id not in merged:
-            merged[std_id] = {
-                "std_id": std_id,
-                "std_name": metadata.get("std_name"),
-                "score": 0.0,
-                "sources": [],
-            }
-
-        merged[std_id]["score"] += (hit.score or 0) * boost
-        merged[std_id]["sources"].append(metadata.get("namespace"))
-
-    for h in master_hits:
-        _add(h, boost=1.0)
-    for h in synonym_hits:
-        _add(h, boost=1.2)
-
-    return sorted(merged.values(), key=lambda x: x["score"], reverse=True)
-
-
 def _fetch_std_details(std_ids: List[int]) -> Dict[int, Dict[str, Any]]:
     if not std_ids:
         return {}
 
     eng = get_engine()
-    binds = {f"id{i}": int(v) for i, v in enumerate(std_ids)}
-    in_list = ", ".join([f":id{i}" for i in range(len(std_ids))])
-
-    sql = f"""
-        SELECT
-            STD_ID   AS std_id,
-            STD_NM   AS std_nm,
-            STD_DESC AS std_desc,
-            HS_CODE  AS hs_code
-        FROM TE_STD001M
-        WHERE STD_ID IN ({in_list})
-    """
-
     details: Dict[int, Dict[str, Any]] = {}
     with eng.connect() as conn:
-        rows = conn.execute(text(sql), binds).mappings().all()
-        for r in rows:
-            sid = int(r["std_id"])
-            details[sid] = {
-                "std_id": sid,
-                "std_name": r.get("std_nm"),
-                "std_desc": r.get("std_desc"),
-                "hs_code": r.get("hs_code"),
-            }
+        # ✅ bucket 크기 고정 IN-list → cursor 재사용 (hard parse 방지)
+        for chunk in in_list_chunks([int(v) for v in std_ids]):
+            binds: Dict[str, Any] = {}
+            sql = f"""
+                SELECT
+                    STD_ID   AS std_id,
+                    STD_NM   AS std_nm,
+                    STD_DESC AS std_desc,
+                    HS_CODE  AS hs_code
+                FROM TE_STD001M
+                WHERE STD_ID IN ({bind_in_list(chunk, binds)})
+            """
+            rows = conn.execute(text(sql), binds).mappings().all()
+            for r in rows:
+                sid = int(r["std_id"])
+                details[sid] = {
+                    "std_id": sid,
+                    "std_name": r.get("std_nm"),
+                    "std_desc": r.get("std_desc"),
+                    "hs_code": r.get("hs_code"),
+                }
     return details
 
 
@@ -210,48 +154,182 @@ def _fetch_exact_syn_weights(std_ids: List[int], syn_nm: str) -> Dict[int, float
         return {}
 
     eng = get_engine()
-    binds = {f"id{i}": int(v) for i, v in enumerate(std_ids)}
-    binds["syn_nm"] = syn_nm
-    in_list = ", ".join([f":id{i}" for i in range(len(std_ids))])
-
-    # ✅ SYN_NM 컬럼 사용
-    sql = f"""
-        SELECT
-            STD_ID AS std_id,
-            WEIGHT AS weight
-        FROM TE_STD002L
-        WHERE IS_ACTIVE = 'Y'
-          AND SYN_NM = :syn_nm
-          AND STD_ID IN ({in_list})
-    """
+    out: Dict[int, float] = {}
+    with eng.connect() as conn:
+        for chunk in in_list_chunks([int(v) for v in std_ids]):
+            binds: Dict[str, Any] = {"syn_nm": syn_nm}
+            # ✅ SYN_NM 컬럼 사용
+            sql = f"""
+                SELECT
+                    STD_ID AS std_id,
+                    WEIGHT AS weight
+                FROM TE_STD002L
+                WHERE IS_ACTIVE = 'Y'
+                  AND SYN_NM = :syn_nm
+                  AND STD_ID IN ({bind_in_list(chunk, binds)})
+            """
+            rows = conn.execute(text(sql), binds).mappings().all()
+            for r in rows:
+                try:
+                    sid = int(r["std_id"])
+                    w = float(r.get("weight") or 1.0)
+                    out[sid] = w
+                except Exception:
+                    continue
+    return out
+
+
+# -------------------------------
+# TE_STD001M 상세 / TE_STD002L weight read-through 캐시
+# -------------------------------
+_NOT_FOUND = object()  # 없는 행도 캐시 (negative cache)
+
+_DETAIL_CACHE = LRUCache(
+    maxsize=settings.std_detail_cache_size,
+    ttl_sec=settings.std_detail_cache_ttl_sec,
+)
+_WEIGHT_CACHE = LRUCache(
+    maxsize=settings.std_weight_cache_size,
+    ttl_sec=settings.std_weight_cache_ttl_sec,
+)
+register_cache("std_details", _DETAIL_CACHE)
+register_cache("std_syn_weights", _WEIGHT_CACHE)
+
+
+def _get_std_details(std_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """_fetch_std_details 캐시 버전: miss인 STD_ID만 Oracle 조회."""
+    out: Dict[int, Dict[str, Any]] = {}
+    miss: List[int] = []
+    for sid in dict.fromkeys(int(x) for x in std_ids):
+        v = _DETAIL_CACHE.get(sid, None)
+        if v is None:
+            miss.append(sid)
+        elif v is not _NOT_FOUND:
+            out[sid] = v
+
+    if miss:
+        fetched = _fetch_std_details(miss)
+        for sid in miss:
+            v = fetched.get(sid)
+            _DETAIL_CACHE.set(sid, v if v is not None else _NOT_FOUND)
+            if v is not None:
+                out[sid] = v
+    return out
+
+
+def _get_exact_syn_weights(std_ids: List[int], syn_nm: str) -> Dict[int, float]:
+    """_fetch_exact_syn_weights 캐시 버전 (key: (STD_ID, SYN_NM), weight 없는 쌍도 캐시)."""
+    if not std_ids or not syn_nm:
+        return {}
 
     out: Dict[int, float] = {}
+    miss: List[int] = []
+    for sid in dict.fromkeys(int(x) for x in std_ids):
+        v = _WEIGHT_CACHE.get((sid, syn_nm), None)
+        if v is None:
+            miss.append(sid)
+        elif v is not _NOT_FOUND:
+            out[sid] = v
+
+    if miss:
+        fetched = _fetch_exact_syn_weights(miss, syn_nm)
+        for sid in miss:
+            v = fetched.get(sid)
+            _WEIGHT_CACHE.set((sid, syn_nm), v if v is not None else _NOT_FOUND)
+            if v is not None:
+                out[sid] = v
+    return out
+
+
+def invalidate_std_caches(pairs: List[tuple] = (), std_ids: List[int] = ()) -> None:
+    """
+    승인/반려 시 영향받는 항목만 제거.
+    - pairs: (STD_ID, SYN_NM) → weight 캐시
+    - std_ids: STD_ID → 상세 캐시
+    """
+    for sid, syn_nm in pairs:
+        _WEIGHT_CACHE.pop((int(sid), syn_nm))
+        _WEIGHT_CACHE.pop((int(sid), _normalize_text(syn_nm)))
+    for sid in std_ids:
+        _DETAIL_CACHE.pop(int(sid))
+
+
+def _exact_syn_weights(std_ids: List[int], syn_nm: str) -> Dict[int, float]:
+    """synonym index가 적재돼 있으면 메모리 조회, 아니면 캐시 → TE_STD002L 조회."""
+    idx = synonym_index_ready()
+    if idx is not None:
+        return idx.syn_weights(syn_nm, std_ids) if std_ids and syn_nm else {}
+    return _get_exact_syn_weights(std_ids, syn_nm)
+
+
+def _fetch_exact_syn_weights_pairs(pairs: List[Tuple[int, str]]) -> Dict[Tuple[int, str], float]:
+    """batch용: (STD_ID, SYN_NM) 쌍 전체의 WEIGHT를 한 번에 조회 (chunk당 쿼리 1회)."""
+    if not pairs:
+        return {}
+
+    eng = get_engine()
+    out: Dict[Tuple[int, str], float] = {}
     with eng.connect() as conn:
-        rows = conn.execute(text(sql), binds).mappings().all()
-        for r in rows:
-            try:
-                sid = int(r["std_id"])
-                w = float(r.get("weight") or 1.0)
-                out[sid] = w
-            except Exception:
-                continue
+        for chunk in in_list_chunks([(int(sid), syn) for sid, syn in pairs]):
+            binds: Dict[str, Any] = {}
+            sql = f"""
+                SELECT
+                    STD_ID AS std_id,
+                    SYN_NM AS syn_nm,
+                    WEIGHT AS weight
+                FROM TE_STD002L
+                WHERE IS_ACTIVE = 'Y'
+                  AND (STD_ID, SYN_NM) IN ({bind_pair_list(chunk, binds)})
+            """
+            rows = conn.execute(text(sql), binds).mappings().all()
+            for r in rows:
+                try:
+                    out[(int(r["std_id"]), r["syn_nm"])] = float(r.get("weight") or 1.0)
+                except Exception:
+                    continue
+    return out
+
+
+def _exact_syn_weights_many(pairs: List[Tuple[int, str]]) -> Dict[Tuple[int, str], float]:
+    """_exact_syn_weights의 batch 버전: index → 캐시 → miss 쌍만 TE_STD002L 1회 조회."""
+    idx = synonym_index_ready()
+    out: Dict[Tuple[int, str], float] = {}
+    if idx is not None:
+        for sid, syn in pairs:
+            w = idx.syn_weights(syn, [sid])
+            if w:
+                out[(int(sid), syn)] = w[int(sid)]
+        return out
+
+    miss: List[Tuple[int, str]] = []
+    for key in dict.fromkeys((int(sid), syn) for sid, syn in pairs if syn):
+        v = _WEIGHT_CACHE.get(key, None)
+        if v is None:
+            miss.append(key)
+        elif v is not _NOT_FOUND:
+            out[key] = v
+
+    if miss:
+        fetched = _fetch_exact_syn_weights_pairs(miss)
+        for key in miss:
+            v = fetched.get(key)
+            _WEIGHT_CACHE.set(key, v if v is not None else _NOT_FOUND)
+            if v is not None:
+                out[key] = v
     return out
 
 
-def _apply_weight_boost(raw_text: str, candidates: List[Dict[str, Any]]) -> None:
+def _apply_weight_boost(candidates: List[Dict[str, Any]], w_map: Dict[int, float]) -> None:
     """
     candidates를 in-place로 업데이트:
       - score_raw 저장
       - weight 저장
       - score를 weight 보정 반영
+    w_map: _fetch_exact_syn_weights() 결과 (없는 STD_ID는 1.0)
     """
     if not candidates:
         return
 
-    syn_nm = _normalize_text(raw_text)
-    std_ids = [int(c["std_id"]) for c in candidates]
-    w_map = _fetch_exact_syn_weights(std_ids, syn_nm)
-
     alpha = POC_WEIGHT_ALPHA
     cap = POC_WEIGHT_CAP
 
@@ -271,6 +349,73 @@ def _apply_weight_boost(raw_text: str, candidates: List[Dict[str, Any]]) -> None
             c["score"] = base * (1.0 + alpha * (w - 1.0))
 
 
+def _lexical_hits(raw_text: str, top_k: int):
+    """로컬 BM25(문자 n-gram) 검색. index 미적재/비활성이면 None."""
+    if not getattr(settings, "std_lexical_enabled", True):
+        return None
+    idx = synonym_index_ready()
+    lex = idx.lexical() if idx is not None else None
+    if lex is None:
+        return None
+    return lex.search(raw_text, top_k=top_k)
+
+
+def _fuse(master_hits, synonym_hits, lexical_hits, vector_ok: bool) -> StdCandidates:
+    # 벡터 검색 실패 시 lexical 단독: min_score/abstain 기준을 통과할 수 있게 별도 scale 사용
+    if vector_ok:
+        w = float(getattr(settings, "std_lexical_weight", 0.3))
+    else:
+        w = float(getattr(settings, "std_lexical_fallback_scale", 2.0))
+    return StdCandidates.merge(master_hits, synonym_hits, lexical_hits, lexical_weight=w)
+
+
+def _head_size(ctx: Dict[str, Any]) -> int:
+    """
+    dict로 만들 상위 후보 수: 응답 top_k / rerank 대상(topn) / abstain 판단(top1, top2).
+    rerank는 나머지를 원래 순서로 뒤에 붙이므로 이 범위 밖 후보는 응답에 영향 없음.
+    """
+    n = max(int(ctx["user_topk"]), 2)
+    if ctx["use_rerank"]:
+        n = max(n, int(getattr(settings, "std_rerank_topn", 12) or 12))
+    return n
+
+
+def _exact_match_candidates(ctx: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """
+    ✅ fast path: 입력이 활성 표준품명/동의어와 정확히 일치하면
+    index만으로 후보 구성 (임베딩/Chroma/Oracle 미접근). 불일치/미적재면 None.
+    """
+    idx = synonym_index_ready()
+    if idx is None:
+        return None
+
+    hits = idx.exact(ctx["raw_text"])
+    if not hits:
+        return None
+
+    score = float(getattr(settings, "std_exact_match_score", 3.0))
+    candidates = [
+        {"std_id": h["std_id"], "std_name": h["std_name"], "score": score, "sources": [h["source"]]}
+        for h in hits
+    ]
+    _apply_weight_boost(candidates, {h["std_id"]: h["weight"] for h in hits})
+    candidates = _filter_and_sort(candidates, ctx["min_score"])
+    _attach_details(candidates, {h["std_id"]: h for h in hits})
+    return candidates
+
+
+def _filter_and_sort(candidates: List[Dict[str, Any]], min_score_val: float) -> List[Dict[str, Any]]:
+    candidates = [c for c in candidates if (c.get("score") or 0) >= min_score_val]
+    return sorted(candidates, key=lambda x: float(x.get("score") or 0.0), reverse=True)
+
+
+def _attach_details(candidates: List[Dict[str, Any]], detail_map: Dict[int, Dict[str, Any]]) -> None:
+    for c in candidates:
+        d = detail_map.get(int(c["std_id"]), {})
+        c["hs_code"] = d.get("hs_code")
+        c["std_desc"] = d.get("std_desc")
+
+
 def _compute_confidence_metrics(candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
     if not candidates:
         return {"top1_score": None, "top2_score": None, "ratio": None, "margin": None}
@@ -317,8 +462,9 @@ def _llm_rerank(raw_text: str, candidates: List[Dict[str, Any]], generic_info: D
     topn = max(2, int(getattr(settings, "std_rerank_topn", 12) or 12))
     base = candidates[:topn]
 
+    # normalize 단계에서 조회한 상세를 캐시로 재사용 (Oracle 재조회 없음)
     std_ids = [int(c["std_id"]) for c in base]
-    detail_map = _fetch_std_details(std_ids)
+    detail_map = _get_std_details(std_ids)
 
     items = []
     for c in base:
@@ -432,10 +578,12 @@ def _rule_based_followups(raw_text: str, generic_info: Dict[str, Any]) -> List[s
         qs.append("형상/규격(판재/코일/봉/파이프, 두께/폭 등) 정보가 있나요?")
         return qs[:2]
 
-    if "도금" not in t and "코팅" not in t:
+    hits = match_terms(t)
+
+    if not hits["surface_treatment"]:
         qs.append("도금/코팅 등 표면처리 공정이 포함되나요? (있다면 종류)")
 
-    if not any(x in t for x in ["니켈", "알루미늄", "구리", "철", "스테인리스", "sus", "탄소강"]):
+    if not hits["material"]:
         qs.append("주요 재질(예: 알루미늄/철강/구리/스테인리스 등)은 무엇인가요?")
 
     if not qs:
@@ -483,85 +631,41 @@ def _llm_enhance_followups(raw_text: str, base_questions: List[str]) -> List[str
         return base_questions
 
 
-def normalize_std(
+# -------------------------------
+# normalize pipeline (sync / async 공용 단계)
+# -------------------------------
+
+def _begin_request(
     raw_text: str,
-    top_k: int = DEFAULT_TOPK,
-    min_score: float = DEFAULT_MIN_SCORE,
-    rerank: Optional[bool] = None,
-    enhance_questions: bool = False,
-):
+    top_k: Optional[int],
+    min_score: Optional[float],
+    rerank: Optional[bool],
+    enhance_questions: bool,
+) -> Dict[str, Any]:
     start = time.time()
-    req_id = str(uuid.uuid4())
-
     user_topk = int(top_k or DEFAULT_TOPK)
-    min_score_val = float(min_score if min_score is not None else DEFAULT_MIN_SCORE)
-    retrieve_topk = max(user_topk, int(getattr(settings, "std_retrieve_topk", 30) or 30))
-
-    generic_info = _is_generic_input(raw_text)
-    neg = _is_out_of_domain(raw_text)
-
-    # ✅ Negative Gate: 도메인 완전 무관이면 후보 자체를 비움
-    if neg.get("out"):
-        latency = int((time.time() - start) * 1000)
-
-        rerank_info = {
-            "enabled": bool(getattr(settings, "std_rerank_enabled", False)) if rerank is None else bool(rerank),
-            "model": None,
-            "picked_std_id": None,
-            "reason": "입력된 거래품명이 현재 표준품명(재질/형상/공정) 도메인과 무관하여 추천할 수 없습니다.",
-            "confidence": None,
-            "confidence_ratio": None,
-            "confidence_margin": None,
-            "abstained": True,
-            "abstain_reason": "NO_MATCH_OUT_OF_DOMAIN",
-            "generic_input": bool(generic_info.get("generic")),
-            "generic_level": generic_info.get("generic_level"),
-            "generic_reason": generic_info.get("reason"),
-            "negative_gate": True,
-            "negative_gate_reason": neg.get("reason"),
-        }
-
-        candidates: List[Dict[str, Any]] = []
-        _log_result(req_id, raw_text, candidates, latency)
-
-        return {
-            "req_id": req_id,
-            "input": raw_text,
-            "top_k": user_topk,
-            "min_score": min_score_val,
-            "retrieve_top_k": retrieve_topk,
-            "recommended_hs_code": None,
-            "candidates": candidates,
-            "rerank": rerank_info,
-            "follow_up_questions": [],  # 무관 입력은 질문 대신 '일치 없음'으로 처리
-            "message": "일치되는 표준품명이 없습니다.",
-            "latency_ms": latency,
-        }
-
-    master_hits = retrieve(raw_text, top_k=retrieve_topk, namespace="std_master")
-    synonym_hits = retrieve(raw_text, top_k=retrieve_topk, namespace="std_synonym")
-
-    candidates = _merge_candidates(master_hits, synonym_hits)
+    return {
+        "start": start,
+        "req_id": str(uuid.uuid4()),
+        "raw_text": raw_text,
+        "user_topk": user_topk,
+        "min_score": float(min_score if min_score is not None else DEFAULT_MIN_SCORE),
+        "retrieve_topk": max(user_topk, int(getattr(settings, "std_retrieve_topk", 30) or 30)),
+        "use_rerank": bool(getattr(settings, "std_rerank_enabled", False)) if rerank is None else bool(rerank),
+        "enhance_questions": bool(enhance_questions),
+        "generic_info": _is_generic_input(raw_text),
+        "neg": _is_out_of_domain(raw_text),
+    }
 
-    # ✅ PoC 핵심: 학습 WEIGHT를 후보 점수에 반영
-    _apply_weight_boost(raw_text, candidates)
 
-    # 최소 점수 필터
-    candidates = [c for c in candidates if (c.get("score") or 0) >= min_score_val]
-    candidates = sorted(candidates, key=lambda x: float(x.get("score") or 0.0), reverse=True)
+def _latency_ms(ctx: Dict[str, Any]) -> int:
+    return int((time.time() - ctx["start"]) * 1000)
 
-    # ✅ HS_CODE/STD_DESC를 candidates에 붙여 반환(환각 없음)
-    detail_fetch_n = max(10, user_topk * 6)
-    detail_map = _fetch_std_details([int(c["std_id"]) for c in candidates[:detail_fetch_n]])
-    for c in candidates:
-        d = detail_map.get(int(c["std_id"]), {})
-        c["hs_code"] = d.get("hs_code")
-        c["std_desc"] = d.get("std_desc")
-
-    use_rerank = bool(getattr(settings, "std_rerank_enabled", False)) if rerank is None else bool(rerank)
 
-    rerank_info = {
-        "enabled": use_rerank,
+def _base_rerank_info(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    generic_info = ctx["generic_info"]
+    return {
+        "enabled": ctx["use_rerank"],
         "model": None,
         "picked_std_id": None,
         "reason": None,
@@ -577,9 +681,49 @@ def normalize_std(
         "negative_gate_reason": None,
     }
 
+
+def _out_of_domain_response(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    # ✅ Negative Gate: 도메인 완전 무관이면 후보 자체를 비움
+    rerank_info = _base_rerank_info(ctx)
+    rerank_info.update(
+        {
+            "reason": "입력된 거래품명이 현재 표준품명(재질/형상/공정) 도메인과 무관하여 추천할 수 없습니다.",
+            "abstained": True,
+            "abstain_reason": "NO_MATCH_OUT_OF_DOMAIN",
+            "negative_gate": True,
+            "negative_gate_reason": ctx["neg"].get("reason"),
+        }
+    )
+
+    return {
+        "req_id": ctx["req_id"],
+        "input": ctx["raw_text"],
+        "top_k": ctx["user_topk"],
+        "min_score": ctx["min_score"],
+        "retrieve_top_k": ctx["retrieve_topk"],
+        "recommended_hs_code": None,
+        "candidates": [],
+        "rerank": rerank_info,
+        "follow_up_questions": [],  # 무관 입력은 질문 대신 '일치 없음'으로 처리
+        "message": "일치되는 표준품명이 없습니다.",
+        "latency_ms": _latency_ms(ctx),
+    }
+
+
+def _finalize_response(
+    ctx: Dict[str, Any],
+    candidates: List[Dict[str, Any]],
+    rr: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """rerank 결과(rr, 미사용이면 None)를 반영해 abstain/HS_CODE/후속질문까지 확정."""
+    raw_text = ctx["raw_text"]
+    generic_info = ctx["generic_info"]
+    user_topk = ctx["user_topk"]
+
+    rerank_info = _base_rerank_info(ctx)
+
     # LLM rerank
-    if use_rerank and len(candidates) >= 2:
-        rr = _llm_rerank(raw_text, candidates, generic_info)
+    if rr is not None:
         candidates = rr["candidates"]
         rerank_info["model"] = getattr(settings, "openai_rerank_model", None) or settings.openai_model
         rerank_info["picked_std_id"] = rr.get("picked_std_id")
@@ -633,25 +777,22 @@ def normalize_std(
     follow_up_questions: List[str] = []
     if rerank_info["abstained"]:
         follow_up_questions = _rule_based_followups(raw_text, generic_info)
-        if enhance_questions:
+        if ctx["enhance_questions"]:
             follow_up_questions = _llm_enhance_followups(raw_text, follow_up_questions)
 
     candidates = candidates[:user_topk]
 
-    latency = int((time.time() - start) * 1000)
-    _log_result(req_id, raw_text, candidates, latency)
-
     resp = {
-        "req_id": req_id,
+        "req_id": ctx["req_id"],
         "input": raw_text,
         "top_k": user_topk,
-        "min_score": min_score_val,
-        "retrieve_top_k": retrieve_topk,
+        "min_score": ctx["min_score"],
+        "retrieve_top_k": ctx["retrieve_topk"],
         "recommended_hs_code": recommended_hs_code,
         "candidates": candidates,
         "rerank": rerank_info,
         "follow_up_questions": follow_up_questions,
-        "latency_ms": latency,
+        "latency_ms": _latency_ms(ctx),
     }
 
     # candidates가 0이면 UI에서 "일치 없음" 문구 띄우기 쉽게 message 추가
@@ -661,24 +802,264 @@ def normalize_std(
     return resp
 
 
-def _log_result(req_id: str, raw_text: str, candidates: List[Dict[str, Any]], latency: int):
-    eng = get_engine()
-    with eng.begin() as conn:
-        conn.execute(
-            text("""
-                INSERT INTO TE_STD006T
-                (REQ_ID, INPUT_NM, TOPK, RESULT_JSON, LATENCY_MS)
-                VALUES (:req_id, :input_nm, :topk, :result_json, :latency)
-            """),
-            {
-                "req_id": req_id,
-                "input_nm": raw_text,
-                "topk": len(candidates),
-                "result_json": json.dumps(candidates, ensure_ascii=False),
-                "latency": latency,
-            },
+def normalize_std(
+    raw_text: str,
+    top_k: int = DEFAULT_TOPK,
+    min_score: float = DEFAULT_MIN_SCORE,
+    rerank: Optional[bool] = None,
+    enhance_questions: bool = False,
+):
+    ctx = _begin_request(raw_text, top_k, min_score, rerank, enhance_questions)
+
+    if ctx["neg"].get("out"):
+        resp = _out_of_domain_response(ctx)
+        _log_result(ctx["req_id"], raw_text, resp["candidates"], resp["latency_ms"])
+        return resp
+
+    candidates = _exact_match_candidates(ctx)
+    if candidates is None:
+        retrieve_topk = ctx["retrieve_topk"]
+        lexical_hits = _lexical_hits(raw_text, retrieve_topk)
+        try:
+            hits = retrieve_multi(raw_text, {"std_master": retrieve_topk, "std_synonym": retrieve_topk})
+            master_hits, synonym_hits, vector_ok = hits["std_master"], hits["std_synonym"], True
+        except Exception:
+            if lexical_hits is None:
+                raise
+            logger.warning("vector retrieval failed, serving lexical-only candidates", exc_info=True)
+            master_hits, synonym_hits, vector_ok = [], [], False
+
+        cands = _fuse(master_hits, synonym_hits, lexical_hits, vector_ok)
+
+        # ✅ PoC 핵심: 학습 WEIGHT를 후보 점수에 반영
+        w_map = _exact_syn_weights(cands.std_ids(), _normalize_text(raw_text))
+        cands.apply_weight_boost(w_map, POC_WEIGHT_ALPHA, POC_WEIGHT_CAP)
+
+        # 최소 점수 필터 → 상위 head만 dict로
+        cands.filter_min_score(ctx["min_score"])
+        candidates = cands.head(_head_size(ctx))
+
+        # ✅ HS_CODE/STD_DESC를 candidates에 붙여 반환(환각 없음)
+        detail_fetch_n = max(10, ctx["user_topk"] * 6)
+        _attach_details(candidates, _get_std_details([int(c["std_id"]) for c in candidates[:detail_fetch_n]]))
+
+    rr = None
+    if ctx["use_rerank"] and len(candidates) >= 2:
+        rr = _llm_rerank(raw_text, candidates, ctx["generic_info"])
+
+    resp = _finalize_response(ctx, candidates, rr)
+    _log_result(ctx["req_id"], raw_text, resp["candidates"], resp["latency_ms"])
+    return resp
+
+
+async def normalize_std_async(
+    raw_text: str,
+    top_k: int = DEFAULT_TOPK,
+    min_score: float = DEFAULT_MIN_SCORE,
+    rerank: Optional[bool] = None,
+    enhance_questions: bool = False,
+):
+    """
+    normalize_std()의 async 버전.
+    - 임베딩 1회 후 std_master / std_synonym 검색을 동시에 수행
+    - WEIGHT 조회와 상세(HS_CODE/STD_DESC) 조회를 동시에 수행
+    - blocking DB/Chroma/OpenAI 호출은 bounded executor(run_blocking)로 넘김
+    - 정확 일치 입력은 synonym index fast path (I/O 없음)
+    - 로컬 BM25 검색을 벡터 검색과 동시에 수행해 융합, 벡터 실패/timeout 시 lexical 단독
+    """
+    ctx = _begin_request(raw_text, top_k, min_score, rerank, enhance_questions)
+
+    if ctx["neg"].get("out"):
+        resp = _out_of_domain_response(ctx)
+        _log_result(ctx["req_id"], raw_text, resp["candidates"], resp["latency_ms"])
+        return resp
+
+    candidates = _exact_match_candidates(ctx)
+    if candidates is None:
+        retrieve_topk = ctx["retrieve_topk"]
+        lexical_task = asyncio.ensure_future(run_blocking(_lexical_hits, raw_text, retrieve_topk))
+
+        async def _vector_hits():
+            embedding = await run_blocking(embed_query, raw_text)
+            return await asyncio.gather(
+                run_blocking(search_by_vector, embedding, retrieve_topk, "std_master"),
+                run_blocking(search_by_vector, embedding, retrieve_topk, "std_synonym"),
+            )
+
+        timeout = float(getattr(settings, "std_vector_timeout_sec", 0) or 0) or None
+        try:
+            master_hits, synonym_hits = await asyncio.wait_for(_vector_hits(), timeout)
+            vector_ok = True
+        except Exception:
+            lexical_hits = await lexical_task
+            if lexical_hits is None:
+                raise
+            logger.warning("vector retrieval failed/timed out, serving lexical-only candidates", exc_info=True)
+            master_hits, synonym_hits, vector_ok = [], [], False
+
+        cands = _fuse(master_hits, synonym_hits, await lexical_task, vector_ok)
+
+        # weight는 필터 전에 필요하므로, 상세는 병합 후보 전체(상위 detail_fetch_n의 상위집합)로 함께 조회
+        std_ids = cands.std_ids()
+        w_map, detail_map = await asyncio.gather(
+            run_blocking(_exact_syn_weights, std_ids, _normalize_text(raw_text)),
+            run_blocking(_get_std_details, std_ids),
         )
 
+        cands.apply_weight_boost(w_map, POC_WEIGHT_ALPHA, POC_WEIGHT_CAP)
+        cands.filter_min_score(ctx["min_score"])
+        candidates = cands.head(_head_size(ctx))
+        _attach_details(candidates, detail_map)
+
+    rr = None
+    if ctx["use_rerank"] and len(candidates) >= 2:
+        rr = await run_blocking(_llm_rerank, raw_text, candidates, ctx["generic_info"])
+
+    if ctx["enhance_questions"]:
+        resp = await run_blocking(_finalize_response, ctx, candidates, rr)
+    else:
+        resp = _finalize_response(ctx, candidates, rr)
+
+    _log_result(ctx["req_id"], raw_text, resp["candidates"], resp["latency_ms"])
+    return resp
+
+
+async def normalize_std_batch_async(
+    raw_texts: List[str],
+    top_k: int = DEFAULT_TOPK,
+    min_score: float = DEFAULT_MIN_SCORE,
+    rerank: Optional[bool] = None,
+    enhance_questions: bool = False,
+) -> Dict[str, Any]:
+    """
+    신고서 품목 일괄 표준화.
+    - 동일 입력은 1번만 처리 (결과는 입력 순서대로, 중복 위치에는 같은 결과)
+    - negative gate / 정확일치 fast path는 건별과 동일
+    - 나머지는 임베딩 1회(bulk) → std_master/std_synonym 검색을 병렬 (동시 호출 수 STD_BATCH_CONCURRENCY)
+    - WEIGHT / 상세는 batch 전체 후보로 각각 1회 조회
+    - TE_STD006T 로그는 executemany 1회 (sink.submit_batch)
+    """
+    start = time.time()
+    uniq = list(dict.fromkeys(raw_texts))
+    ctxs = {t: _begin_request(t, top_k, min_score, rerank, enhance_questions) for t in uniq}
+
+    resp_by_text: Dict[str, Dict[str, Any]] = {}
+    cand_by_text: Dict[str, List[Dict[str, Any]]] = {}
+    pending: List[str] = []
+
+    for t in uniq:
+        ctx = ctxs[t]
+        if ctx["neg"].get("out"):
+            resp_by_text[t] = _out_of_domain_response(ctx)
+            continue
+        candidates = _exact_match_candidates(ctx)
+        if candidates is None:
+            pending.append(t)
+        else:
+            cand_by_text[t] = candidates
+
+    # batch 1건이 공용 executor(BLOCKING_POOL_SIZE)를 독점하지 않도록 동시 blocking 호출 수 제한
+    sem = asyncio.Semaphore(max(1, int(getattr(settings, "std_batch_concurrency", 8) or 8)))
+    timeout = float(getattr(settings, "std_vector_timeout_sec", 0) or 0) or None
+
+    async def _bounded(fn, *args, timeout=None):
+        # timeout은 semaphore 획득(= executor 제출) 이후부터
+        async with sem:
+            return await asyncio.wait_for(run_blocking(fn, *args), timeout)
+
+    if pending:
+        lexical_task = asyncio.ensure_future(asyncio.gather(
+            *[_bounded(_lexical_hits, t, ctxs[t]["retrieve_topk"]) for t in pending]
+        ))
+
+        # 임베딩 1회 → 입력별 검색 2개씩 (동시 실행 수는 sem으로 제한)
+        try:
+            embeddings = await run_blocking(embed_queries, pending)
+        except Exception:
+            logger.warning("batch embedding failed, serving lexical-only candidates", exc_info=True)
+            embeddings = [None] * len(pending)
+
+        async def _search(emb, t):
+            if emb is None:
+                raise RuntimeError("no embedding")
+            k = ctxs[t]["retrieve_topk"]
+            return await asyncio.gather(
+                _bounded(search_by_vector, emb, k, "std_master", timeout=timeout),
+                _bounded(search_by_vector, emb, k, "std_synonym", timeout=timeout),
+            )
+
+        searched = await asyncio.gather(*[_search(e, t) for e, t in zip(embeddings, pending)], return_exceptions=True)
+        lexical = await lexical_task
+
+        fused: Dict[str, StdCandidates] = {}
+        for t, res, lex in zip(pending, searched, lexical):
+            if isinstance(res, BaseException):
+                if lex is None:
+                    raise res
+                logger.warning("vector retrieval failed/timed out for batch item, serving lexical-only candidates")
+                master_hits, synonym_hits, vector_ok = [], [], False
+            else:
+                (master_hits, synonym_hits), vector_ok = res, True
+            fused[t] = _fuse(master_hits, synonym_hits, lex, vector_ok)
+
+        # batch 전체 후보로 WEIGHT / 상세 각각 1회
+        pairs = [(sid, _normalize_text(t)) for t in pending for sid in fused[t].std_ids()]
+        all_ids = list(dict.fromkeys(sid for sid, _ in pairs))
+        w_all, detail_map = await asyncio.gather(
+            run_blocking(_exact_syn_weights_many, pairs),
+            run_blocking(_get_std_details, all_ids),
+        )
+
+        for t in pending:
+            cands = fused[t]
+            syn = _normalize_text(t)
+            w_map = {sid: w_all[(sid, syn)] for sid in cands.std_ids() if (sid, syn) in w_all}
+            cands.apply_weight_boost(w_map, POC_WEIGHT_ALPHA, POC_WEIGHT_CAP)
+            cands.filter_min_score(ctxs[t]["min_score"])
+            candidates = cands.head(_head_size(ctxs[t]))
+            _attach_details(candidates, detail_map)
+            cand_by_text[t] = candidates
+
+    # rerank / 후속질문(LLM)은 입력별로 병렬
+    async def _finish(t: str) -> None:
+        ctx = ctxs[t]
+        candidates = cand_by_text[t]
+        rr = None
+        if ctx["use_rerank"] and len(candidates) >= 2:
+            rr = await _bounded(_llm_rerank, t, candidates, ctx["generic_info"])
+        if ctx["enhance_questions"]:
+            resp_by_text[t] = await _bounded(_finalize_response, ctx, candidates, rr)
+        else:
+            resp_by_text[t] = _finalize_response(ctx, candidates, rr)
+
+    await asyncio.gather(*[_finish(t) for t in cand_by_text])
+
+    get_log_sink().submit_batch([
+        _log_row(r["req_id"], t, r["candidates"], r["latency_ms"]) for t, r in resp_by_text.items()
+    ])
+
+    return {
+        "count": len(raw_texts),
+        "unique": len(uniq),
+        "results": [resp_by_text[t] for t in raw_texts],
+        "latency_ms": int((time.time() - start) * 1000),
+    }
+
+
+def _log_row(req_id: str, raw_text: str, candidates: List[Dict[str, Any]], latency: int) -> Dict[str, Any]:
+    return {
+        "req_id": req_id,
+        "input_nm": raw_text,
+        "topk": len(candidates),
+        "result_json": json.dumps(candidates, ensure_ascii=False),
+        "latency": latency,
+    }
+
+
+def _log_result(req_id: str, raw_text: str, candidates: List[Dict[str, Any]], latency: int):
+    """TE_STD006T 적재는 background sink가 배치로 처리 (응답 경로에서는 큐 적재만)."""
+    get_log_sink().submit(_log_row(req_id, raw_text, candidates, latency))
+
 
 def save_feedback(req_id: str, input_nm: str, picked_std_id: int, is_correct: str):
     eng = get_engine()
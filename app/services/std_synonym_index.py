@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.connectors.oracle import get_engine
+from app.rag.lexical import LexicalIndex
+from app.utils.cache import register_cache
+
+logger = logging.getLogger(__name__)
+
+_LOAD_PAGE = 5000
+
+
+def _key(s: str) -> str:
+    # std_service._normalize_text와 동일 (strip + 공백 1칸)
+    return " ".join((s or "").split())
+
+
+class _Snapshot:
+    __slots__ = ("masters", "master_names", "synonyms", "keys")
+
+    def __init__(self):
+        # std_id -> (std_name, hs_code, std_desc)
+        self.masters: Dict[int, Tuple[Optional[str], Optional[str], Optional[str]]] = {}
+        # 정규화 STD_NM -> [std_id]
+        self.master_names: Dict[str, List[int]] = {}
+        # 정규화 SYN_NM -> {std_id: weight}
+        self.synonyms: Dict[str, Dict[int, float]] = {}
+        # prefix 검색용 정렬 key (master_names ∪ synonyms)
+        self.keys: List[str] = []
+
+
+def _build_lexical(masters, synonyms: List[Tuple[str, Dict[int, float]]]) -> LexicalIndex:
+    """snapshot → 문자 n-gram BM25 index (std_master: 이름+설명 / std_synonym: 동의어)."""
+
+    def _docs():
+        for sid, (name, _hs, desc) in masters.items():
+            yield (
+                f"std_master:{sid}",
+                "std_master",
+                f"{name or ''} {desc or ''}",
+                {"namespace": "std_master", "std_id": sid, "std_name": name},
+            )
+        for k, w in synonyms:
+            for sid in w:
+                m = masters.get(sid)
+                if m is None:
+                    continue
+                yield (
+                    f"std_synonym:{sid}:{k}",
+                    "std_synonym",
+                    k,
+                    {"namespace": "std_synonym", "std_id": sid, "std_name": m[0]},
+                )
+
+    return LexicalIndex.build(_docs(), n=int(getattr(settings, "std_lexical_ngram", 2) or 2))
+
+
+class SynonymIndex:
+    """
+    활성 표준품명(TE_STD001M.STD_NM) / 동의어(TE_STD002L.SYN_NM) in-process 조회 index.
+    - exact: dict 조회 → std_id, weight, hs_code, std_desc (Chroma/Oracle 미접근)
+    - prefix: 정렬 key 배열 + bisect
+    - load(): 전체 재적재 후 snapshot 교체 / upsert_synonym(): 승인 시 증분 반영
+    - lexical(): 같은 snapshot으로 만든 BM25 index (승인 반영은 background 재빌드)
+    """
+
+    def __init__(self):
+        self._snap = _Snapshot()
+        self._lock = threading.Lock()
+        self._loading = False
+        self._lexical: Optional[LexicalIndex] = None
+        self._lexical_dirty = False
+        self._lexical_building = False
+        self.loaded_at: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.loaded_at is not None
+
+    # -----------------------------
+    # load / refresh
+    # -----------------------------
+    def load(self) -> None:
+        snap = _Snapshot()
+        eng = get_engine()
+        with eng.connect() as conn:
+            rs = conn.execution_options(stream_results=True, yield_per=_LOAD_PAGE).execute(
+                text("""
+                    SELECT STD_ID, STD_NM, HS_CODE, STD_DESC
+                    FROM TE_STD001M
+                    WHERE IS_ACTIVE = 'Y'
+                """)
+            )
+            for std_id, std_nm, hs_code, std_desc in rs:
+                sid = int(std_id)
+                snap.masters[sid] = (std_nm, hs_code, std_desc)
+                k = _key(std_nm)
+                if k:
+                    snap.master_names.setdefault(k, []).append(sid)
+
+            rs = conn.execution_options(stream_results=True, yield_per=_LOAD_PAGE).execute(
+                text("""
+                    SELECT SYN_NM, STD_ID, WEIGHT
+                    FROM TE_STD002L
+                    WHERE IS_ACTIVE = 'Y'
+                """)
+            )
+            for syn_nm, std_id, weight in rs:
+                k = _key(syn_nm)
+                if k:
+                    snap.synonyms.setdefault(k, {})[int(std_id)] = float(weight or 1.0)
+
+        snap.keys = sorted(set(snap.master_names) | set(snap.synonyms))
+        lexical = _build_lexical(snap.masters, list(snap.synonyms.items())) if getattr(settings, "std_lexical_enabled", True) else None
+
+        with self._lock:
+            self._snap = snap
+            self._lexical = lexical
+            self._lexical_dirty = False
+            self.loaded_at = time.time()
+        logger.info(
+            "std synonym index loaded: masters=%d synonyms=%d keys=%d",
+            len(snap.masters), len(snap.synonyms), len(snap.keys),
+        )
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._loading:
+                return
+            self._loading = True
+
+        def _run():
+            try:
+                self.load()
+            except Exception:
+                logger.warning("std synonym index refresh failed", exc_info=True)
+            finally:
+                self._loading = False
+
+        threading.Thread(target=_run, name="std-synonym-index", daemon=True).start()
+
+    def _maybe_refresh(self) -> None:
+        # 다른 worker 프로세스의 승인 반영용 주기적 재적재 (stale snapshot으로 계속 응답)
+        ttl = int(getattr(settings, "std_synonym_index_refresh_sec", 0) or 0)
+        if ttl > 0 and self.loaded_at is not None and time.time() - self.loaded_at > ttl:
+            self._refresh_in_background()
+
+    def upsert_synonym(self, syn_nm: str, std_id: int, weight: float) -> None:
+        """승인된 (SYN_NM, STD_ID, WEIGHT)를 현재 snapshot에 반영."""
+        if not self.ready:
+            return
+        k = _key(syn_nm)
+        if not k:
+            return
+        with self._lock:
+            snap = self._snap
+            if k not in snap.synonyms and k not in snap.master_names:
+                bisect.insort(snap.keys, k)
+            entry = dict(snap.synonyms.get(k) or {})
+            entry[int(std_id)] = float(weight)
+            snap.synonyms[k] = entry
+            self._lexical_dirty = True
+
+    def lexical(self) -> Optional[LexicalIndex]:
+        """BM25 index (미적재/비활성이면 None). 승인으로 바뀐 경우 background 재빌드 후 교체."""
+        if self._lexical is None:
+            return None
+        if self._lexical_dirty and not self._lexical_building:
+            self._rebuild_lexical_in_background()
+        return self._lexical
+
+    def _rebuild_lexical_in_background(self) -> None:
+        with self._lock:
+            if self._lexical_building:
+                return
+            self._lexical_building = True
+            self._lexical_dirty = False
+            snap = self._snap
+            # upsert_synonym이 dict에 key를 추가하므로 lock 안에서 목록 복사 (entry dict는 교체 방식이라 공유 OK)
+            syn_items = list(snap.synonyms.items())
+
+        def _run():
+            try:
+                lexical = _build_lexical(snap.masters, syn_items)
+                with self._lock:
+                    if self._snap is snap:
+                        self._lexical = lexical
+            except Exception:
+                logger.warning("std lexical index rebuild failed", exc_info=True)
+            finally:
+                self._lexical_building = False
+
+        threading.Thread(target=_run, name="std-lexical-index", daemon=True).start()
+
+    # -----------------------------
+    # lookup
+    # -----------------------------
+    def syn_weights(self, name: str, std_ids: Optional[List[int]] = None) -> Dict[int, float]:
+        """(SYN_NM=name, STD_ID) → WEIGHT. _fetch_exact_syn_weights와 같은 결과."""
+        w = self._snap.synonyms.get(_key(name)) or {}
+        if std_ids is None:
+            return dict(w)
+        return {int(s): w[int(s)] for s in std_ids if int(s) in w}
+
+    def exact(self, name: str) -> List[Dict[str, Any]]:
+        """
+        정확 일치 std 목록 (활성 표준품명만).
+        반환: [{std_id, std_name, hs_code, std_desc, weight, source}]
+        """
+        self._maybe_refresh()
+        snap = self._snap
+        k = _key(name)
+
+        out: Dict[int, Dict[str, Any]] = {}
+        for sid, w in (snap.synonyms.get(k) or {}).items():
+            m = snap.masters.get(sid)
+            if m is None:
+                continue
+            out[sid] = {"std_id": sid, "std_name": m[0], "hs_code": m[1], "std_desc": m[2], "weight": w, "source": "exact_synonym"}
+        for sid in snap.master_names.get(k) or []:
+            if sid in out:
+                continue
+            m = snap.masters[sid]
+            out[sid] = {"std_id": sid, "std_name": m[0], "hs_code": m[1], "std_desc": m[2], "weight": 1.0, "source": "exact_master"}
+
+        if out:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return list(out.values())
+
+    def prefix(self, q: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """q로 시작하는 표준품명/동의어 (정렬 순)."""
+        snap = self._snap
+        p = _key(q)
+        if not p:
+            return []
+
+        out: List[Dict[str, Any]] = []
+        i = bisect.bisect_left(snap.keys, p)
+        while i < len(snap.keys) and len(out) < limit:
+            k = snap.keys[i]
+            if not k.startswith(p):
+                break
+            std_ids = list(snap.master_names.get(k) or [])
+            std_ids += [s for s in (snap.synonyms.get(k) or {}) if s not in std_ids and s in snap.masters]
+            if std_ids:
+                out.append({
+                    "name": k,
+                    "is_std_name": k in snap.master_names,
+                    "std_ids": std_ids,
+                    "std_names": [snap.masters[s][0] for s in std_ids],
+                })
+            i += 1
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        snap = self._snap
+        total = self.hits + self.misses
+        return {
+            "ready": self.ready,
+            "loaded_at": self.loaded_at,
+            "masters": len(snap.masters),
+            "synonyms": len(snap.synonyms),
+            "keys": len(snap.keys),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else None,
+            "lexical": self._lexical.stats() if self._lexical is not None else None,
+        }
+
+
+_INDEX: Optional[SynonymIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_synonym_index() -> SynonymIndex:
+    global _INDEX
+    if _INDEX is not None:
+        return _INDEX
+
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = SynonymIndex()
+            register_cache("std_synonym_index", _INDEX)
+        return _INDEX
+
+
+def load_synonym_index() -> None:
+    """startup 시 호출."""
+    if not getattr(settings, "std_synonym_index_enabled", True):
+        return
+    get_synonym_index().load()
+
+
+def synonym_index_ready() -> Optional[SynonymIndex]:
+    """사용 가능한 index (비활성/미적재면 None)."""
+    if not getattr(settings, "std_synonym_index_enabled", True):
+        return None
+    idx = get_synonym_index()
+    return idx if idx.ready else None
+
+
+def index_approved_synonyms(items: List[Tuple[str, int, float]]) -> None:
+    """승인 결과 (SYN_NM, STD_ID, WEIGHT)를 index에 증분 반영 (best-effort)."""
+    idx = synonym_index_ready()
+    if idx is None:
+        return
+    for syn_nm, std_id, weight in items:
+        try:
+            idx.upsert_synonym(syn_nm, std_id, weight)
+        except Exception:
+            logger.warning("std synonym index update failed: %s", syn_nm, exc_info=True)
@@ -6,10 +6,19 @@
 
 from __future__ import annotations
 
+import logging
+import threading
+import time
 from typing import Dict, List, Optional, Any, Tuple
 from sqlalchemy import text
 
-from app.db.connectors.oracle import get_engine
+from app.core.config import settings
+from app.db.connectors.oracle import bind_in_list, bind_pair_list, get_engine, in_list_chunks
+from app.services.std_service import invalidate_std_caches
+from app.services.std_synonym_index import index_approved_synonyms
+from app.utils.cache import LRUCache, register_cache
+
+logger = logging.getLogger(__name__)
 
 OWNER = "ADIM"  # 운영정책: DBA 스키마 소유 유지
 
@@ -85,7 +94,7 @@ def _pick_col(cols: List[str], candidates: List[str]) -> Optional[str]:
     return None
 
 
-def _resolve_schema() -> Dict[str, Dict[str, str]]:
+def _resolve_schema_uncached() -> Dict[str, Dict[str, str]]:
     cols_001 = _fetch_columns(OWNER, "TE_STD001M")
     cols_002 = _fetch_columns(OWNER, "TE_STD002L")
     cols_005 = _fetch_columns(OWNER, "TE_STD005T")
@@ -154,28 +163,115 @@ def _resolve_schema() -> Dict[str, Dict[str, str]]:
     }
 
 
+# -----------------------------
+# Column resolver cache (process-wide, TTL + version)
+# -----------------------------
+# ALL_TAB_COLUMNS 4회 조회를 approve/reject/list 호출마다 반복하지 않도록 캐시.
+# 컬럼 변경(DDL) 후에는 /std-admin/schema-cache/invalidate 로 즉시 무효화.
+_SCHEMA_CACHE = LRUCache(maxsize=1, ttl_sec=settings.std_schema_cache_ttl_sec)
+_SCHEMA_LOCK = threading.Lock()
+_SCHEMA_STATE: Dict[str, Any] = {"version": 0, "resolved_at": None}
+
+
+class _SchemaCacheStats:
+    def stats(self) -> Dict[str, Any]:
+        out = _SCHEMA_CACHE.stats()
+        out.update(_SCHEMA_STATE)
+        return out
+
+
+register_cache("std_schema", _SchemaCacheStats())
+
+
+def _resolve_schema() -> Dict[str, Dict[str, str]]:
+    m = _SCHEMA_CACHE.get(OWNER)
+    if m is not None:
+        return m
+
+    with _SCHEMA_LOCK:
+        # 동시 miss 시 딕셔너리 조회는 1번만
+        m = _SCHEMA_CACHE.get(OWNER)
+        if m is None:
+            m = _resolve_schema_uncached()
+            _SCHEMA_CACHE.set(OWNER, m)
+            _SCHEMA_STATE["version"] += 1
+            _SCHEMA_STATE["resolved_at"] = time.time()
+    return m
+
+
+def invalidate_schema_cache() -> Dict[str, Any]:
+    with _SCHEMA_LOCK:
+        _SCHEMA_CACHE.clear()
+    return {"ok": True, "version": _SCHEMA_STATE["version"]}
+
+
+def warm_schema_cache() -> Dict[str, Any]:
+    """startup / invalidate 직후 호출: 컬럼 매핑을 미리 해석해 둔다."""
+    _resolve_schema()
+    return {"ok": True, "version": _SCHEMA_STATE["version"]}
+
+
 # -----------------------------
 # Chroma incremental upsert
 # -----------------------------
-def _chroma_upsert_synonym(syn_id: int, synonym_nm: str, std_id: int, std_name: str) -> None:
-    from langchain_core.documents import Document
+def _chroma_upsert_synonyms(items: List[Tuple[int, str, int, str]]) -> Dict[int, bool]:
+    """
+    승인된 동의어 여러 건을 한 번에 재인덱싱.
+    items: [(syn_id, synonym_nm, std_id, std_name), ...]
+    - embed_documents 1회(bulk)로 전체 임베딩
+    - collection.upsert로 기존 문서 덮어쓰기 (delete + add 불필요)
+    반환: syn_id -> 성공 여부
+    """
     from app.rag.vectorstore import get_vectorstore
 
-    vs = get_vectorstore()
-    doc_id = f"std_synonym:{syn_id}"
+    out: Dict[int, bool] = {}
+    ids: List[str] = []
+    texts: List[str] = []
+    metas: List[Dict[str, Any]] = []
+
+    for syn_id, synonym_nm, std_id, std_name in items:
+        sid = int(syn_id)
+        if sid in out:
+            continue
+        if not synonym_nm or not std_name:
+            out[sid] = False
+            continue
+        out[sid] = False
+        doc_id = f"std_synonym:{sid}"
+        ids.append(doc_id)
+        texts.append(str(synonym_nm))
+        metas.append({"namespace": "std_synonym", "id": doc_id, "std_id": int(std_id), "std_name": str(std_name)})
 
-    doc = Document(
-        page_content=synonym_nm,
-        metadata={"namespace": "std_synonym", "id": doc_id, "std_id": std_id, "std_name": std_name},
-    )
+    if not ids:
+        return out
 
-    # best-effort overwrite
     try:
-        vs._collection.delete(ids=[doc_id])  # type: ignore[attr-defined]
+        vs = get_vectorstore()
+        vectors = vs.embeddings.embed_documents(texts)
+
+        # chroma 1회 요청 최대 건수 제한 대응
+        try:
+            max_batch = int(vs._client.get_max_batch_size())  # type: ignore[attr-defined]
+        except Exception:
+            max_batch = 5000
+
+        for i in range(0, len(ids), max_batch):
+            vs._collection.upsert(  # type: ignore[attr-defined]
+                ids=ids[i:i + max_batch],
+                embeddings=vectors[i:i + max_batch],
+                documents=texts[i:i + max_batch],
+                metadatas=metas[i:i + max_batch],
+            )
+            for doc_id in ids[i:i + max_batch]:
+                out[int(doc_id.split(":", 1)[1])] = True
     except Exception:
-        pass
+        logger.warning("chroma synonym upsert failed (%d docs)", len(ids), exc_info=True)
 
-    vs.add_documents([doc], ids=[doc_id])
+    return out
+
+
+def _chroma_upsert_synonym(syn_id: int, synonym_nm: str, std_id: int, std_name: str) -> bool:
+    return _chroma_upsert_synonyms([(syn_id, synonym_nm, std_id, std_name)]).get(int(syn_id), False)
 
 
 def _fetch_std_names(std_ids: List[int]) -> Dict[int, str]:
@@ -186,27 +282,22 @@ def _fetch_std_names(std_ids: List[int]) -> Dict[int, str]:
     m_std_id = m["001"]["STD_ID"]
     m_std_nm = m["001"]["STD_NM"]
 
-    binds = []
-    params: Dict[str, Any] = {}
-    for i, sid in enumerate(std_ids):
-        k = f"b{i}"
-        binds.append(f":{k}")
-        params[k] = sid
-
-    sql = f"""
-        SELECT M.{m_std_id} AS STD_ID, M.{m_std_nm} AS STD_NM
-        FROM {OWNER}.TE_STD001M M
-        WHERE M.{m_std_id} IN ({", ".join(binds)})
-    """
     eng = get_engine()
     out: Dict[int, str] = {}
     with eng.connect() as conn:
-        rows = conn.execute(text(sql), params).all()
-        for r in rows:
-            sid = _to_int(r[0])
-            nm = r[1]
-            if sid is not None and nm is not None:
-                out[sid] = str(nm)
+        for chunk in _chunks(std_ids):
+            params: Dict[str, Any] = {}
+            sql = f"""
+                SELECT M.{m_std_id} AS STD_ID, M.{m_std_nm} AS STD_NM
+                FROM {OWNER}.TE_STD001M M
+                WHERE M.{m_std_id} IN ({_in_binds("b", chunk, params)})
+            """
+            rows = conn.execute(text(sql), params).all()
+            for r in rows:
+                sid = _to_int(r[0])
+                nm = r[1]
+                if sid is not None and nm is not None:
+                    out[sid] = str(nm)
     return out
 
 
@@ -486,13 +577,12 @@ def approve_synonym_suggestion(sug_id: int, reindex: bool = True) -> Dict[str, o
         ).first()
         std_name_val = str(rstd[0]) if rstd and rstd[0] is not None else ""
 
+    index_approved_synonyms([(input_nm_val, std_id_val, float(weight_val))])
+    invalidate_std_caches(pairs=[(std_id_val, input_nm_val)])
+
     reindexed = False
     if reindex and syn_id_val is not None and std_name_val:
-        try:
-            _chroma_upsert_synonym(syn_id_val, input_nm_val, std_id_val, std_name_val)
-            reindexed = True
-        except Exception:
-            reindexed = False
+        reindexed = _chroma_upsert_synonym(syn_id_val, input_nm_val, std_id_val, std_name_val)
 
     return {
         "ok": True,
@@ -522,9 +612,14 @@ def reject_synonym_suggestion(sug_id: int, reason: Optional[str] = None) -> Dict
     eng = get_engine()
     with eng.begin() as conn:
         s_sug_id = m["007"]["SUG_ID"]
+        s_std_id = m["007"]["STD_ID"]
+        s_input = m["007"]["INPUT"]
 
         chk = conn.execute(
-            text(f"SELECT 1 FROM {OWNER}.TE_STD007T S WHERE S.{s_sug_id} = :sug_id FOR UPDATE"),
+            text(
+                f"SELECT S.{s_std_id}, S.{s_input} FROM {OWNER}.TE_STD007T S "
+                f"WHERE S.{s_sug_id} = :sug_id FOR UPDATE"
+            ),
             {"sug_id": int(sug_id)},
         ).first()
         if not chk:
@@ -540,6 +635,10 @@ def reject_synonym_suggestion(sug_id: int, reason: Optional[str] = None) -> Dict
             """
             conn.execute(text(sql_r), {"rsn": (reason or "")[:500], "sug_id": int(sug_id)})
 
+    # 승인(A) → 반려(R) 전환 등으로 바뀐 (STD_ID, 입력명) weight 캐시 제거
+    if chk[0] is not None and chk[1]:
+        invalidate_std_caches(pairs=[(int(chk[0]), str(chk[1]))])
+
     return {
         "ok": True,
         "sug_id": int(sug_id),
@@ -553,28 +652,259 @@ def reject_synonym_suggestion(sug_id: int, reason: Optional[str] = None) -> Dict
 # -----------------------------
 # Batch approve / reject
 # -----------------------------
+# Oracle IN-list 최대 1000개 제한 → 청크 단위로 나눠서 바인드
+_IN_CHUNK = 500
+
+
+def _chunks(values: List[Any], size: int = _IN_CHUNK) -> List[List[Any]]:
+    return in_list_chunks(values, size)
+
+
+def _in_binds(prefix: str, values: List[Any], params: Dict[str, Any]) -> str:
+    # bucket 크기 고정 placeholder (oracle.bind_in_list)
+    return bind_in_list(values, params, prefix=prefix)
+
+
+def _pair_binds(pairs: List[Tuple[int, str]], params: Dict[str, Any]) -> str:
+    return bind_pair_list(pairs, params, prefix=("s", "n"))
+
+
+def _bulk_approve(sug_ids: List[int]) -> Tuple[List[Dict[str, Any]], Dict[int, str]]:
+    """
+    set-based 일괄 승인 (단건 approve_synonym_suggestion과 동일한 weight learning 결과).
+      1) TE_STD007T 대상 행을 IN-list로 한 번에 FOR UPDATE
+      2) STATUS='A' 일괄 UPDATE
+      3) TE_STD002L 기존 (STD_ID, SYN_NM) 행을 한 번에 FOR UPDATE 조회
+      4) 요청 순서대로 learning을 메모리에서 계산 (같은 쌍 중복 승인도 단건 반복과 동일)
+      5) INSERT / UPDATE 각각 executemany 1회
+      6) SYN_ID / STD_NM 일괄 조회
+    반환: (건별 결과, std_id -> std_name)
+    """
+    m = _resolve_schema()
+
+    s_sug_id = m["007"]["SUG_ID"]
+    s_std_id = m["007"]["STD_ID"]
+    s_input = m["007"]["INPUT"]
+    s_weight = m["007"]["WEIGHT"]
+    s_status = m["007"]["STATUS"]
+    s_updated = m["007"]["UPDATED_AT"]
+
+    l_syn_id = m["002"]["SYN_ID"]
+    l_std_id = m["002"]["STD_ID"]
+    l_syn_nm = m["002"]["SYN_NM"]
+    l_weight = m["002"]["WEIGHT"]
+    l_active = m["002"]["IS_ACTIVE"]
+
+    m_std_id = m["001"]["STD_ID"]
+    m_std_nm = m["001"]["STD_NM"]
+
+    uniq_ids = list(dict.fromkeys(int(x) for x in sug_ids))
+
+    eng = get_engine()
+    with eng.begin() as conn:
+        # 1) lock suggestion rows
+        sel_cols = [f"S.{s_sug_id}", f"S.{s_std_id}", f"S.{s_input}"]
+        sel_cols.append(f"S.{s_weight}" if s_weight else "NULL")
+        sel_cols.append(f"S.{s_status}" if s_status else "NULL")
+
+        found: Dict[int, Tuple[int, str, float, Optional[str]]] = {}
+        for chunk in _chunks(uniq_ids):
+            params: Dict[str, Any] = {}
+            sql_sel = f"""
+                SELECT {", ".join(sel_cols)}
+                FROM {OWNER}.TE_STD007T S
+                WHERE S.{s_sug_id} IN ({_in_binds("b", chunk, params)})
+                FOR UPDATE
+            """
+            for r in conn.execute(text(sql_sel), params).all():
+                found[int(r[0])] = (
+                    int(r[1]),
+                    str(r[2]),
+                    float(r[3]) if r[3] is not None else BASE_WEIGHT,
+                    str(r[4]) if r[4] is not None else None,
+                )
+
+        # 2) STATUS='A' (+UPDATED_AT)
+        if s_status and found:
+            set_parts = [f"{s_status} = 'A'"]
+            if s_updated:
+                set_parts.append(f"{s_updated} = SYSTIMESTAMP")
+            for chunk in _chunks(list(found)):
+                params = {}
+                conn.execute(
+                    text(
+                        f"""
+                        UPDATE {OWNER}.TE_STD007T
+                        SET {", ".join(set_parts)}
+                        WHERE {s_sug_id} IN ({_in_binds("b", chunk, params)})
+                        """
+                    ),
+                    params,
+                )
+
+        # 3) existing TE_STD002L rows
+        pairs = list(dict.fromkeys((v[0], v[1]) for v in found.values()))
+        existing: Dict[Tuple[int, str], Optional[float]] = {}
+        for chunk in _chunks(pairs):
+            params = {}
+            sql_exist = f"""
+                SELECT L.{l_std_id}, L.{l_syn_nm}, {f"L.{l_weight}" if l_weight else "NULL"}
+                FROM {OWNER}.TE_STD002L L
+                WHERE (L.{l_std_id}, L.{l_syn_nm}) IN ({_pair_binds(chunk, params)})
+                FOR UPDATE
+            """
+            for r in conn.execute(text(sql_exist), params).all():
+                existing[(int(r[0]), str(r[1]))] = float(r[2]) if r[2] is not None else None
+
+        # 4) weight learning (요청 순서대로)
+        cur_weights: Dict[Tuple[int, str], Optional[float]] = dict(existing)
+        inserts: Dict[Tuple[int, str], bool] = {}
+        updates: Dict[Tuple[int, str], bool] = {}
+        status_now: Dict[int, Optional[str]] = {sid: v[3] for sid, v in found.items()}
+
+        results: List[Dict[str, Any]] = []
+        for sid in (int(x) for x in sug_ids):
+            row = found.get(sid)
+            if row is None:
+                results.append({"ok": False, "error": "SUGGESTION_NOT_FOUND", "sug_id": sid})
+                continue
+
+            std_id_val, input_nm_val, weight_val, _ = row
+            prev_status = status_now[sid] if s_status else None
+            if s_status:
+                status_now[sid] = "A"
+
+            key = (std_id_val, input_nm_val)
+            if key in cur_weights:
+                cur_weight = cur_weights[key]
+                if l_weight and prev_status == "P":
+                    cur = cur_weight if cur_weight is not None else BASE_WEIGHT
+                    new_w = min(cur + WEIGHT_STEP, MAX_WEIGHT)
+                    cur_weights[key] = float(new_w)
+                    if key not in inserts:
+                        updates[key] = True
+                    weight_val = float(new_w)
+                elif cur_weight is not None:
+                    weight_val = float(cur_weight)
+                inserted = False
+            else:
+                ins_w = max(float(weight_val), float(BASE_WEIGHT))
+                cur_weights[key] = float(ins_w) if l_weight else None
+                inserts[key] = True
+                weight_val = float(ins_w)
+                inserted = True
+
+            results.append(
+                {
+                    "ok": True,
+                    "sug_id": sid,
+                    "std_id": std_id_val,
+                    "synonym": input_nm_val,
+                    "weight": float(weight_val),
+                    "prev_status": prev_status,
+                    "approved": True,
+                    "inserted_to_std002l": inserted,
+                    "syn_id": None,
+                    "reindexed": False,
+                    "error": None,
+                }
+            )
+
+        # 5) executemany INSERT / UPDATE
+        if inserts:
+            insert_cols = [l_std_id, l_syn_nm]
+            insert_vals = [":std_id", ":syn_nm"]
+            if l_weight:
+                insert_cols.append(l_weight)
+                insert_vals.append(":w")
+            if l_active:
+                insert_cols.append(l_active)
+                insert_vals.append("'Y'")
+
+            sql_ins = f"""
+                INSERT INTO {OWNER}.TE_STD002L ({", ".join(insert_cols)})
+                SELECT {", ".join(insert_vals)}
+                FROM DUAL
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM {OWNER}.TE_STD002L L
+                    WHERE L.{l_std_id} = :std_id
+                      AND L.{l_syn_nm} = :syn_nm
+                )
+            """
+            conn.execute(
+                text(sql_ins),
+                [{"std_id": k[0], "syn_nm": k[1], "w": cur_weights[k]} for k in inserts],
+            )
+
+        if updates and l_weight:
+            sql_upw = f"""
+                UPDATE {OWNER}.TE_STD002L
+                SET {l_weight} = :nw
+                WHERE {l_std_id} = :std_id
+                  AND {l_syn_nm} = :syn_nm
+            """
+            conn.execute(
+                text(sql_upw),
+                [{"nw": cur_weights[k], "std_id": k[0], "syn_nm": k[1]} for k in updates],
+            )
+
+        # 6) SYN_ID / STD_NM 일괄 조회
+        syn_ids: Dict[Tuple[int, str], int] = {}
+        if l_syn_id:
+            for chunk in _chunks(pairs):
+                params = {}
+                sql_ids = f"""
+                    SELECT L.{l_std_id}, L.{l_syn_nm}, L.{l_syn_id}
+                    FROM {OWNER}.TE_STD002L L
+                    WHERE (L.{l_std_id}, L.{l_syn_nm}) IN ({_pair_binds(chunk, params)})
+                """
+                for r in conn.execute(text(sql_ids), params).all():
+                    if r[2] is not None:
+                        syn_ids[(int(r[0]), str(r[1]))] = int(r[2])
+
+        std_names: Dict[int, str] = {}
+        for chunk in _chunks(sorted({k[0] for k in pairs})):
+            params = {}
+            sql_nm = f"""
+                SELECT M.{m_std_id}, M.{m_std_nm}
+                FROM {OWNER}.TE_STD001M M
+                WHERE M.{m_std_id} IN ({_in_binds("b", chunk, params)})
+            """
+            for r in conn.execute(text(sql_nm), params).all():
+                if r[0] is not None and r[1] is not None:
+                    std_names[int(r[0])] = str(r[1])
+
+    for r in results:
+        if r.get("ok"):
+            r["syn_id"] = syn_ids.get((r["std_id"], r["synonym"]))
+
+    return results, std_names
+
+
 def batch_approve_synonym_suggestions(sug_ids: List[int], reindex: bool = True) -> Dict[str, Any]:
-    results: List[Dict[str, Any]] = []
-    to_reindex: List[Tuple[int, str, int]] = []
+    results, std_names = _bulk_approve(sug_ids)
 
-    for sid in sug_ids:
-        r = approve_synonym_suggestion(int(sid), reindex=False)
-        results.append(r)
-        if r.get("ok") and r.get("syn_id") and r.get("synonym") and r.get("std_id"):
-            to_reindex.append((int(r["syn_id"]), str(r["synonym"]), int(r["std_id"])))
+    approved = [
+        (str(r["synonym"]), int(r["std_id"]), float(r["weight"]))
+        for r in results
+        if r.get("ok") and r.get("synonym") and r.get("std_id") is not None
+    ]
+    index_approved_synonyms(approved)
+    invalidate_std_caches(pairs=[(std_id, syn) for syn, std_id, _ in approved])
 
     reindexed_count = 0
-    if reindex and to_reindex:
-        std_names = _fetch_std_names([x[2] for x in to_reindex])
-        for syn_id, synonym, std_id in to_reindex:
-            std_name = std_names.get(std_id, "")
-            if not std_name:
-                continue
-            try:
-                _chroma_upsert_synonym(syn_id, synonym, std_id, std_name)
-                reindexed_count += 1
-            except Exception:
-                pass
+    if reindex:
+        to_reindex: List[Tuple[int, str, int, str]] = []
+        for r in results:
+            if r.get("ok") and r.get("syn_id") and r.get("synonym") and r.get("std_id"):
+                std_name = std_names.get(int(r["std_id"]), "")
+                to_reindex.append((int(r["syn_id"]), str(r["synonym"]), int(r["std_id"]), std_name))
+
+        reindexed = _chroma_upsert_synonyms(to_reindex) if to_reindex else {}
+        for r in results:
+            if r.get("ok") and r.get("syn_id"):
+                r["reindexed"] = bool(reindexed.get(int(r["syn_id"]), False))
+        reindexed_count = sum(1 for ok in reindexed.values() if ok)
 
     approved_ok = sum(1 for r in results if r.get("ok") and r.get("approved"))
     errors = sum(1 for r in results if not r.get("ok"))
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.cache import register_cache
+from app.utils.paths import data_dir
+
+logger = logging.getLogger(__name__)
+
+# 파일(data/std_terms.json)이 없을 때 쓰는 기본 용어 (category -> terms, 목록 순서 = 결과 순서)
+DEFAULT_STD_TERMS: Dict[str, List[str]] = {
+    # 일반어 감지
+    "strong_generic": [
+        "금속", "합금", "판재", "자재", "소재", "원자재", "제품", "부품", "재료",
+        "샘플", "기타", "일반",
+    ],
+    "weak_generic": ["판", "재", "류", "용"],
+    "specific": [
+        "도금", "코팅", "니켈", "알루미늄", "구리", "철", "강", "강판", "스테인리스", "sus",
+        "탄소강", "합성수지", "플라스틱", "폴리", "pp", "pe", "pvc",
+        "압연", "열처리", "절단", "가공", "용접", "주조", "단조",
+    ],
+    # Negative Gate: 하나도 없으면 out-of-domain (strong_generic + 형상/재질/표면처리/공정)
+    "domain_hint": sorted(set([
+        "금속", "합금", "판재", "자재", "소재", "원자재", "제품", "부품", "재료",
+        "샘플", "기타", "일반",
+        "판재", "시트", "코일", "호일",
+        "환봉", "각봉", "파이프", "선재",
+        "분말", "펠릿", "스크랩",
+        "잉곳", "빌렛", "슬래브",
+        "니켈", "알루미늄", "구리", "철강", "스테인리스", "sus", "탄소강", "합금",
+        "도금", "코팅",
+        "압연", "열처리", "절단", "가공", "용접", "주조", "단조",
+    ])),
+    # 보류 시 후속질문 규칙
+    "surface_treatment": ["도금", "코팅"],
+    "material": ["니켈", "알루미늄", "구리", "철", "스테인리스", "sus", "탄소강"],
+}
+
+
+class TermMatcher:
+    """
+    Aho-Corasick 다중 패턴 매처 (대소문자 구분, 부분 문자열 매칭 = 기존 `term in text`와 동일).
+    scan(text) 1회로 category별 hit 목록 반환 (각 category의 원래 목록 순서, 중복 없음).
+    """
+
+    def __init__(self, terms: Dict[str, List[str]]):
+        self.categories = list(terms.keys())
+        # term -> [(category, 목록 내 순번)]
+        owners: Dict[str, List[Tuple[str, int]]] = {}
+        for cat, words in terms.items():
+            for rank, w in enumerate(words):
+                if w:
+                    owners.setdefault(w, []).append((cat, rank))
+
+        # goto: state별 {char: next}, out: state별 끝나는 term 목록
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[List[str]] = [[]]
+        for w in owners:
+            s = 0
+            for ch in w:
+                nxt = self._goto[s].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[s][ch] = nxt
+                    self._goto.append({})
+                    self._out.append([])
+                s = nxt
+            self._out[s].append(w)
+
+        self._fail = [0] * len(self._goto)
+        q = deque(self._goto[0].values())
+        while q:
+            s = q.popleft()
+            for ch, nxt in self._goto[s].items():
+                q.append(nxt)
+                f = self._fail[s]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+        self._owners = owners
+        self.term_count = len(owners)
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        found: Dict[str, Dict[str, int]] = {c: {} for c in self.categories}
+        goto, fail, out = self._goto, self._fail, self._out
+        s = 0
+        for ch in text or "":
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            for w in out[s]:
+                for cat, rank in self._owners[w]:
+                    found[cat][w] = rank
+        return {c: sorted(hits, key=hits.__getitem__) for c, hits in found.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        return {"terms": self.term_count, "states": len(self._goto), "categories": self.categories}
+
+
+# -----------------------------
+# 파일 로드 / hot reload
+# -----------------------------
+def _terms_path() -> str:
+    return getattr(settings, "std_terms_path", "") or str(data_dir() / "std_terms.json")
+
+
+def _load_terms(path: str) -> Dict[str, List[str]]:
+    """파일의 category가 기본값을 덮어씀 (없는 category는 기본값 유지)."""
+    terms = {k: list(v) for k, v in DEFAULT_STD_TERMS.items()}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for cat, words in (data or {}).items():
+        if isinstance(words, list):
+            terms[cat] = [str(w) for w in words if w]
+    return terms
+
+
+class _TermMatcherHolder:
+    """파일 mtime이 바뀌면 background 없이 다음 호출에서 재빌드 후 교체 (STD_TERMS_RELOAD_SEC 간격으로만 stat)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._matcher: Optional[TermMatcher] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self.reloads = 0
+
+    def get(self) -> TermMatcher:
+        now = time.monotonic()
+        interval = float(getattr(settings, "std_terms_reload_sec", 5) or 0)
+        if self._matcher is not None and (interval <= 0 or now - self._checked_at < interval):
+            return self._matcher
+
+        with self._lock:
+            if self._matcher is not None and interval > 0 and now - self._checked_at < interval:
+                return self._matcher
+            self._checked_at = now
+
+            path = _terms_path()
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                mtime = None
+
+            if self._matcher is not None and mtime == self._mtime:
+                return self._matcher
+
+            terms = DEFAULT_STD_TERMS
+            if mtime is not None:
+                try:
+                    terms = _load_terms(path)
+                except Exception:
+                    logger.warning("std terms load failed: %s", path, exc_info=True)
+                    if self._matcher is not None:
+                        return self._matcher
+
+            self._matcher = TermMatcher(terms)
+            self._mtime = mtime
+            self.reloads += 1
+            logger.info("std term matcher built: %d terms (%s)", self._matcher.term_count, path if mtime is not None else "defaults")
+            return self._matcher
+
+    def stats(self) -> Dict[str, Any]:
+        m = self._matcher
+        return {
+            "path": _terms_path(),
+            "mtime": self._mtime,
+            "reloads": self.reloads,
+            "matcher": m.stats() if m is not None else None,
+        }
+
+
+_HOLDER = _TermMatcherHolder()
+register_cache("std_terms", _HOLDER)
+
+
+def get_term_matcher() -> TermMatcher:
+    return _HOLDER.get()
+
+
+def match_terms(text: str) -> Dict[str, List[str]]:
+    """text 1회 scan → {category: [hit term, ...]}."""
+    return get_term_matcher().scan(text)
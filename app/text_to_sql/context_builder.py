@@ -1,7 +1,7 @@
 # app/text_to_sql/context_builder.py
 from typing import List, Tuple
 
-from app.rag.retriever import retrieve
+from app.rag.retriever import retrieve_multi
 from app.schemas.common import SourceChunk
 
 
@@ -71,8 +71,9 @@ These rules are mandatory and violations will cause execution failure or wrong r
 
 
 def build_context(question: str, top_k: int) -> Tuple[str, List[SourceChunk]]:
-    schema_chunks = retrieve(question, top_k=top_k, namespace="schema")
-    example_chunks = retrieve(question, top_k=max(2, top_k // 2), namespace="examples")
+    hits = retrieve_multi(question, {"schema": top_k, "examples": max(2, top_k // 2)})
+    schema_chunks = hits["schema"]
+    example_chunks = hits["examples"]
 
     def format_chunks(title: str, chunks: List[SourceChunk]) -> str:
         if not chunks:
@@ -1,7 +1,7 @@
 # app/text_to_sql/executor.py
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
 from app.core.config import settings
 
@@ -20,6 +20,22 @@ def execute(sql: str, *, dialect: str, row_limit: int) -> List[Dict[str, Any]]:
     raise ValueError(f"Unsupported dialect: {d}")
 
 
+def stream(sql: str, *, dialect: str, row_limit: int, chunk_size: Optional[int] = None) -> Iterator[List[Any]]:
+    """대량 export용. 첫 item은 컬럼명 list, 이후 row tuple list(chunk)."""
+    d = (dialect or settings.db_dialect or "oracle").lower().strip()
+    chunk_size = int(chunk_size or getattr(settings, "export_chunk_rows", 1000) or 1000)
+
+    if d == "oracle":
+        from app.db.connectors.oracle import stream_sql  # noqa
+        return stream_sql(sql, row_limit=row_limit, chunk_size=chunk_size)
+
+    if d == "postgres":
+        from app.db.connectors.postgres import stream_sql  # noqa
+        return stream_sql(sql, row_limit=row_limit, chunk_size=chunk_size)
+
+    raise ValueError(f"Unsupported dialect: {d}")
+
+
 def count(sql: str, *, dialect: str) -> int:
     d = (dialect or settings.db_dialect or "oracle").lower().strip()
 
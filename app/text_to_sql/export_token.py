@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# EXPORT_TOKEN_SECRET 미설정 시 프로세스별 임시 키 (재시작/다른 worker에서는 검증 실패 → 질문으로 재생성)
+_FALLBACK_SECRET = os.urandom(32)
+
+
+def _secret() -> bytes:
+    s = getattr(settings, "export_token_secret", "") or ""
+    return s.encode("utf-8") if s else _FALLBACK_SECRET
+
+
+def _b64(b: bytes) -> str:
+    return base64.urlsafe_b64encode(b).rstrip(b"=").decode("ascii")
+
+
+def _unb64(s: str) -> bytes:
+    return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+
+
+def _digest(body: bytes) -> bytes:
+    return hmac.new(_secret(), body, hashlib.sha256).digest()
+
+
+def _sign(body: str) -> str:
+    return _b64(_digest(body.encode("ascii")))
+
+
+def sign_export_token(sql: str, dialect: str, row_limit: int) -> str:
+    """/sql/query 결과 SQL → HMAC 서명 token (EXPORT_TOKEN_TTL_SEC 동안 유효)."""
+    ttl = int(getattr(settings, "export_token_ttl_sec", 900) or 900)
+    payload = {"sql": sql, "dialect": dialect, "row_limit": int(row_limit), "exp": int(time.time()) + ttl}
+    body = _b64(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return f"{body}.{_sign(body)}"
+
+
+def verify_export_token(token: str) -> Optional[Dict[str, Any]]:
+    """서명/만료 확인 후 payload({sql, dialect, row_limit, exp}) 반환. 위조/만료/형식 오류면 None."""
+    # client 입력이므로 비ASCII 등 형식 오류도 예외 없이 None (→ 질문으로 재생성)
+    try:
+        body, sig = (token or "").strip().split(".", 1)
+        ok = hmac.compare_digest(
+            sig.encode("utf-8", "ignore"),
+            _b64(_digest(body.encode("utf-8"))).encode("ascii"),
+        )
+    except Exception:
+        return None
+
+    if not ok:
+        logger.info("export token signature mismatch")
+        return None
+
+    try:
+        payload = json.loads(_unb64(body).decode("utf-8"))
+    except Exception:
+        return None
+
+    if int(payload.get("exp") or 0) < time.time():
+        return None
+    if not payload.get("sql"):
+        return None
+    return payload
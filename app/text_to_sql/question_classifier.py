@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+# -----------------------------
+# 패턴 (group 이름 = feature)
+# -----------------------------
+_WRITE_INTENT_PATTERNS = [
+    r"\bINSERT\b",
+    r"\bUPDATE\b",
+    r"\bDELETE\b",
+    r"\bMERGE\b",
+    r"\bUPSERT\b",
+    r"\bCREATE\b",
+    r"\bALTER\b",
+    r"\bDROP\b",
+    r"\bTRUNCATE\b",
+    r"\bRENAME\b",
+    r"\bGRANT\b",
+    r"\bREVOKE\b",
+    r"업데이트\s*해",
+    r"수정\s*해",
+    r"삭제\s*해",
+    r"추가\s*해",
+    r"생성\s*해",
+    r"변경\s*해",
+    r"등록\s*해",
+    r"반영\s*해",
+    r"만들어\s*줘",
+    r"바꿔\s*줘",
+    r"지워\s*줘",
+    r"테이블.*생성",
+    r"테이블.*만들",
+    r"컬럼.*추가",
+    r"인덱스.*생성",
+    r"제약조건.*추가",
+    r"데이터.*삭제",
+    r"데이터.*수정",
+    r"데이터.*변경",
+]
+
+_KOREAN_ORDINAL_MAP = {
+    "한": 1,
+    "두": 2,
+    "세": 3,
+    "네": 4,
+    "다섯": 5,
+    "여섯": 6,
+    "일곱": 7,
+    "여덟": 8,
+    "아홉": 9,
+    "열": 10,
+}
+
+_GROWTH_KEYWORDS = [
+    "증감률",
+    "증가율",
+    "감소율",
+    "전년대비",
+    "전년 동기 대비",
+    "전년동기대비",
+    "YOY",
+    "GROWTH RATE",
+    "CHANGE RATE",
+]
+
+_INLINE_VIEW_HINTS = [
+    "월별 평균",
+    "평균수출금액",
+    "평균수입금액",
+    "월별 평균수출금액",
+    "월별 평균수입금액",
+    "월별",
+    "평균",
+]
+
+
+def _alt(words) -> str:
+    # 긴 것부터 (alternation은 앞쪽 우선)
+    return "|".join(re.escape(w) for w in sorted(set(words), key=len, reverse=True))
+
+
+# 읽기 전용 guard: feature scan과 분리해 별도 search
+# (한 finditer에 섞으면 "2등록해줘"의 "2등"처럼 다른 group이 write 패턴 문자열을 먼저 소비)
+_WRITE_RE = re.compile("|".join(f"(?:{p})" for p in _WRITE_INTENT_PATTERNS), re.IGNORECASE)
+
+# 한 번의 finditer로 나머지 feature 수집.
+# top-N은 키워드만 소비(뒤 숫자는 lookahead) → "상위 10위"의 "10위"도 rank로 잡힘
+_QUESTION_RE = re.compile(
+    "|".join([
+        r"(?P<rank_digit>\d+)\s*(?:위|등|번째)",
+        r"(?P<rank_ko>" + _alt(_KOREAN_ORDINAL_MAP) + r")\s*번째",
+        r"(?P<topn>상위|TOP)(?=\s*\d)",
+        "(?P<growth>" + _alt(_GROWTH_KEYWORDS) + ")",
+        "(?P<inline_view>" + _alt(_INLINE_VIEW_HINTS) + ")",
+    ]),
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class QuestionFeatures:
+    write_intent: bool = False
+    rank_n: Optional[int] = None  # "2위", "세 번째" → 2, 3
+    topn: bool = False  # "상위 10", "TOP 5"
+    growth: bool = False  # 증감률 / 전년대비 / YoY
+    inline_view: bool = False  # 월별 평균 류 (인라인뷰 alias scope 규칙 대상)
+
+
+def classify_question(question: str) -> QuestionFeatures:
+    """write guard search 후 질문 1회 scan → QuestionFeatures. write_intent면 나머지는 보지 않고 바로 반환."""
+    q = (question or "").strip()
+    if not q:
+        return QuestionFeatures()
+    if _WRITE_RE.search(q):
+        return QuestionFeatures(write_intent=True)
+
+    rank_digit: Optional[int] = None
+    rank_ko: Optional[int] = None
+    topn = growth = inline_view = False
+
+    for m in _QUESTION_RE.finditer(q):
+        kind = m.lastgroup
+        if kind == "rank_digit":
+            if rank_digit is None:
+                rank_digit = int(m.group("rank_digit"))
+        elif kind == "rank_ko":
+            if rank_ko is None:
+                rank_ko = _KOREAN_ORDINAL_MAP.get(m.group("rank_ko"))
+        elif kind == "topn":
+            topn = True
+        elif kind == "growth":
+            growth = True
+        elif kind == "inline_view":
+            inline_view = True
+
+    return QuestionFeatures(
+        rank_n=rank_digit if rank_digit is not None else rank_ko,
+        topn=topn,
+        growth=growth,
+        inline_view=inline_view,
+    )
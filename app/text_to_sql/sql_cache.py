@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import settings
+from app.utils.cache import LRUCache, register_cache
+
+logger = logging.getLogger(__name__)
+
+_NUM_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def normalize_question(question: str) -> str:
+    """공백 1칸 + 소문자 + 끝 문장부호 제거."""
+    s = " ".join((question or "").split()).lower()
+    return s.rstrip("?.!？。 ")
+
+
+def _numbers(question: str) -> Tuple[str, ...]:
+    # 연도/상위 N/월 등 숫자가 다르면 의미가 다른 질문 → semantic hit 금지
+    return tuple(_NUM_RE.findall(question or ""))
+
+
+def context_fingerprint(context: str) -> str:
+    return hashlib.sha1((context or "").encode("utf-8")).hexdigest()[:16]
+
+
+class SQLAnswerCache:
+    """
+    생성 SQL 캐시 (LLM 호출 생략용).
+    - exact: (정규화 질문, dialect, row_limit, context fingerprint) → sql  (LRU + TTL)
+    - semantic: 질문 임베딩 cosine >= threshold 이고 dialect/row_limit/숫자 토큰이 같으면 hit
+      (표현만 조금 다른 질문은 검색 context도 조금씩 달라지므로 fingerprint는 보지 않음)
+    - schema/examples 인덱싱이 바뀌면 invalidate()로 전체 폐기
+    - version_path: 인덱싱 버전 파일 (다른 worker/스크립트의 ingest도 get/set 시 감지해 전체 폐기)
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 2000,
+        ttl_sec: Optional[float] = 3600,
+        semantic_size: int = 1000,
+        threshold: float = 0.95,
+        version_path: Optional[str] = None,
+    ):
+        self.exact = LRUCache(maxsize=maxsize, ttl_sec=ttl_sec)
+        self.ttl_sec = float(ttl_sec) if ttl_sec else None
+        self.semantic_size = max(0, int(semantic_size))
+        self.threshold = float(threshold)
+
+        # exact key -> (ts, unit vector, dialect, row_limit, numbers, sql)
+        self._sem: "OrderedDict[Tuple, Tuple[float, np.ndarray, str, int, Tuple[str, ...], str]]" = OrderedDict()
+        self._mat: Optional[np.ndarray] = None  # _sem 순서의 벡터 행렬 (dirty면 None)
+        self._mat_keys: List[Tuple] = []
+        self._lock = threading.Lock()
+
+        self.semantic_hits = 0
+        self.invalidations = 0
+
+        self.version_path = version_path
+        self._version = _read_version(version_path)
+
+    @staticmethod
+    def key(question: str, dialect: str, row_limit: int, context: str) -> Tuple[str, str, int, str]:
+        return (normalize_question(question), (dialect or "").lower(), int(row_limit), context_fingerprint(context))
+
+    # -----------------------------
+    # lookup
+    # -----------------------------
+    def get(self, question: str, dialect: str, row_limit: int, context: str, embedding: Optional[List[float]] = None) -> Optional[str]:
+        self._sync_version()
+        k = self.key(question, dialect, row_limit, context)
+        sql = self.exact.get(k)
+        if sql is not None:
+            return sql
+        if embedding is None or self.semantic_size <= 0:
+            return None
+        return self._semantic_get(embedding, k[1], k[2], _numbers(question))
+
+    def _semantic_get(self, embedding: List[float], dialect: str, row_limit: int, nums: Tuple[str, ...]) -> Optional[str]:
+        q = _unit(embedding)
+        if q is None:
+            return None
+
+        with self._lock:
+            if not self._sem:
+                return None
+            if self._mat is None:
+                self._mat_keys = list(self._sem.keys())
+                self._mat = np.stack([self._sem[k][1] for k in self._mat_keys])
+            mat, keys = self._mat, self._mat_keys
+
+        if mat.shape[1] != q.shape[0]:
+            return None
+
+        sims = mat @ q
+        now = time.monotonic()
+        for i in np.argsort(-sims):
+            if sims[i] < self.threshold:
+                break
+            with self._lock:
+                entry = self._sem.get(keys[i])
+                if entry is None:
+                    continue
+                ts, _vec, d, rl, n, sql = entry
+                if self.ttl_sec is not None and now - ts > self.ttl_sec:
+                    continue
+                if d != dialect or rl != row_limit or n != nums:
+                    continue
+                self._sem.move_to_end(keys[i])
+                self.semantic_hits += 1
+            return sql
+        return None
+
+    # -----------------------------
+    # store / invalidate
+    # -----------------------------
+    def set(self, question: str, dialect: str, row_limit: int, context: str, sql: str, embedding: Optional[List[float]] = None) -> None:
+        self._sync_version()
+        k = self.key(question, dialect, row_limit, context)
+        self.exact.set(k, sql)
+        if embedding is None or self.semantic_size <= 0:
+            return
+        vec = _unit(embedding)
+        if vec is None:
+            return
+        with self._lock:
+            self._sem[k] = (time.monotonic(), vec, k[1], k[2], _numbers(question), sql)
+            self._sem.move_to_end(k)
+            while len(self._sem) > self.semantic_size:
+                self._sem.popitem(last=False)
+            self._mat = None
+
+    def invalidate(self) -> None:
+        self.exact.clear()
+        with self._lock:
+            self._sem.clear()
+            self._mat = None
+            self._mat_keys = []
+            self.invalidations += 1
+
+    def _sync_version(self) -> None:
+        if not self.version_path:
+            return
+        v = _read_version(self.version_path)
+        if v != self._version:
+            self._version = v
+            self.invalidate()
+
+    def bump_version(self) -> None:
+        """버전 파일 갱신 (같은 파일을 보는 모든 프로세스의 캐시가 다음 get/set에서 폐기됨) + 로컬 폐기."""
+        if self.version_path:
+            self._version = _write_version(self.version_path)
+        self.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "exact": self.exact.stats(),
+            "semantic_size": len(self._sem),
+            "semantic_hits": self.semantic_hits,
+            "threshold": self.threshold,
+            "invalidations": self.invalidations,
+        }
+
+
+def _unit(embedding: List[float]) -> Optional[np.ndarray]:
+    v = np.asarray(embedding, dtype=np.float32)
+    n = float(np.linalg.norm(v))
+    if not n:
+        return None
+    return v / n
+
+
+def _read_version(path: Optional[str]) -> Optional[str]:
+    if not path:
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _write_version(path: str) -> Optional[str]:
+    v = str(time.time_ns())
+    try:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(v)
+        os.replace(tmp, path)
+    except OSError:
+        logger.warning("sql cache version write failed: %s", path, exc_info=True)
+        return _read_version(path)
+    return v
+
+
+def _version_path() -> str:
+    return str(Path(settings.chroma_dir) / "sql_cache.version")
+
+
+_CACHE: Optional[SQLAnswerCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_sql_cache() -> Optional[SQLAnswerCache]:
+    """SQL_CACHE_ENABLED=false면 None."""
+    global _CACHE
+    if not getattr(settings, "sql_cache_enabled", True):
+        return None
+    if _CACHE is not None:
+        return _CACHE
+
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = SQLAnswerCache(
+                maxsize=int(getattr(settings, "sql_cache_size", 2000)),
+                ttl_sec=float(getattr(settings, "sql_cache_ttl_sec", 3600) or 0) or None,
+                semantic_size=int(getattr(settings, "sql_cache_semantic_size", 1000)),
+                threshold=float(getattr(settings, "sql_cache_semantic_threshold", 0.95)),
+                version_path=_version_path(),
+            )
+            register_cache("sql_answer", _CACHE)
+        return _CACHE
+
+
+def invalidate_sql_cache() -> None:
+    """
+    schema/examples 인덱스 변경 시 호출.
+    - 버전 파일을 갱신 → 캐시를 아직 만들지 않은 스크립트에서 호출해도 API worker 전부가 감지
+    """
+    if _CACHE is not None:
+        _CACHE.bump_version()
+    else:
+        _write_version(_version_path())
+    logger.info("sql answer cache invalidated")
@@ -1,5 +1,22 @@
+import logging
+
 from app.core.config import settings
 from app.text_to_sql.prompts import build_user_prompt, sql_system_prompt
+from app.text_to_sql.sql_cache import get_sql_cache
+
+logger = logging.getLogger(__name__)
+
+
+def _question_embedding(question: str):
+    # build_context에서 이미 임베딩한 질문 → query 임베딩 캐시 hit
+    if not getattr(settings, "sql_cache_semantic_enabled", True):
+        return None
+    try:
+        from app.rag.retriever import embed_query
+        return embed_query(question)
+    except Exception:
+        logger.warning("sql cache: question embedding failed", exc_info=True)
+        return None
 
 
 def generate_sql(question: str, context: str, dialect: str, row_limit: int) -> str:
@@ -7,6 +24,15 @@ def generate_sql(question: str, context: str, dialect: str, row_limit: int) -> s
     if not settings.openai_api_key:
         return "SELECT 1 AS example;"
 
+    # ✅ 같은/거의 같은 질문이면 LLM 호출 생략
+    cache = get_sql_cache()
+    embedding = None
+    if cache is not None:
+        embedding = _question_embedding(question)
+        cached = cache.get(question, dialect, row_limit, context, embedding=embedding)
+        if cached is not None:
+            return cached
+
     from langchain_openai import ChatOpenAI
 
     llm = ChatOpenAI(model=settings.openai_model, api_key=settings.openai_api_key)
@@ -20,4 +46,8 @@ def generate_sql(question: str, context: str, dialect: str, row_limit: int) -> s
     )
 
     resp = llm.invoke([("system", system_prompt), ("user", user_prompt)])
-    return (resp.content or "").strip()
\ No newline at end of file
+    sql = (resp.content or "").strip()
+
+    if cache is not None and sql:
+        cache.set(question, dialect, row_limit, context, sql, embedding=embedding)
+    return sql
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import logging
 import re
+from typing import Optional
+
 from app.core.config import settings
-from app.text_to_sql.prompts import sql_system_prompt
+
+logger = logging.getLogger(__name__)
 
 
 def _oracle_fix(sql: str, row_limit: int) -> str:
@@ -21,18 +25,261 @@ def _oracle_fix(sql: str, row_limit: int) -> str:
     return s
 
 
-def rewrite_sql(question: str, sql: str, error: str, context: str, dialect: str, row_limit: int) -> str:
+# -----------------------------
+# regex fallback (sqlglot 미설치 / 파싱 실패)
+# -----------------------------
+# 분모가 단순 컬럼 또는 괄호 없는 집계 1개일 때만
+# (식별자는 possessive: NVL(...) / ROUND(...) 같은 함수명 일부만 잡고 backtrack하지 않도록)
+_DIV_DENOM_RE = re.compile(
+    r"/\s*(?!NULLIF\b)("
+    r"(?:SUM|COUNT|AVG|MAX|MIN)\s*\([^()]*\)"
+    r"|[A-Za-z_][\w$#]*+(?:\.[A-Za-z_][\w$#]*+)?+(?![\w$#.(]|\s*\()"
+    r")",
+    re.IGNORECASE,
+)
+_OVER_RE = re.compile(r"\bOVER\s*\(([^()]*)\)", re.IGNORECASE)
+_DESC_RE = re.compile(r"\bDESC\b(?!\s+NULLS\b)", re.IGNORECASE)
+# 문자열 리터럴 / quoted 식별자 / 주석 (정규식 치환 대상에서 제외)
+_SKIP_RE = re.compile(r"'(?:[^']|'')*'|\"[^\"]*\"|--[^\n]*|/\*.*?\*/", re.DOTALL)
+
+
+def _sub_code(sql: str, fn) -> str:
+    """리터럴/주석 바깥 구간에만 fn 적용."""
+    out, pos = [], 0
+    for m in _SKIP_RE.finditer(sql):
+        out.append(fn(sql[pos:m.start()]))
+        out.append(m.group(0))
+        pos = m.end()
+    out.append(fn(sql[pos:]))
+    return "".join(out)
+
+
+def _regex_nullif(sql: str) -> str:
+    return _sub_code(sql, lambda s: _DIV_DENOM_RE.sub(lambda m: f"/ NULLIF({m.group(1)}, 0)", s))
+
+
+def _regex_nulls_last(sql: str, order_by: bool = False) -> str:
+    # order_by=True(증감률): 바깥 ORDER BY 포함 모든 DESC (DESC 키워드는 ORDER BY 안에만 옴)
+    if order_by:
+        return _sub_code(sql, lambda s: _DESC_RE.sub("DESC NULLS LAST", s))
+    return _sub_code(sql, lambda s: _OVER_RE.sub(lambda m: "OVER (" + _DESC_RE.sub("DESC NULLS LAST", m.group(1)) + ")", s))
+
+
+# -----------------------------
+# sqlglot AST rules
+# -----------------------------
+def _new_name(taken: set, base: str) -> str:
+    name, i = base, 2
+    while name.upper() in taken:
+        name = f"{base}_{i}"
+        i += 1
+    taken.add(name.upper())
+    return name
+
+
+def _from(select):
+    # sqlglot 버전에 따라 FROM 키가 "from_" / "from"
+    return select.args.get("from_") or select.args.get("from")
+
+
+def _ast_nullif(tree, exp) -> None:
+    # a / b → a / NULLIF(b, 0) (숫자 리터럴 / 이미 NULLIF면 유지)
+    for div in list(tree.find_all(exp.Div)):
+        d = div.expression
+        inner = d.this if isinstance(d, exp.Paren) else d
+        if isinstance(inner, (exp.Nullif, exp.Literal)):
+            continue
+        div.set("expression", exp.Nullif(this=inner.copy(), expression=exp.Literal.number(0)))
+
+
+def _ast_nulls_last(tree, exp, order_by: bool = False) -> None:
+    # window ORDER BY ... DESC → DESC NULLS LAST (Oracle/Postgres 기본은 DESC NULLS FIRST)
+    # order_by=True(증감률): NULLIF로 NULL이 된 비율이 상위에 오지 않도록 쿼리 ORDER BY도
+    orders = [w.args.get("order") for w in tree.find_all(exp.Window)]
+    if order_by:
+        orders += [s.args.get("order") for s in tree.find_all(exp.Select)]
+    for order in orders:
+        if order is None:
+            continue
+        for o in order.expressions:
+            if isinstance(o, exp.Ordered) and o.args.get("desc"):
+                o.set("nulls_first", False)
+
+
+def _ast_move_window_predicates(tree, exp):
     """
-    실행 실패 시 SQL을 수정해 재시도하는 용도.
-    우선은 안전하게 'Oracle LIMIT 문제'만 자동 수정.
-    (원하면 LLM 기반 리라이트도 추가 가능)
+    WHERE/HAVING 안의 RANK() OVER(...) = N 류 조건 →
+    SELECT ... FROM (SELECT ..., RANK() OVER(...) AS RNK FROM ...) RANKED WHERE RNK = N
+    (컬럼을 참조하지 않는 window 조건만 이동, 나머지 조건은 제자리 유지)
     """
-    d = (dialect or "postgres").lower().strip()
+    # 안쪽 SELECT부터 (바깥 SELECT를 복사할 때 이미 고쳐진 안쪽이 따라가도록)
+    for select in reversed(list(tree.find_all(exp.Select))):
+        moved = []
+        for key in ("where", "having"):
+            clause = select.args.get(key)
+            if clause is None or clause.find(exp.Window) is None:
+                continue
+            conds = list(clause.this.flatten()) if isinstance(clause.this, exp.And) else [clause.this]
+            keep = []
+            for c in conds:
+                if c.find(exp.Window) is not None and all(col.find_ancestor(exp.Window) is not None for col in c.find_all(exp.Column)):
+                    moved.append(c)
+                else:
+                    keep.append(c)
+            if len(keep) == len(conds):
+                continue
+            select.set(key, clause.__class__(this=exp.and_(*keep)) if keep else None)
+
+        if not moved:
+            continue
+
+        taken = {(s.alias_or_name or "").upper() for s in select.selects}
+        outer_cols = [exp.Star()] if select.is_star else []
+        for s in list(select.selects):
+            if select.is_star:
+                break
+            if not s.alias_or_name:
+                s.replace(exp.alias_(s.copy(), _new_name(taken, "COL")))
+        if not select.is_star:
+            outer_cols = [exp.column(s.alias_or_name) for s in select.selects]
+
+        for c in moved:
+            for w in list(c.find_all(exp.Window)):
+                name = _new_name(taken, "RNK")
+                select.select(exp.alias_(w.copy(), name), copy=False)
+                w.replace(exp.column(name))
+
+        # 바깥에서 정렬/제한 (ORDER BY가 select alias/컬럼명만 쓰는 경우)
+        order = select.args.get("order")
+        outer = exp.select(*outer_cols).from_(exp.Subquery(this=select.copy(), alias=exp.TableAlias(this=exp.to_identifier(_new_name(taken, "RANKED")))))
+        outer = outer.where(exp.and_(*moved), copy=False)
+        inner = _from(outer).this.this
+        if order is not None and all(col.table == "" for col in order.find_all(exp.Column)):
+            inner.set("order", None)
+            outer.set("order", order.copy())
+        if inner.args.get("limit") is not None:
+            outer.set("limit", inner.args["limit"].copy())
+            inner.set("limit", None)
+
+        if select is tree:
+            tree = outer
+        else:
+            select.replace(outer)
+    return tree
+
+
+def _ast_fix_alias_scope(tree, exp) -> None:
+    """FROM (subquery) A 바깥에서 안쪽 테이블 alias(T.COL)를 참조하면 A.COL로."""
+    for select in list(tree.find_all(exp.Select)):
+        from_ = _from(select)
+        if from_ is None or select.args.get("joins"):
+            continue
+        src = from_.this
+        if not isinstance(src, exp.Subquery):
+            continue
+
+        cols = [
+            c for c in select.find_all(exp.Column)
+            if c.table and c.find_ancestor(exp.Select) is select and c.find_ancestor(exp.Subquery) is not src
+        ]
+        alias = src.alias
+        bad = [c for c in cols if c.table.upper() != (alias or "").upper()]
+        if not bad:
+            continue
+        if not alias:
+            alias = "A"
+            src.set("alias", exp.TableAlias(this=exp.to_identifier(alias)))
+        for c in bad:
+            c.set("table", exp.to_identifier(alias))
+
+
+def _needs_ast(sql: str, d: str, growth: bool, rank: bool, inline_view: bool) -> bool:
+    u = sql.upper()
+    return (
+        (d == "oracle" and re.search(r"\bLIMIT\b", u) is not None)
+        or (growth and ("/" in u or re.search(r"\bDESC\b", u) is not None))
+        or (" OVER" in u and re.search(r"\b(WHERE|HAVING)\b", u) is not None)
+        or ((growth or rank) and " OVER" in u)
+        or (inline_view and "FROM (" in " ".join(u.split()))
+    )
+
+
+def check_sql_rules_backend() -> bool:
+    """startup 시 1회: sqlglot이 없으면 window/alias 이동 규칙이 빠진다는 경고."""
+    try:
+        import sqlglot  # noqa: F401
+    except ImportError:
+        logger.warning("sqlglot not installed: SQL rules fall back to regex (RANK/window predicate and alias-scope fixes disabled)")
+        return False
+    return True
+
+
+def _ast_rewrite(sql: str, d: str, *, growth: bool, rank: bool, inline_view: bool) -> Optional[str]:
+    try:
+        import sqlglot
+        from sqlglot import exp
+    except ImportError:
+        return None
+
+    read = "oracle" if d == "oracle" else "postgres"
+    try:
+        tree = sqlglot.parse_one(sql, read=read)
+        if growth:
+            _ast_nullif(tree, exp)
+        if growth or rank:
+            _ast_nulls_last(tree, exp, order_by=growth)
+        tree = _ast_move_window_predicates(tree, exp)
+        if inline_view:
+            _ast_fix_alias_scope(tree, exp)
+        # oracle 출력 시 LIMIT → FETCH FIRST
+        return tree.sql(dialect=read)
+    except Exception:
+        logger.info("sql AST rewrite skipped", exc_info=True)
+        return None
+
+
+def apply_sql_rules(
+    sql: str,
+    dialect: str,
+    row_limit: int,
+    *,
+    growth: bool = False,
+    rank: bool = False,
+    inline_view: bool = False,
+) -> str:
+    """
+    생성 SQL에 결정적 규칙을 1회 적용 (LLM 호출 없음).
+    - Oracle: LIMIT → FETCH FIRST, 제한 없으면 FETCH FIRST row_limit
+    - growth(증감률 질문): 분모 NULLIF(x, 0)
+    - growth / rank(순위 질문): window ORDER BY DESC NULLS LAST (growth는 쿼리 ORDER BY도)
+    - WHERE/HAVING 안의 RANK() 등 window 조건 → 서브쿼리로 분리 후 바깥 WHERE
+    - inline_view: 바깥 쿼리의 안쪽 alias 참조 → 인라인뷰 alias
+    sqlglot(requirements.txt)으로 AST 변환, 미설치/파싱 실패 시 정규식으로 가능한 것만 (window/alias 이동은 생략).
+    """
+    d = (dialect or settings.db_dialect or "postgres").lower().strip()
+    s = (sql or "").strip().rstrip(";").strip()
+    if not s:
+        return sql
+
+    out = None
+    if _needs_ast(s, d, growth, rank, inline_view):
+        out = _ast_rewrite(s, d, growth=growth, rank=rank, inline_view=inline_view)
+    if out is None:
+        out = s
+        if growth:
+            out = _regex_nullif(out)
+        if growth or rank:
+            out = _regex_nulls_last(out, order_by=growth)
 
-    # 1) 간단 규칙 기반 수정(빠르고 안정적)
     if d == "oracle":
-        return _oracle_fix(sql, row_limit=row_limit)
+        out = _oracle_fix(out, row_limit=row_limit)
+    return out
+
 
-    # 2) 기본은 원본 반환
-    # (필요 시 postgres 케이스도 여기서 수정 가능)
-    return sql
+def rewrite_sql(question: str, sql: str, error: str, context: str, dialect: str, row_limit: int) -> str:
+    """
+    실행 실패 시 SQL을 수정해 재시도하는 용도.
+    우선은 안전하게 규칙 기반(apply_sql_rules)만 적용.
+    (원하면 LLM 기반 리라이트도 추가 가능)
+    """
+    return apply_sql_rules(sql, dialect, row_limit)
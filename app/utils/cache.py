@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    thread-safe LRU (+ 선택 TTL) 캐시.
+    - maxsize 초과 시 가장 오래 안 쓴 항목부터 제거
+    - ttl_sec가 있으면 만료된 항목은 miss로 처리
+    - hits/misses 카운터 제공 (stats())
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_sec: Optional[float] = None):
+        self.maxsize = max(1, int(maxsize))
+        self.ttl_sec = float(ttl_sec) if ttl_sec else None
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+
+            ts, value = item
+            if self.ttl_sec is not None and (time.monotonic() - ts) > self.ttl_sec:
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_sec": self.ttl_sec,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits / total) if total else None,
+        }
+
+
+# -----------------------------
+# 캐시 레지스트리 (/admin/cache-stats 노출용)
+# -----------------------------
+_REGISTRY: Dict[str, Any] = {}
+
+
+def register_cache(name: str, cache: Any) -> None:
+    """stats() 메서드를 가진 객체를 이름으로 등록."""
+    _REGISTRY[name] = cache
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    out: Dict[str, Dict[str, Any]] = {}
+    for name, cache in _REGISTRY.items():
+        try:
+            out[name] = cache.stats()
+        except Exception as e:
+            out[name] = {"error": str(e)}
+    return out
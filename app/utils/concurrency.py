@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_LOCK = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """blocking I/O(DB/Chroma/OpenAI) 전용 bounded 스레드풀 (BLOCKING_POOL_SIZE)."""
+    global _EXECUTOR
+    if _EXECUTOR is not None:
+        return _EXECUTOR
+
+    with _LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=max(1, int(settings.blocking_pool_size)),
+                thread_name_prefix="blocking-io",
+            )
+        return _EXECUTOR
+
+
+async def run_blocking(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_executor() -> None:
+    global _EXECUTOR
+    with _LOCK:
+        ex = _EXECUTOR
+        _EXECUTOR = None
+    if ex is not None:
+        ex.shutdown(wait=True)
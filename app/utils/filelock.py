@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def try_lock_file(path: str) -> Optional[int]:
+    """
+    프로세스 간 배타 lock (non-blocking). 이미 다른 곳이 잡고 있으면 None.
+    반환된 fd를 unlock_file()로 닫으면 해제 (프로세스 종료 시에도 OS가 해제).
+    """
+    fd = os.open(str(path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def unlock_file(fd: int) -> None:
+    os.close(fd)
@@ -5,10 +5,16 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--namespace", choices=["schema", "examples"], default="schema")
     parser.add_argument("--file_path", default=None)
+    parser.add_argument("--force", action="store_true", help="re-embed even if content is unchanged")
     args = parser.parse_args()
-    added, ids = ingest_namespace(args.namespace, file_path=args.file_path)
-    print(f"Added {added} docs to namespace={args.namespace}")
-    for _id in ids:
+    r = ingest_namespace(args.namespace, file_path=args.file_path, force=args.force)
+    print(
+        f"namespace={r['namespace']} added={r['added']} updated={r['updated']} "
+        f"unchanged={r['unchanged']} deleted={r['deleted']}"
+    )
+    for _id in r["ids"]:
+        print(" +", _id)
+    for _id in r["deleted_ids"]:
         print(" -", _id)
 
 if __name__ == "__main__":
@@ -0,0 +1,15 @@
+import argparse
+from app.services.ingest_service import ingest_std
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resume", action="store_true", help="continue from the last checkpoint")
+    parser.add_argument("--page_size", type=int, default=None)
+    parser.add_argument("--embed_batch_size", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    r = ingest_std(resume=args.resume, page_size=args.page_size, embed_batch_size=args.embed_batch_size, workers=args.workers)
+    print(f"std_master={r['std_master']} std_synonym={r['std_synonym']} resumed_from={r['resumed_from']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import random
+import time
+
+from app.rag.embed_pipeline import EmbedPipeline
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+def test_parallel_embed_commits_pages_in_order_and_retries_429():
+    calls = {"n": 0}
+
+    def embed(texts):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise RateLimited("slow down")
+        time.sleep(random.random() / 100)  # 완료 순서를 섞음
+        return [[float(len(t))] for t in texts]
+
+    written = []
+    pipe = EmbedPipeline(
+        embed_fn=embed,
+        write_fn=lambda ids, vecs, texts, metas: written.extend(ids),
+        workers=4,
+        batch_size=3,
+        backoff_base_sec=0.0,
+    )
+
+    pages = [(p, [f"d{p}-{i}" for i in range(7)], ["x" * i for i in range(7)], [{}] * 7) for p in range(6)]
+    done = []
+    total = pipe.run(iter(pages), on_page_done=done.append)
+
+    assert total == 42
+    assert sorted(written) == sorted(i for p in pages for i in p[1])
+    assert done == list(range(6))
+    assert pipe.retries == 1
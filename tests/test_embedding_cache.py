@@ -0,0 +1,46 @@
+from langchain_core.embeddings import Embeddings
+
+from app.rag.embeddings import CachedEmbeddings
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+    def embed_query(self, text):
+        self.calls += 1
+        return [float(len(text)), 0.5]
+
+
+def test_query_cache_memory_and_disk(tmp_path):
+    path = str(tmp_path / "emb.sqlite3")
+    base = CountingEmbeddings()
+    emb = CachedEmbeddings(base, model="m", maxsize=2, path=path)
+
+    v1 = emb.embed_query("니켈  도금 강판")
+    v2 = emb.embed_query(" 니켈 도금 강판 ")
+    assert v1 == v2
+    assert base.calls == 1
+    assert emb.stats()["memory"]["hits"] == 1
+
+    # 재시작 후에도 파일에서 읽어 네트워크 호출 없음
+    base2 = CountingEmbeddings()
+    emb2 = CachedEmbeddings(base2, model="m", maxsize=2, path=path)
+    assert emb2.embed_query("니켈 도금 강판") == v1
+    assert base2.calls == 0
+    assert emb2.stats()["disk_hits"] == 1
+
+
+def test_embed_queries_batches_misses_only():
+    base = CountingEmbeddings()
+    emb = CachedEmbeddings(base, model="m", maxsize=10)
+
+    emb.embed_query("강판")
+    base.calls = 0
+    out = emb.embed_queries(["강판", "알루미늄 시트", "알루미늄  시트", "동 코일"])
+    assert out[0] == emb.embed_query("강판")
+    assert out[1] == out[2]
+    assert base.calls == 2  # 캐시 miss 중복 제거 후 2건
@@ -0,0 +1,21 @@
+from app.services.sql_service import _export_sql
+from app.text_to_sql.export_token import sign_export_token, verify_export_token
+
+
+def test_roundtrip_and_tamper():
+    token = sign_export_token("SELECT 1 FROM DUAL;", "oracle", 200)
+    payload = verify_export_token(token)
+    assert payload["sql"] == "SELECT 1 FROM DUAL;"
+    assert payload["row_limit"] == 200
+
+    body, sig = token.split(".")
+    assert verify_export_token(body[:-2] + "AA." + sig) is None
+    assert verify_export_token("garbage") is None
+    assert verify_export_token("é.abc") is None
+    assert verify_export_token("abc.é") is None
+
+
+def test_export_sql_drops_only_default_limit():
+    assert _export_sql("SELECT A FROM T\nFETCH FIRST 200 ROWS ONLY;", 200, "oracle") == "SELECT A FROM T;"
+    assert _export_sql("SELECT A FROM T FETCH FIRST 10 ROWS ONLY;", 200, "oracle") == "SELECT A FROM T FETCH FIRST 10 ROWS ONLY;"
+    assert _export_sql("SELECT A FROM T\nLIMIT 200;", 200, "postgres") == "SELECT A FROM T;"
@@ -7,3 +7,11 @@ def test_health():
     r = client.get("/api/v1/health")
     assert r.status_code == 200
     assert r.json()["status"] == "ok"
+
+
+def test_cache_stats_requires_admin_token(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "admin_reset_token", "secret")
+    assert client.get("/api/v1/admin/cache-stats").status_code == 401
+    assert client.get("/api/v1/admin/cache-stats", headers={"X-Admin-Token": "secret"}).status_code == 200
@@ -0,0 +1,24 @@
+from app.rag.lexical import LexicalIndex
+
+
+def _docs():
+    return [
+        ("std_master:1", "std_master", "니켈도금강판", {"std_id": 1}),
+        ("std_master:2", "std_master", "알루미늄판", {"std_id": 2}),
+        ("std_synonym:1:ni", "std_synonym", "Ni 도금 강판", {"std_id": 1}),
+        ("std_synonym:3:cu", "std_synonym", "동 코일", {"std_id": 3}),
+    ]
+
+
+def test_bm25_char_ngram_search():
+    idx = LexicalIndex.build(_docs())
+
+    hits = idx.search("니켈 도금 강판", top_k=3)
+    assert hits[0].id == "std_master:1"
+    assert hits[0].score == 1.0
+    assert all(h.metadata["std_id"] == 1 for h in hits)
+
+    syn = idx.search("도금강판", top_k=5, namespace="std_synonym")
+    assert [h.id for h in syn] == ["std_synonym:1:ni"]
+
+    assert idx.search("없는품목", top_k=5) == []
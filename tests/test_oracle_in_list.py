@@ -0,0 +1,21 @@
+from app.db.connectors.oracle import bind_in_list, bind_pair_list, in_list_chunks
+
+
+def test_in_list_is_padded_to_bucket_size():
+    p3, p9 = {}, {}
+    sql3 = bind_in_list([1, 2, 3], p3)
+    sql5 = bind_in_list([1, 2, 3, 4, 5], {})
+    assert sql3 == sql5  # 같은 bucket → 같은 SQL text
+    assert sql3.count(":id") == 8
+    assert p3["id2"] == 3 and p3["id7"] == 3  # 빈 자리는 마지막 값 반복
+
+    assert bind_in_list(list(range(9)), p9).count(":id") == 16
+
+    pairs = {}
+    assert bind_pair_list([(1, "a")], pairs).count("(:s") == 8
+    assert pairs["s7"] == 1 and pairs["n7"] == "a"
+
+
+def test_in_list_chunks_dedup_and_limit():
+    chunks = in_list_chunks(list(range(2500)) + [1, 2])
+    assert [len(c) for c in chunks] == [1000, 1000, 500]
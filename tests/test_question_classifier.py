@@ -0,0 +1,18 @@
+from app.text_to_sql.question_classifier import QuestionFeatures, classify_question
+
+
+def test_single_scan_features():
+    f = classify_question("2024년 국가별 수출금액 증감률 상위 10위")
+    assert f == QuestionFeatures(rank_n=10, topn=True, growth=True)
+
+    assert classify_question("월별 평균 수출금액 세 번째 국가").rank_n == 3
+    assert classify_question("월별 평균 수출금액 세 번째 국가").inline_view
+
+
+def test_write_intent():
+    assert classify_question("테이블 새로 생성해 줘").write_intent
+    assert classify_question("delete from t").write_intent
+    assert not classify_question("삭제된 품목 수출금액").write_intent
+    # 다른 feature(2등)가 write 패턴(등록해)을 먼저 소비하지 않도록
+    assert classify_question("2등록해줘").write_intent
+    assert classify_question("상위 3개 월별 평균 수정해 줘").write_intent
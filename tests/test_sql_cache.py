@@ -0,0 +1,28 @@
+from app.text_to_sql.sql_cache import SQLAnswerCache
+
+
+def test_exact_and_semantic_tiers():
+    c = SQLAnswerCache(maxsize=10, ttl_sec=60, semantic_size=10, threshold=0.9)
+    c.set("2024년 국가별 수출금액 상위 10", "oracle", 200, "ctx", "SELECT 1", embedding=[1.0, 0.0])
+
+    assert c.get("  2024년 국가별   수출금액 상위 10?", "oracle", 200, "ctx") == "SELECT 1"
+    # 표현이 다르고 context가 달라도 임베딩이 가까우면 hit
+    assert c.get("2024년 국가별 수출액 상위 10", "oracle", 200, "ctx2", embedding=[0.99, 0.05]) == "SELECT 1"
+    # 숫자가 다르면 miss
+    assert c.get("2023년 국가별 수출금액 상위 10", "oracle", 200, "ctx", embedding=[1.0, 0.0]) is None
+    assert c.get("2024년 국가별 수출금액 상위 10", "postgres", 200, "ctx", embedding=[1.0, 0.0]) is None
+
+    c.invalidate()
+    assert c.get("2024년 국가별 수출금액 상위 10", "oracle", 200, "ctx", embedding=[1.0, 0.0]) is None
+
+
+def test_version_file_invalidates_other_processes(tmp_path):
+    version = str(tmp_path / "sql_cache.version")
+    worker = SQLAnswerCache(semantic_size=10, version_path=version)
+    worker.set("국가별 수출금액", "oracle", 200, "ctx", "SELECT 1", embedding=[1.0, 0.0])
+    assert worker.get("국가별 수출액", "oracle", 200, "ctx2", embedding=[1.0, 0.0]) == "SELECT 1"
+
+    # 다른 프로세스(ingest 스크립트)가 버전 파일만 갱신해도 semantic tier까지 폐기
+    SQLAnswerCache(version_path=version).bump_version()
+    assert worker.get("국가별 수출액", "oracle", 200, "ctx2", embedding=[1.0, 0.0]) is None
+    assert worker.get("국가별 수출금액", "oracle", 200, "ctx") is None
@@ -0,0 +1,76 @@
+import pytest
+
+from app.text_to_sql.sql_rewriter import apply_sql_rules
+
+
+def test_oracle_limit_and_growth_rules():
+    sql = "SELECT A, (CUR - PREV) / PREV * 100 AS R FROM T ORDER BY R DESC LIMIT 5;"
+    out = apply_sql_rules(sql, "oracle", 200, growth=True).upper()
+    assert "LIMIT" not in out
+    assert "FETCH FIRST 5 ROWS ONLY" in out
+    assert "NULLIF(PREV, 0)" in out
+    # NULL 증감률(분모 0)이 DESC 상위로 오지 않도록 쿼리 ORDER BY에도 NULLS LAST
+    assert "ORDER BY R DESC NULLS LAST" in out
+
+
+def test_regex_growth_order_by_nulls_last():
+    from app.text_to_sql.sql_rewriter import _regex_nulls_last
+
+    sql = "SELECT A, X / NULLIF(P, 0) AS R FROM T WHERE C = 'DESC' ORDER BY R DESC"
+    assert _regex_nulls_last(sql, order_by=True) == "SELECT A, X / NULLIF(P, 0) AS R FROM T WHERE C = 'DESC' ORDER BY R DESC NULLS LAST"
+    assert _regex_nulls_last(sql) == sql
+
+
+def test_default_row_limit_and_rank_nulls_last():
+    assert apply_sql_rules("SELECT A FROM T", "oracle", 200).endswith("FETCH FIRST 200 ROWS ONLY")
+    out = apply_sql_rules("SELECT A, RANK() OVER (ORDER BY B DESC) RNK FROM T", "postgres", 200, rank=True)
+    assert "DESC NULLS LAST" in out.upper()
+    assert apply_sql_rules("SELECT A FROM T", "postgres", 200) == "SELECT A FROM T"
+
+
+def test_regex_nullif_keeps_functions_and_literals():
+    from app.text_to_sql.sql_rewriter import _regex_nullif
+
+    for sql in (
+        "SELECT (A-B) / NVL(B,0) FROM T",
+        "SELECT A / ROUND(B,2) FROM T",
+        "SELECT TO_CHAR(D,'YYYY/MM') FROM T",
+    ):
+        assert _regex_nullif(sql) == sql
+    assert _regex_nullif("SELECT (C-P)/P*100 FROM T") == "SELECT (C-P)/ NULLIF(P, 0)*100 FROM T"
+
+
+def test_ast_moves_rank_out_of_having():
+    pytest.importorskip("sqlglot")
+    sql = (
+        "SELECT CNTY_NM, SUM(AMT) AS TOT FROM T GROUP BY CNTY_NM "
+        "HAVING RANK() OVER (ORDER BY SUM(AMT) DESC) = 3"
+    )
+    out = apply_sql_rules(sql, "oracle", 200, rank=True)
+    assert out == (
+        "SELECT CNTY_NM, TOT FROM (SELECT CNTY_NM, SUM(AMT) AS TOT, "
+        "RANK() OVER (ORDER BY SUM(AMT) DESC NULLS LAST) AS RNK FROM T GROUP BY CNTY_NM) RANKED "
+        "WHERE RNK = 3 FETCH FIRST 200 ROWS ONLY"
+    )
+
+
+def test_ast_fixes_inline_view_alias_scope():
+    pytest.importorskip("sqlglot")
+    sql = (
+        "SELECT SUBSTR(T.YM, 5, 2) AS M, AVG(T.S) FROM "
+        "(SELECT T.YM, SUM(T.AMT) S FROM TB T GROUP BY T.YM) GROUP BY SUBSTR(T.YM, 5, 2)"
+    )
+    out = apply_sql_rules(sql, "oracle", 200, inline_view=True)
+    assert out.startswith("SELECT SUBSTR(A.YM, 5, 2) AS M, AVG(A.S) FROM (SELECT T.YM, SUM(T.AMT) AS S FROM TB T GROUP BY T.YM) A")
+    assert out.endswith("GROUP BY SUBSTR(A.YM, 5, 2) FETCH FIRST 200 ROWS ONLY")
+
+
+def test_rank_rules_skip_topn_questions():
+    from app.services.sql_service import _apply_rules
+    from app.text_to_sql.question_classifier import classify_question
+
+    sql = "SELECT A, RANK() OVER (ORDER BY B DESC) RNK FROM T"
+    topn = _apply_rules(features=classify_question("상위 3개 국가"), sql=sql, dialect="postgres", row_limit=200)
+    assert "NULLS LAST" not in topn.upper()
+    rank = _apply_rules(features=classify_question("수출액 3위 국가"), sql=sql, dialect="postgres", row_limit=200)
+    assert "DESC NULLS LAST" in rank.upper()
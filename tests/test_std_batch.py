@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.services.std_service as std
+from app.api.v1.std import router
+from app.core.config import settings
+from app.schemas.common import SourceChunk
+
+
+class _Sink:
+    def __init__(self):
+        self.batches = []
+
+    def submit_batch(self, rows):
+        self.batches.append(rows)
+
+
+@pytest.fixture
+def stubbed(monkeypatch):
+    embed_calls = []
+    sink = _Sink()
+
+    def embed_queries(texts):
+        embed_calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+    def search_by_vector(emb, k, namespace):
+        sid = int(emb[0])
+        return [SourceChunk(id=f"{namespace}:{sid}", text="", metadata={"namespace": namespace, "std_id": sid, "std_name": f"n{sid}"}, score=1.0)]
+
+    monkeypatch.setattr(std, "synonym_index_ready", lambda: None)
+    monkeypatch.setattr(std, "embed_queries", embed_queries)
+    monkeypatch.setattr(std, "search_by_vector", search_by_vector)
+    monkeypatch.setattr(std, "_exact_syn_weights_many", lambda pairs: {})
+    monkeypatch.setattr(std, "_get_std_details", lambda ids: {})
+    monkeypatch.setattr(std, "get_log_sink", lambda: sink)
+    return embed_calls, sink
+
+
+def test_batch_dedupes_and_keeps_input_order(stubbed):
+    embed_calls, sink = stubbed
+    texts = ["니켈 도금 강판", "알루미늄 시트", "니켈 도금 강판", "동 코일"]
+    out = asyncio.run(std.normalize_std_batch_async(texts, rerank=False))
+
+    assert out["count"] == 4 and out["unique"] == 3
+    assert [r["input"] for r in out["results"]] == texts
+    assert [r["candidates"][0]["std_id"] for r in out["results"]] == [len(t) for t in texts]
+    assert out["results"][0] is out["results"][2]
+    assert embed_calls == [["니켈 도금 강판", "알루미늄 시트", "동 코일"]]
+    assert len(sink.batches) == 1 and len(sink.batches[0]) == 3
+
+
+def test_batch_endpoint(stubbed, monkeypatch):
+    embed_calls, sink = stubbed
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    client = TestClient(app)
+
+    r = client.post("/api/v1/std/normalize/batch", json={"raw_texts": ["동 코일", "알루미늄 시트", "동 코일"], "rerank": False})
+    assert r.status_code == 200
+    assert [x["input"] for x in r.json()["results"]] == ["동 코일", "알루미늄 시트", "동 코일"]
+    assert len(embed_calls) == 1 and len(sink.batches) == 1
+
+    monkeypatch.setattr(settings, "std_batch_max_items", 2)
+    assert client.post("/api/v1/std/normalize/batch", json={"raw_texts": ["a", "b", "c"]}).status_code == 400
@@ -0,0 +1,24 @@
+from app.schemas.common import SourceChunk
+from app.services.std_candidates import StdCandidates
+
+
+def _hit(ns, std_id, score):
+    return SourceChunk(id=f"{ns}:{std_id}", text="", metadata={"namespace": ns, "std_id": std_id, "std_name": f"n{std_id}"}, score=score)
+
+
+def test_merge_boost_filter_head_matches_dict_pipeline():
+    master = [_hit("std_master", 1, 1.0), _hit("std_master", 2, 1.0), _hit("std_master", 3, 0.5)]
+    synonym = [_hit("std_synonym", 2, 0.5), _hit("std_synonym", 4, 0.1)]
+
+    c = StdCandidates.merge(master, synonym)
+    c.apply_weight_boost({1: 2.0, 3: -1}, alpha=0.5, cap=3.0)
+    c.filter_min_score(0.8)
+
+    head = c.head(2)
+    assert [x["std_id"] for x in head] == [2, 1]
+    assert head[0]["sources"] == ["std_master", "std_synonym"]
+    assert head[0]["score"] == 1.0 + 0.5 * 1.2
+    assert head[1] == {
+        "std_id": 1, "std_name": "n1", "score": 1.5, "sources": ["std_master"], "score_raw": 1.0, "weight": 2.0,
+    }
+    assert len(c) == 2  # std 3(0.5), 4(0.12)는 min_score 미만
@@ -0,0 +1,93 @@
+import json
+import os
+import time
+
+import app.services.std_job_service as jobs
+from app.services.std_job_service import StdJobManager
+
+
+def _fake_batch(fail_on=None):
+    async def run(raw_texts, **kw):
+        if fail_on in raw_texts:
+            raise RuntimeError("oracle down")
+        return {"results": [{"input": t, "candidates": [{"std_id": len(t)}]} for t in raw_texts]}
+    return run
+
+
+def _submit(mgr, body, fmt="csv"):
+    job_id, path = mgr.new_upload(fmt)
+    path.write_text(body, encoding="utf-8")
+    return mgr.create_job(job_id, fmt, {"top_k": 5})["job_id"]
+
+
+def _wait(mgr, job_id, status):
+    for _ in range(200):
+        if mgr.status(job_id)["status"] == status:
+            return
+        time.sleep(0.01)
+    raise AssertionError(mgr.status(job_id))
+
+
+def test_job_fails_then_resumes_from_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "normalize_std_batch_async", _fake_batch(fail_on="c"))
+    mgr = StdJobManager(str(tmp_path), workers=1, chunk_size=2)
+    job_id = _submit(mgr, "raw_text,qty\na,1\nbb,2\n\nc,3\ndddd,4\neeeee,5\n")
+    assert mgr.status(job_id)["total"] == 5
+    mgr.start()
+    _wait(mgr, job_id, "failed")
+    mgr.stop()
+    assert mgr.status(job_id)["chunks_done"] == 1
+
+    # 재시작(새 manager) 후 끝난 chunk는 건너뛰고 이어서 처리
+    monkeypatch.setattr(jobs, "normalize_std_batch_async", _fake_batch())
+    mgr2 = StdJobManager(str(tmp_path), workers=2, chunk_size=2)
+    mgr2.resume(job_id)
+    mgr2.start()
+    _wait(mgr2, job_id, "done")
+    mgr2.stop()
+    assert mgr2.chunks_processed == 2
+
+    rows = [json.loads(line) for line in b"".join(mgr2.iter_result(job_id, "jsonl")).splitlines()]
+    assert [(r["line"], r["input"]) for r in rows] == [(2, "a"), (3, "bb"), (5, "c"), (6, "dddd"), (7, "eeeee")]
+    csv_text = "".join(mgr2.iter_result(job_id, "csv"))
+    assert csv_text.splitlines()[1].startswith("2,a,1,")
+
+
+def test_second_process_does_not_claim_running_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "normalize_std_batch_async", _fake_batch())
+    owner = StdJobManager(str(tmp_path), workers=1, chunk_size=2)
+    job_id = _submit(owner, "raw_text\na\nbb\nc\n")
+
+    other = StdJobManager(str(tmp_path), workers=1, chunk_size=2)
+    other.start()
+    assert other.stats()["queued_chunks"] == 0  # lock을 가진 owner만 처리
+    assert other.status(job_id)["status"] == "queued"
+
+    owner.start()
+    _wait(other, job_id, "done")  # 다른 프로세스의 진행 상황은 디스크에서 읽음
+    owner.stop()
+    other.stop()
+
+
+def test_cleanup_removes_expired_jobs_and_orphans(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "normalize_std_batch_async", _fake_batch())
+    mgr = StdJobManager(str(tmp_path), workers=1, chunk_size=2, ttl_sec=3600)
+    old_id = _submit(mgr, "raw_text\na\n")
+    new_id = _submit(mgr, "raw_text\nb\n")
+    mgr.start()
+    _wait(mgr, old_id, "done")
+    _wait(mgr, new_id, "done")
+    mgr.stop()
+
+    meta_path = tmp_path / old_id / "meta.json"
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta["finished_at"] -= 7200
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    orphan = tmp_path / ("f" * 32)
+    orphan.mkdir()
+    os.utime(orphan, (time.time() - 7200, time.time() - 7200))
+
+    mgr2 = StdJobManager(str(tmp_path), workers=1, chunk_size=2, ttl_sec=3600)
+    mgr2.start()
+    mgr2.stop()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [new_id]
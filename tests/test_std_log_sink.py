@@ -0,0 +1,81 @@
+import json
+
+from app.services.std_log_sink import StdLogSink
+from app.utils.filelock import try_lock_file, unlock_file
+
+
+def _row(i):
+    return {"req_id": str(i), "input_nm": "x", "topk": 0, "result_json": "[]", "latency": 1}
+
+
+def test_batches_and_flushes_on_stop():
+    batches = []
+    sink = StdLogSink(writer=batches.append, batch_size=4, flush_interval_sec=5.0)
+    for i in range(10):
+        sink.submit(_row(i))
+    sink.stop()
+
+    assert sum(len(b) for b in batches) == 10
+    assert max(len(b) for b in batches) <= 4
+    assert sink.stats()["written"] == 10
+
+
+def test_failed_batches_spill_and_replay(tmp_path):
+    spill = str(tmp_path / "spill.jsonl")
+
+    def down(rows):
+        raise RuntimeError("oracle down")
+
+    sink = StdLogSink(writer=down, batch_size=2, flush_interval_sec=0.05, spill_path=spill)
+    for i in range(3):
+        sink.submit(_row(i))
+    sink.stop()
+    assert sink.stats()["spilled"] == 3
+
+    written = []
+    sink2 = StdLogSink(writer=written.extend, spill_path=spill)
+    sink2.start()
+    sink2.stop()
+    assert [r["req_id"] for r in written] == ["0", "1", "2"]
+
+
+def test_partial_replay_failure_keeps_only_unwritten_rows(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    spill.write_text("".join(json.dumps(_row(i)) + "\n" for i in range(4)), encoding="utf-8")
+
+    written = []
+
+    def flaky(rows):
+        if written:
+            raise RuntimeError("oracle down")
+        written.extend(rows)
+
+    sink = StdLogSink(writer=flaky, batch_size=2, spill_path=str(spill))
+    sink.start()
+    sink.stop()
+    assert [r["req_id"] for r in written] == ["0", "1"]
+
+    # 새 spill은 남은 replay 뒤에 이어 붙어 함께 재적재
+    spill.write_text(json.dumps(_row(9)) + "\n", encoding="utf-8")
+    again = []
+    sink2 = StdLogSink(writer=again.extend, batch_size=2, spill_path=str(spill))
+    sink2.start()
+    sink2.stop()
+    assert [r["req_id"] for r in again] == ["2", "3", "9"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["spill.jsonl.replay.lock"]
+
+
+def test_replay_skipped_while_other_process_holds_lock(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    spill.write_text(json.dumps(_row(0)) + "\n", encoding="utf-8")
+
+    fd = try_lock_file(f"{spill}.replay.lock")
+    try:
+        written = []
+        sink = StdLogSink(writer=written.extend, spill_path=str(spill))
+        sink.start()
+        sink.stop()
+    finally:
+        unlock_file(fd)
+    assert written == []
+    assert spill.exists()
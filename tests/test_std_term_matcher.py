@@ -0,0 +1,24 @@
+import json
+import os
+
+from app.core.config import settings
+from app.services import std_term_matcher as tm
+
+
+def test_overlapping_hits_per_category():
+    m = tm.TermMatcher({"a": ["강", "탄소강", "sus"], "b": ["탄소"]})
+    assert m.scan("탄소강 SUS 판") == {"a": ["강", "탄소강"], "b": ["탄소"]}
+
+
+def test_reloads_when_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "terms.json"
+    path.write_text(json.dumps({"domain_hint": ["자동차"]}, ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(settings, "std_terms_path", str(path))
+    monkeypatch.setattr(settings, "std_terms_reload_sec", 1e-9)
+    monkeypatch.setattr(tm, "_HOLDER", tm._TermMatcherHolder())
+
+    assert tm.match_terms("중고자동차")["domain_hint"] == ["자동차"]
+
+    path.write_text(json.dumps({"domain_hint": ["중고"]}, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, (1, 1))
+    assert tm.match_terms("중고자동차")["domain_hint"] == ["중고"]